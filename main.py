@@ -2,22 +2,36 @@
 Ana PDF Editor uygulaması - Modüler Yapı
 """
 
+import time
+_PROCESS_START = time.perf_counter()  # Açılış süresi raporu için
+
 import os
 import sys
 import traceback
-import xml.etree.ElementTree as ET
 from PyQt5.QtWidgets import (
-    QApplication, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QFileDialog,
-    QWidget, QFormLayout, QScrollArea, QGroupBox, QColorDialog
+    QApplication, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog,
+    QWidget, QFormLayout, QGroupBox, QColorDialog, QComboBox, QCheckBox, QLineEdit
 )
-from PyQt5.QtGui import QPixmap, QImage, QTransform, QPainter
-from PyQt5.QtCore import Qt
-import fitz
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QTransform
 
 # Import our modules
+# (fitz, svglib ve reportlab ilk kullanımda yüklenir; pencere onları beklemeden açılır)
 from src.ui_components.custom_widgets import CustomLineEdit
-from src.pdf_processor.pdf_processor import PDFProcessor
+from src.ui_components.tiled_preview import TiledPreview
+from src.ui_components.preview_worker import PreviewWorker, DEBOUNCE_MS
+from src.pdf_processor.render_worker import MODE_MANUAL, MODE_AUTO
+from src.pdf_processor.layers import is_layered, set_background
+from src.pdf_processor.autofit import auto_fit, OBJECTIVES, OBJECTIVE_LABELS, DEFAULT_SIZE_TOLERANCE
+from src.pdf_processor.logo_cache import open_pdf, source_digest
+from src.pdf_processor.composite import LogoCell, CompositeSheet, CompositePyramid
+from src.pdf_processor.pdf_processor import PDFProcessor, ENGINE_SVG, ENGINE_NATIVE
+from src.pdf_processor.save_profiles import SAVE_COMPACT, SAVE_FAST, SAVE_PROFILE_LABELS
 from src.file_manager.file_manager import FileManager
+from src.pdf_processor.startup import StartupTimer, startup_report_requested
+from src.pdf_processor.job_context import JobContext
+from src.pdf_processor.metrics import RunMetrics, STAGE_RASTERIZE, configure_from_env
+from src.pdf_processor.memory import trim_mupdf_store
 
 CM_TO_PT = 72/2.54
 
@@ -31,8 +45,21 @@ class PDFEditorApp(QWidget):
         self.setAcceptDrops(True)  # Ana pencereye sürükle-bırak özelliği ekle
 
         # Bileşenleri başlat
-        self.pdf_processor = PDFProcessor()
-        self.file_manager = FileManager()
+        # Önizlemeler bellekte üretilir; diske yalnızca "Farklı Kaydet" ile yazılır
+        # Ara dosyalar (seçilen/döndürülen logo) pencereye ait geçici dizindedir, kapanınca silinir
+        self.job_context = JobContext(prefix="logo_editor_")
+        self.pdf_processor = PDFProcessor(in_memory=True, context=self.job_context)
+        self.file_manager = FileManager(context=self.job_context)
+
+        # Önizlemeler arka plan sürecinde üretilir; arayüz donmaz
+        self.preview_worker = PreviewWorker(self)
+        self.preview_worker.finished.connect(self.show_preview_result)
+        self.preview_worker.failed.connect(self.show_preview_error)
+        self.preview_worker.busy.connect(self.show_preview_busy)
+        self.preview_mode = None    # son istenen önizleme; form değişince yenilenir
+        self.preview_document = None    # gösterilen katmanlı önizleme belgesi (fitz.Document)
+        self.preview_logo = None    # son üretimin logosu: (logo anahtarı, (PDF kaynağı, clip))
+        self.preview_cell = None    # anında önizlemede yeniden kullanılan hücre: (anahtar, LogoCell)
         
         # Yeni özellikler için değişkenler
         self.aspect_ratio_locked = True  # Başlangıçta ölçek kilitli
@@ -40,9 +67,11 @@ class PDFEditorApp(QWidget):
         self.fixed_aspect_ratio = None   # Sabit ölçek oranı
         self.pdf_path = None
         self.logo_path = None
+        self.logo_name = None   # seçilen logonun özgün dosya adı (süre dökümünde gösterilir)
         self.bg_color = "#ffffff"   #"#B9E7BA"
         self.pdf_processor.bg_color = self.bg_color  # PDFProcessor'a rengi aktar
-        self.rotation_angle = 0  # Döndürme açısını takip etmek için
+        self.rotation_angle = 0  # Saat yönünde döndürme (derece); yerleşimde matrisle uygulanır
+        self.logo_thumbnail = None  # döndürülmemiş logo küçük resmi (QPixmap)
         self.heighta = 0
         self.inputlogowidth = 0
         self.inputlogoheight = 0
@@ -96,6 +125,20 @@ class PDFEditorApp(QWidget):
         page_settings_layout.addRow("Sağdan Yatay Boşluk (cm):", self.page_right_margin_input)
         page_settings_layout.addRow("Üstten Dikey Boşluk (cm):", self.page_top_margin_input)
 
+        # Sayfaya sığmayan logolar için yeni sayfa (manuel sayfa boyunda)
+        self.paginate_checkbox = QCheckBox("Sığmayan logoları yeni sayfalara yerleştir")
+        page_settings_layout.addRow("", self.paginate_checkbox)
+
+        # Form değişince son logo her hücreye kopyalanarak hemen gösterilir; kesin çıktı ardından gelir
+        self.composite_checkbox = QCheckBox("Anında önizleme (logo kopyalanarak)")
+        page_settings_layout.addRow("", self.composite_checkbox)
+
+        # Önizlemeler her zaman hızlı kaydedilir; profil yalnızca "Farklı Kaydet" için
+        self.save_profile_combo = QComboBox()
+        for profile in (SAVE_COMPACT, SAVE_FAST):
+            self.save_profile_combo.addItem(SAVE_PROFILE_LABELS[profile], profile)
+        page_settings_layout.addRow("Kaydetme Profili:", self.save_profile_combo)
+
         # 📌 Sayfa Boyunu Otomatik Hesaplama Butonu
         self.setkayt_button = QPushButton("Sayfa Ayarlarını Kaydet")  # Yeni buton
         self.setkayt_button.clicked.connect(self.setkaydet)
@@ -107,6 +150,11 @@ class PDFEditorApp(QWidget):
         button_row_layout.addWidget(self.setkayt_button)  # Sol tarafta yeni buton
         button_row_layout.addWidget(self.color_button)  # Sağ tarafta mevcut buton
 
+        # Arka plan önizlemede ayrı katmandır; açıp kapatmak yeniden üretim gerektirmez
+        self.background_checkbox = QCheckBox("Önizlemede arka plan rengi")
+        self.background_checkbox.toggled.connect(self.update_preview_background)
+        button_row_layout.addWidget(self.background_checkbox)
+
         # Bu düzeni page_settings_layout'a ekleyin
         page_settings_layout.addRow(button_row_layout)
         
@@ -139,6 +187,20 @@ class PDFEditorApp(QWidget):
         # 📌 Döndürme Butonu Ekleme
         self.rotate_button = QPushButton("Logoyu 90° Döndür")
         self.rotate_button.clicked.connect(self.rotate_logo)
+        self.rotation_input = CustomLineEdit(self)
+        self.rotation_input.setText("0")
+        self.rotation_input.confirmed.connect(self.set_rotation_from_input)
+        self.mirror_x_checkbox = QCheckBox("Yatay aynala (DTF)")
+        self.mirror_y_checkbox = QCheckBox("Dikey aynala")
+        self.mirror_x_checkbox.toggled.connect(self.update_logo_thumbnail)
+        self.mirror_y_checkbox.toggled.connect(self.update_logo_thumbnail)
+
+        # 📌 Yerleştirme Motoru Seçimi
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItem("SVG dönüşümü (svglib)", ENGINE_SVG)
+        self.engine_combo.addItem("Doğrudan vektör (PyMuPDF)", ENGINE_NATIVE)
+        self.remove_bg_checkbox = QCheckBox("Logo arkaplanını temizle")
+        self.remove_bg_checkbox.setChecked(True)
 
         # 📌 Kullanıcı girişlerini Enter veya focus kaybında güncelle
         self.logo_width_input.returnPressed.connect(lambda: self.update_logo_dimensions(self.logo_width_input))
@@ -151,6 +213,11 @@ class PDFEditorApp(QWidget):
         logo_form_layout.addRow("Logonun Yüksekliği (cm):", self.logo_height_input)
         logo_form_layout.addRow("", self.lock_scale_button)
         logo_form_layout.addRow("", self.rotate_button)  # Döndürme butonu eklendi
+        logo_form_layout.addRow("Döndürme (°, saat yönünde):", self.rotation_input)
+        logo_form_layout.addRow("", self.mirror_x_checkbox)
+        logo_form_layout.addRow("", self.mirror_y_checkbox)
+        logo_form_layout.addRow("Yerleştirme Motoru:", self.engine_combo)
+        logo_form_layout.addRow("", self.remove_bg_checkbox)
 
         # 📌 Logo Seçimi
         self.logo_file_button = QPushButton("Logo Dosyası Seç")
@@ -174,6 +241,21 @@ class PDFEditorApp(QWidget):
         logo_settings_layout.addLayout(logo_file_layout)
         self.logo_settings_group.setLayout(logo_settings_layout)
 
+        # 📌 Otomatik Yerleşim: boyut, döndürme ve satır adedi PDF üretmeden aranır
+        self.autofit_group = QGroupBox("Otomatik Yerleşim")
+        autofit_layout = QFormLayout()
+        self.autofit_objective_combo = QComboBox()
+        for objective in OBJECTIVES:
+            self.autofit_objective_combo.addItem(OBJECTIVE_LABELS[objective], objective)
+        # CustomLineEdit değil: tolerans değişince önizleme yenilenmez
+        self.autofit_tolerance_input = QLineEdit(f"{DEFAULT_SIZE_TOLERANCE * 100:g}")
+        self.autofit_button = QPushButton("En İyi Yerleşimi Bul ve Uygula")
+        self.autofit_button.clicked.connect(self.apply_auto_fit)
+        autofit_layout.addRow("Amaç:", self.autofit_objective_combo)
+        autofit_layout.addRow("Boyut Toleransı (%):", self.autofit_tolerance_input)
+        autofit_layout.addRow("", self.autofit_button)
+        self.autofit_group.setLayout(autofit_layout)
+
         # 📌 Değişiklikleri Uygula Butonu
         self.auto_height_button = QPushButton("Sayfa Boyunu Otomatik Hesaplayarak Oluştur")
         self.auto_height_button.clicked.connect(self.calculate_page_height)
@@ -184,24 +266,32 @@ class PDFEditorApp(QWidget):
         # 📌 Sol Panel Elemanları
         self.control_panel.addWidget(self.page_settings_group)
         self.control_panel.addWidget(self.logo_settings_group)
+        self.control_panel.addWidget(self.autofit_group)
         self.control_panel.addWidget(self.auto_height_button)
         self.control_panel.addWidget(self.man_height_button)
         self.control_panel.addWidget(self.save_as_button)
 
         # 📌 Sağ Panel: PDF Önizleme - main6.py'deki gibi
-        self.pdf_preview_scroll = QScrollArea()
-        self.pdf_preview_label = QLabel("PDF önizlemesi burada görünecek.")
-        self.pdf_preview_label.setStyleSheet("border: 1px solid black;")
-        self.pdf_preview_label.setScaledContents(False)  # Oranı koruyacağız
-        self.pdf_preview_scroll.setWidget(self.pdf_preview_label)
-        self.pdf_preview_scroll.setWidgetResizable(True)
+        # Karo tabanlı önizleme: yalnızca görünen bölge, geçerli zoom'da çizilir (Ctrl + tekerlek)
+        self.pdf_preview = TiledPreview(zoom=self.zoom_factor, zoom_min=self.zoom_min,
+                                        zoom_max=self.zoom_max)
+        self.pdf_preview.zoomChanged.connect(self.set_zoom_factor)
 
         # 📌 Ana Düzeni Yerleştir
         main_layout.addLayout(self.control_panel, 1)  # Kontrol paneline 1 birim alan
-        main_layout.addWidget(self.pdf_preview_scroll, 3)  # PDF önizlemesine 3 birim alan
+        main_layout.addWidget(self.pdf_preview, 3)  # PDF önizlemesine 3 birim alan
 
         self.setLayout(main_layout)
 
+        # Form değişiklikleri son önizlemeyi gecikmeli olarak yeniler
+        for line_edit in self.findChildren(CustomLineEdit):
+            line_edit.confirmed.connect(self.schedule_preview)
+        self.engine_combo.currentIndexChanged.connect(self.schedule_preview)
+        self.remove_bg_checkbox.toggled.connect(self.schedule_preview)
+        self.paginate_checkbox.toggled.connect(self.schedule_preview)
+        self.mirror_x_checkbox.toggled.connect(self.schedule_preview)
+        self.mirror_y_checkbox.toggled.connect(self.schedule_preview)
+
     def setkaydet(self):
         """Ayarları kaydet"""
         settings = [
@@ -222,28 +312,40 @@ class PDFEditorApp(QWidget):
             self.color_button.setStyleSheet(f"background-color: {self.bg_color}; padding: 5px;")
             print(f"Seçilen Renk: {self.bg_color}")
 
-            if not self.pdf_path:
-                return
-                
-            current_dir = os.getcwd()
-            output2_path = os.path.join(current_dir, "output2_preview.pdf")
-            self.pdf_processor.add_transparent_logos(
-                pdf_path=self.pdf_path,
-                output_path=output2_path,
-                logo_width_cm=float(self.logo_width_input.text()),
-                logo_height_cm=float(self.logo_height_input.text()),
-                spacing_cm=float(self.spacing_input.text()),
-                spacingy_cm=float(self.spacingy_input.text()),
-                page_width_cm=float(self.page_width_input.text()),
-                page_height_cm=float(self.page_height_input.text()),
-                pagexcm=float(self.page_left_margin_input.text()),
-                pagexrcm=float(self.page_right_margin_input.text()),
-                pageycm=float(self.page_top_margin_input.text()),
-                total_logo=int(self.total_logo_input.text()),
-                arkaplan=True,
-                bg_color=self.bg_color
-            )
-            self.load_pdf_preview(output2_path)
+            if self.background_checkbox.isChecked():
+                self.update_preview_background()
+            else:
+                self.background_checkbox.setChecked(True)  # toggled -> update_preview_background
+
+    def preview_background(self):
+        """Önizlemede gösterilecek arka plan rengi (hex) veya None"""
+        return self.bg_color if self.background_checkbox.isChecked() else None
+
+    def update_preview_background(self, *args):
+        """Arka plan rengini yalnızca son önizlemenin arka plan katmanını yeniden yazarak uygula"""
+        pyramid = self.pdf_preview.pyramid
+        start = time.perf_counter()
+        if isinstance(pyramid, CompositePyramid):
+            pyramid.sheet.background_color = self.preview_background_rgb()
+        elif pyramid is not None and pyramid.doc is self.preview_document and is_layered(pyramid.doc):
+            self.apply_preview_background(pyramid.doc)
+        else:
+            # Henüz önizleme yok: tam üretim gerekir
+            if self.pdf_path:
+                self.request_preview(self.preview_mode or MODE_MANUAL, delay_ms=0)
+            return
+
+        self.pdf_preview.refresh()
+        print(f"🎨 Arka plan güncellendi: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def preview_background_rgb(self):
+        """Önizleme arka plan rengi (0-1 RGB) veya None"""
+        background = self.preview_background()
+        return None if background is None else self.pdf_processor.hex_to_rgb(background)
+
+    def apply_preview_background(self, doc):
+        """Belgenin arka plan katmanını formdaki renge göre yeniden yaz"""
+        set_background(doc, self.preview_background_rgb())
 
     def save_as_pdf(self):
         """PDF olarak kaydet"""
@@ -274,6 +376,10 @@ class PDFEditorApp(QWidget):
                     pagexrcm=float(self.page_right_margin_input.text()),
                     pageycm=float(self.page_top_margin_input.text()),
                     total_logo=int(self.total_logo_input.text()),
+                    engine=self.engine_combo.currentData(),
+                    remove_bg=self.remove_bg_checkbox.isChecked(),
+                    save_profile=self.save_profile_combo.currentData(),
+                    **self.transform_kwargs()
                 )
             else:
                 self.pdf_processor.add_transparent_logos(
@@ -290,8 +396,14 @@ class PDFEditorApp(QWidget):
                     pageycm=float(self.page_top_margin_input.text()),
                     total_logo=int(self.total_logo_input.text()),
                     arkaplan=True,
-                    bg_color=self.bg_color
+                    bg_color=self.bg_color,
+                    engine=self.engine_combo.currentData(),
+                    remove_bg=self.remove_bg_checkbox.isChecked(),
+                    paginate=self.paginate_checkbox.isChecked(),
+                    save_profile=self.save_profile_combo.currentData(),
+                    **self.transform_kwargs()
                 )
+            self.show_metrics(self.pdf_processor.last_metrics)
             
             # Ayarları kaydet
             self.setkaydet()
@@ -300,39 +412,67 @@ class PDFEditorApp(QWidget):
     def apply_changes(self):
         """Manuel sayfa boyunu kullanarak PDF oluştur"""
         if not self.pdf_path:
-            self.pdf_preview_label.setText("Lütfen önce bir PDF dosyası seçin!")
+            self.pdf_preview.setText("Lütfen önce bir PDF dosyası seçin!")
             return
-            
-        current_dir = os.getcwd()
-        output1_path = os.path.join(current_dir, "output_preview.pdf")
-        self.pdf_processor.add_transparent_logos(
-            pdf_path=self.pdf_path,
-            output_path=output1_path,
-            logo_width_cm=float(self.logo_width_input.text()),
-            logo_height_cm=float(self.logo_height_input.text()),
-            spacing_cm=float(self.spacing_input.text()),
-            spacingy_cm=float(self.spacingy_input.text()),
-            page_width_cm=float(self.page_width_input.text()),
-            page_height_cm=float(self.page_height_input.text()),
-            pagexcm=float(self.page_left_margin_input.text()),
-            pagexrcm=float(self.page_right_margin_input.text()),
-            pageycm=float(self.page_top_margin_input.text()),
-            total_logo=int(self.total_logo_input.text()),
-        )
-        self.load_pdf_preview(output1_path)
+
+        self.request_preview(MODE_MANUAL, delay_ms=0)
 
     def calculate_page_height(self):
         """Sayfa yüksekliğini otomatik hesapla"""
         if not self.pdf_path:
-            self.pdf_preview_label.setText("Lütfen önce bir PDF dosyası seçin!")
+            self.pdf_preview.setText("Lütfen önce bir PDF dosyası seçin!")
             return
-            
-        current_dir = os.getcwd()
-        output1_path = os.path.join(current_dir, "output_preview.pdf")
-        
-        page_height_pt = self.pdf_processor.calculate_transparent_logos(
+
+        self.request_preview(MODE_AUTO, delay_ms=0)
+        print("Sayfa boyu hesaplama fonksiyonu tetiklendi.")
+
+    def apply_auto_fit(self):
+        """Rulo için en iyi logo boyutu, döndürme ve adedi bul; forma uygula ve otomatik boyla oluştur"""
+        if not self.pdf_path:
+            self.pdf_preview.setText("Lütfen önce bir PDF dosyası seçin!")
+            return
+
+        try:
+            results = auto_fit(
+                logo_width_cm=float(self.logo_width_input.text()),
+                logo_height_cm=float(self.logo_height_input.text()),
+                page_width_cm=float(self.page_width_input.text()),
+                spacing_cm=float(self.spacing_input.text()),
+                spacingy_cm=float(self.spacingy_input.text()),
+                pagexcm=float(self.page_left_margin_input.text()),
+                pagexrcm=float(self.page_right_margin_input.text()),
+                pageycm=float(self.page_top_margin_input.text()),
+                total_logo=int(self.total_logo_input.text()),
+                objective=self.autofit_objective_combo.currentData(),
+                size_tolerance=float(self.autofit_tolerance_input.text()) / 100,
+                alternatives=3,
+            )
+        except ValueError as e:
+            print(f"❌ Otomatik yerleşim hatası: {e}")
+            return
+        if not results:
+            print("⚠️ Sayfa genişliğine sığan bir yerleşim bulunamadı")
+            return
+
+        for result in results:
+            print(f"📐 {result}")
+        best = results[0]
+
+        # Form logonun döndürülmemiş ölçüsünü tutar; 90° önerilirse ölçüler geri çevrilir
+        width, height = best.logo_width_cm, best.logo_height_cm
+        if best.rotation == 90:
+            width, height = height, width
+        self.set_rotation(best.rotation)
+        self.logo_width_input.setText(f"{width:.2f}")
+        self.logo_height_input.setText(f"{height:.2f}")
+        self.total_logo_input.setText(str(best.total_logo))
+        print(f"✅ Yerleşim uygulandı: {best.per_row} logo/satır, {best.length_cm:.1f} cm")
+        self.calculate_page_height()
+
+    def preview_job(self, mode):
+        """Formdaki değerlerden arka plan işçisine gönderilecek önizleme isteği"""
+        kwargs = dict(
             pdf_path=self.pdf_path,
-            output_path=output1_path,
             logo_width_cm=float(self.logo_width_input.text()),
             logo_height_cm=float(self.logo_height_input.text()),
             spacing_cm=float(self.spacing_input.text()),
@@ -342,12 +482,123 @@ class PDFEditorApp(QWidget):
             pagexrcm=float(self.page_right_margin_input.text()),
             pageycm=float(self.page_top_margin_input.text()),
             total_logo=int(self.total_logo_input.text()),
+            engine=self.engine_combo.currentData(),
+            remove_bg=self.remove_bg_checkbox.isChecked(),
+            **self.transform_kwargs()
         )
-        
-        self.heighta = page_height_pt
-        self.page_height_input.setText(f"{page_height_pt / CM_TO_PT:.2f}")
-        self.load_pdf_preview2(output1_path)
-        print("Sayfa boyu hesaplama fonksiyonu tetiklendi.")
+        if mode != MODE_AUTO:
+            kwargs.update(
+                page_height_cm=float(self.page_height_input.text()),
+                paginate=self.paginate_checkbox.isChecked(),
+            )
+        return {"mode": mode, "kwargs": kwargs, "background": self.preview_background()}
+
+    def request_preview(self, mode, delay_ms=DEBOUNCE_MS):
+        """Önizlemeyi arka planda üret; art arda gelen isteklerden yalnızca sonuncusu işlenir"""
+        try:
+            job = self.preview_job(mode)
+        except ValueError:
+            self.pdf_preview.setText("Geçerli sayısal değerler girin!")
+            return
+        self.preview_mode = mode
+        self.preview_worker.request(job, delay_ms)
+        if self.composite_checkbox.isChecked():
+            self.show_composite_preview(job)
+
+    def preview_logo_key(self, job):
+        """Hazırlanan logoyu belirleyen alanlar; aynıysa son üretimin logosu yeniden kullanılabilir"""
+        kwargs = job["kwargs"]
+        return (
+            source_digest(kwargs["pdf_path"]), job["mode"] == MODE_AUTO,
+            kwargs["logo_width_cm"], kwargs["logo_height_cm"], kwargs["engine"], kwargs["remove_bg"],
+        )
+
+    def show_composite_preview(self, job):
+        """Son üretimin logosunu yerleşimin her hücresine kopyalayarak önizlemeyi hemen göster"""
+        if self.preview_logo is None or self.preview_logo[0] != self.preview_logo_key(job):
+            return  # logo değişti: kesin çıktı beklenir
+        kwargs = dict(job["kwargs"])
+        del kwargs["remove_bg"]
+        try:
+            layout = self.pdf_processor.plan_layout(**kwargs)
+        except ValueError as e:
+            self.pdf_preview.setText(f"{e}")
+            return
+
+        start = time.perf_counter()
+        # Hücre yalnızca logo, boyutu veya dönüşümü değişince yeniden kurulur
+        cell_key = (self.preview_logo[0], layout.logo_size, layout.transform)
+        old_cell = None
+        if self.preview_cell is None or self.preview_cell[0] != cell_key:
+            if layout.cell_size is None:
+                return
+            logo_source, clip = self.preview_logo[1]
+            old_cell = self.preview_cell
+            self.preview_cell = (cell_key, LogoCell(logo_source, layout.logo_size, clip,
+                                                    layout.transform))
+        sheet = CompositeSheet(layout, self.preview_cell[1], self.preview_background_rgb())
+        self.pdf_preview.load_composite(sheet)
+        if old_cell is not None:
+            old_cell[1].close()  # eski hücreyi gösteren piramit artık kapalı
+        print(f"⚡ Anında önizleme: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def schedule_preview(self, *args):
+        """Form değişince son önizlemeyi (varsa) gecikmeli olarak yenile"""
+        if self.pdf_path and self.preview_mode is not None:
+            self.request_preview(self.preview_mode)
+
+    def show_preview_result(self, result):
+        """İşçiden gelen en son önizlemeyi göster"""
+        doc = open_pdf(result["pdf"])
+        # Üretim sürerken renk değiştiyse yalnızca arka plan katmanı güncellenir
+        if result["background"] != self.preview_background():
+            self.apply_preview_background(doc)
+
+        # Rasterlaştırma (kaba seviye karoları) işçinin ölçtüğü çalışmaya eklenir
+        run = RunMetrics.from_dict(result["metrics"])
+        with run.stage(STAGE_RASTERIZE, pages=doc.page_count):
+            if result["mode"] == MODE_AUTO:
+                self.heighta = result["page_height_pt"]
+                self.page_height_input.setText(f"{result['page_height_pt'] / CM_TO_PT:.2f}")
+                self.load_pdf_preview2(doc)
+            else:
+                self.load_pdf_preview(doc)
+
+        # Önizleme belgeyi göstermiyorsa (geçersiz form) eskisi korunur
+        pyramid = self.pdf_preview.pyramid
+        if pyramid is None or pyramid.doc is not doc:
+            doc.close()
+            return
+        if result["logo"] is not None:
+            self.preview_logo = (self.preview_logo_key(result["job"]), result["logo"])
+        old, self.preview_document = self.preview_document, doc
+        if old is not None:
+            old.close()
+        trim_mupdf_store()  # eski belgenin görsel ve yazı tipleri depoda kalmasın
+        self.show_metrics(run)
+
+    def show_metrics(self, run):
+        """Son üretimin aşama sürelerini önizlemenin köşesinde göster"""
+        if run is None:
+            return
+        if self.logo_name:
+            run.logo = self.logo_name   # işçi yalnızca ara kopyanın adını bilir
+        self.pdf_preview.set_status(run.report())
+
+    def show_preview_error(self, message):
+        print(f"Önizleme hatası: {message}")
+        self.pdf_preview.setText(f"Önizleme oluşturulamadı: {message}")
+        if self.preview_document is not None:
+            self.preview_document.close()
+            self.preview_document = None
+
+    def show_preview_busy(self, busy):
+        self.setWindowTitle("PDF Logo Editor - önizleme hazırlanıyor..." if busy else "PDF Logo Editor")
+
+    def closeEvent(self, event):
+        self.preview_worker.shutdown()
+        self.job_context.cleanup()
+        super().closeEvent(event)
 
     def update_logo_dimensions(self, source_input):
         """Kullanıcı Enter tuşuna basınca veya kutudan çıkınca en/boy oranına göre günceller"""
@@ -411,7 +662,7 @@ class PDFEditorApp(QWidget):
         """Sürükleme olayını kontrol et"""
         if event.mimeData().hasUrls():
             for url in event.mimeData().urls():
-                if url.toLocalFile().lower().endswith('.pdf'):
+                if url.toLocalFile().lower().endswith(('.pdf', '.svg')):
                     event.acceptProposedAction()
                     return
         event.ignore()
@@ -421,21 +672,24 @@ class PDFEditorApp(QWidget):
         files = [url.toLocalFile() for url in event.mimeData().urls()]
         if files:
             self.pdf_path = files[0]
-            self.rotation_angle = 0
+            self.set_rotation(0)
             self.process_pdf_file(self.pdf_path)
 
     def select_pdf(self):
         """PDF dosyası seç"""
         options = QFileDialog.Options()
         self.pdf_path, _ = QFileDialog.getOpenFileName(
-            self, "PDF Dosyası Seç", "", "PDF Files (*.pdf);;All Files (*)", options=options
+            self, "PDF Dosyası Seç", "", "Logo Files (*.pdf *.svg);;PDF Files (*.pdf);;SVG Files (*.svg);;All Files (*)",
+            options=options
         )
         if self.pdf_path:
-            self.rotation_angle = 0
+            self.set_rotation(0)
             self.process_pdf_file(self.pdf_path)
 
     def process_pdf_file(self, pdf_path):
         """PDF dosyasını işle"""
+        self.logo_name = os.path.basename(pdf_path)
+        self.preview_logo = None    # eski logonun hazır baytları tutulmasın
         try:
             # PDF'i işle ve kırp
             processed_pdf, width, height = self.file_manager.process_pdf_file(pdf_path, self.pdf_processor)
@@ -452,121 +706,103 @@ class PDFEditorApp(QWidget):
             self.logo_width_input.setText(f"{width:.2f}")
             self.logo_height_input.setText(f"{height:.2f}")
             
-            # Önizleme oluştur
-            pixmap = self.file_manager.create_preview_image(self.pdf_path, dpi=96)
-            if pixmap:
-                self.logo_preview_label.setPixmap(pixmap.scaled(100, 100))
+            # Önizleme oluştur (döndürme ve aynalama bu küçük resme uygulanır)
+            self.logo_thumbnail = self.file_manager.create_preview_image(self.pdf_path, dpi=96)
+            self.update_logo_thumbnail()
             
         except Exception as e:
             print(f"PDF işleme hatası: {str(e)}")
             traceback.print_exc()
 
+    def transform_kwargs(self):
+        """Yerleşimde uygulanacak döndürme ve aynalama (PDFProcessor parametreleri)"""
+        return dict(
+            rotation=self.rotation_angle,
+            mirror_x=self.mirror_x_checkbox.isChecked(),
+            mirror_y=self.mirror_y_checkbox.isChecked(),
+        )
+
+    def set_rotation(self, angle):
+        """Döndürme açısını ayarla; logo dosyası değişmez, yalnızca küçük resim döndürülür"""
+        self.rotation_angle = float(angle) % 360
+        self.rotation_input.setText(f"{self.rotation_angle:g}")
+        self.update_logo_thumbnail()
+
+    def set_rotation_from_input(self, text):
+        """Kutuya yazılan açıyı uygula (geçersizse eski değere dön)"""
+        try:
+            self.set_rotation(float(text.replace(",", ".")))
+        except ValueError:
+            self.rotation_input.setText(f"{self.rotation_angle:g}")
+
+    def update_logo_thumbnail(self, *args):
+        """Logo küçük resmini yeniden rasterlaştırmadan döndür/aynala"""
+        if self.logo_thumbnail is None:
+            return
+        transform = QTransform()
+        transform.rotate(self.rotation_angle)
+        transform.scale(-1 if self.mirror_x_checkbox.isChecked() else 1,
+                        -1 if self.mirror_y_checkbox.isChecked() else 1)
+        pixmap = self.logo_thumbnail.transformed(transform, Qt.SmoothTransformation)
+        self.logo_preview_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
     def rotate_logo(self):
-        """Logoyu 90 derece döndür"""
+        """Logoyu 90 derece döndür (yerleşimde uygulanır; dosya yeniden yazılmaz)"""
         if not self.pdf_path:
             print("Lütfen önce bir PDF yükleyin!")
             return
 
-        try:
-            # Rotasyon açısını güncelle
-            self.rotation_angle = (self.rotation_angle + 90) % 360
-            
-            # PDF'i döndür
-            rotated_pdf = self.file_manager.rotate_pdf(self.pdf_path, self.rotation_angle)
-            
-            if rotated_pdf:
-                self.pdf_path = rotated_pdf
-                
-                # Mevcut değerleri al
-                current_width = float(self.logo_width_input.text())
-                current_height = float(self.logo_height_input.text())
-                
-                # Rotasyon açısına göre boyutları güncelle
-                if self.rotation_angle in [90, 270]:
-                    new_width = current_height
-                    new_height = current_width
-                else:
-                    new_width = current_width
-                    new_height = current_height
-                
-                # Form alanlarını güncelle
-                self.logo_width_input.setText(f"{new_width:.2f}")
-                self.logo_height_input.setText(f"{new_height:.2f}")
-                
-                # Logo oranını güncelle
-                self.logo_aspect_ratio = new_width / new_height
-                self.fixed_aspect_ratio = self.logo_aspect_ratio
-                
-                # Önizlemeyi güncelle
-                pixmap = self.file_manager.create_preview_image(self.pdf_path, dpi=300)
-                if pixmap:
-                    self.logo_preview_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                
-                print(f"Logo başarıyla {self.rotation_angle}° döndürüldü")
-                
-        except Exception as e:
-            print(f"Döndürme hatası: {str(e)}")
-            traceback.print_exc()
+        self.set_rotation(self.rotation_angle + 90)
+        print(f"Logo {self.rotation_angle:g}° döndürüldü")
+        self.schedule_preview()
 
-    def load_pdf_preview(self, pdf_path):
-        """PDF önizlemesi yükle"""
+    def load_pdf_preview(self, source):
+        """PDF önizlemesi yükle (dosya yolu veya bellekteki fitz.Document)"""
         # Kullanıcının belirlediği sayfa genişliği ve yüksekliği (cm)
         try:
-            user_width_cm = float(self.page_width_input.text())
-            user_height_cm = float(self.page_height_input.text())
+            float(self.page_width_input.text())
+            float(self.page_height_input.text())
         except ValueError:
-            self.pdf_preview_label.setText("Geçerli bir genişlik ve yükseklik girin!")
+            self.pdf_preview.setText("Geçerli bir genişlik ve yükseklik girin!")
             return
 
-        # PDF'i aç ve ilk sayfayı yükle
-        doc = fitz.open(pdf_path)
-        page = doc[0]
-        pix = page.get_pixmap(dpi=96)  # 96 DPI önizleme için uygundur
-
-        # Kullanıcı girdilerini piksel cinsine dönüştür
-        target_width_px = int(user_width_cm * 37.795)  # 1 cm = 37.795 px
-        target_height_px = int(user_height_cm * 37.795)
-
-        # QImage ve QPixmap'e dönüştür
-        qt_img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_img)
+        # Sayfa gerçek boyutunda (zoom 1.0 = 96 DPI) karo karo gösterilir
+        self.pdf_preview.load_pdf(source)
 
-        # Pixmap'i ölçekle ve etikete uygula
-        self.pdf_preview_label.setPixmap(pixmap.scaled(target_width_px, target_height_px))
-        doc.close()
-
-    def load_pdf_preview2(self, pdf_path):
-        """PDF önizlemesi yükle (dinamik yükseklik)"""
-        # Kullanıcının belirlediği sayfa genişliği ve yüksekliği (cm)
+    def load_pdf_preview2(self, source):
+        """PDF önizlemesi yükle (dinamik yükseklik; dosya yolu veya bellekteki fitz.Document)"""
+        # Kullanıcının belirlediği sayfa genişliği (cm)
         try:
-            user_width_cm = float(self.page_width_input.text())
-            user_height_cm = self.heighta
+            float(self.page_width_input.text())
         except ValueError:
-            self.pdf_preview_label.setText("Geçerli bir genişlik girin!")
+            self.pdf_preview.setText("Geçerli bir genişlik girin!")
             return
-            
-        # PDF'i aç ve ilk sayfayı yükle
-        doc = fitz.open(pdf_path)
-        page = doc[0]
-        pix = page.get_pixmap(dpi=96)  # 96 DPI önizleme için uygundur
 
-        # Kullanıcı girdilerini piksel cinsine dönüştür
-        target_width_px = int(user_width_cm * 37.795)  # 1 cm = 37.795 px
-        target_height_px = int(user_height_cm)
+        # Yükseklik PDF'in kendisinden gelir
+        self.pdf_preview.load_pdf(source)
 
-        # QImage ve QPixmap'e dönüştür
-        qt_img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_img)
-
-        # Pixmap'i ölçekle ve etikete uygula
-        self.pdf_preview_label.setPixmap(pixmap.scaled(target_width_px, target_height_px))
-        doc.close()
+    def set_zoom_factor(self, zoom):
+        """Önizlemenin zoom değişikliğini sakla"""
+        self.zoom_factor = zoom
 
 
 def main():
+    configure_from_env()    # LOGO_EDITOR_METRICS verilmişse aşama süreleri JSON satırlarına yazılır
+    timer = StartupTimer(_PROCESS_START)
+    timer.mark("Modüller yüklendi")
     app = QApplication(sys.argv)
+    timer.mark("QApplication oluşturuldu")
     window = PDFEditorApp()
+    timer.mark("Pencere oluşturuldu")
     window.show()
+
+    if startup_report_requested():
+        def report_first_window():
+            timer.mark("İlk pencere gösterildi")
+            print(timer.report("Açılış süresi (ilk pencereye kadar)"), flush=True)
+        # Olay döngüsü ilk çizimi yaptıktan sonra çalışır
+        QTimer.singleShot(0, report_first_window)
+
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,3 @@
+"""
+PDF Logo Editor - Performans ölçüm modülü
+"""
@@ -0,0 +1,57 @@
+"""
+python -m src.benchmark <ölçüm> ile performans ölçümlerini çalıştırma
+"""
+
+import sys
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark",
+                                     description="PDF Logo Editor performans ölçümleri")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bbox_parser = sub.add_parser("bbox", help="Sınır kutusu stratejilerini karşılaştır")
+    bbox_parser.add_argument("--repeat", type=int, default=3)
+
+    sub.add_parser("composite", help="Anında önizlemeyi gerçek çıktıyla karşılaştır")
+    sub.add_parser("gang", help="Karışık logolu rulo paketleyicisini ölç")
+    sub.add_parser("svg", help="SVG içe aktarma okuyucularını karşılaştır")
+
+    pipeline_parser = sub.add_parser("pipeline", help="Üretim hattını ölç ve altın çıktıyla karşılaştır")
+    pipeline_parser.add_argument("--save", help="Sonuçları bu JSON dosyasına yaz")
+    pipeline_parser.add_argument("--compare", help="Önceki JSON sonuçlarıyla karşılaştır")
+    pipeline_parser.add_argument("--update-golden", action="store_true",
+                                 help="Altın çıktıları bu çalıştırmanın çıktısıyla yenile")
+
+    soak_parser = sub.add_parser("soak", help="Binlerce önizleme döngüsünde belleğin sabit kaldığını doğrula")
+    soak_parser.add_argument("--cycles", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "bbox":
+        from src.benchmark import bbox_benchmark
+        bbox_benchmark.run(repeat=args.repeat)
+    elif args.command == "composite":
+        from src.benchmark import composite_benchmark
+        _, failed = composite_benchmark.run()
+        return 1 if failed else 0
+    elif args.command == "gang":
+        from src.benchmark import gang_benchmark
+        gang_benchmark.run()
+    elif args.command == "svg":
+        from src.benchmark import svg_benchmark
+        svg_benchmark.run()
+    elif args.command == "pipeline":
+        from src.benchmark import pipeline_benchmark
+        _, failed = pipeline_benchmark.run(save=args.save, compare=args.compare,
+                                           update_golden=args.update_golden)
+        return 1 if failed else 0
+    elif args.command == "soak":
+        from src.benchmark import soak_benchmark
+        _, failed = soak_benchmark.run(cycles=args.cycles or soak_benchmark.SOAK_CYCLES)
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
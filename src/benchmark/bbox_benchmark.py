@@ -0,0 +1,54 @@
+"""
+Sınır kutusu stratejilerinin karşılaştırmalı ölçümü
+
+    python -m src.benchmark bbox
+"""
+
+import os
+import time
+import tempfile
+
+from src.benchmark.synthetic import make_logo
+from src.pdf_processor import bbox as bbox_module
+
+PATH_COUNTS = (100, 1000, 10000, 30000)
+MULTI_PAGE_COUNT = 8
+
+
+def _time_strategy(pdf_path, strategy, repeat):
+    """Hafıza devre dışıyken en iyi süreyi, sonra hafızadan okuma süresini ölç"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        bbox_module._bbox_memo.clear()
+        start = time.perf_counter()
+        result = bbox_module.document_bbox(pdf_path, strategy)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    start = time.perf_counter()
+    bbox_module.document_bbox(pdf_path, strategy)
+    memo = time.perf_counter() - start
+    return best, memo, result
+
+
+def run(repeat=3, path_counts=PATH_COUNTS):
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bbox_bench_") as work_dir:
+        cases = [(f"{count} yol", make_logo(os.path.join(work_dir, f"logo_{count}.pdf"), paths=count))
+                 for count in path_counts]
+        cases.append((
+            f"{MULTI_PAGE_COUNT} sayfa x {path_counts[-1] // MULTI_PAGE_COUNT} yol",
+            make_logo(os.path.join(work_dir, "logo_pages.pdf"),
+                      paths=path_counts[-1] // MULTI_PAGE_COUNT, pages=MULTI_PAGE_COUNT),
+        ))
+
+        print(f"{'logo':<24}{'strateji':<10}{'süre (ms)':>12}{'hafıza (ms)':>14}  sınır (pt)")
+        for name, pdf_path in cases:
+            for strategy in bbox_module.BBOX_STRATEGIES:
+                best, memo, result = _time_strategy(pdf_path, strategy, repeat)
+                box = "-" if result is None else "(" + ", ".join(f"{v:.1f}" for v in result) + ")"
+                print(f"{name:<24}{strategy:<10}{best * 1000:12.1f}{memo * 1000:14.3f}  {box}")
+                rows.append({"logo": name, "strategy": strategy, "seconds": best,
+                             "memo_seconds": memo, "bbox": result})
+    return rows
@@ -0,0 +1,83 @@
+"""
+Anında (birleştirilmiş) önizlemenin doğruluk ve hız ölçümü
+
+    python -m src.benchmark composite
+
+Her logo ve motor için gerçek çıktı bellekte üretilir, ilk sayfanın zoom 1.0 görüntüsü
+birleştirilmiş görüntüyle karşılaştırılır ve karo başına üretim süreleri ölçülür. Ortalama fark
+COMPOSITE_TOLERANCE'ı veya herhangi bir hücrede değişmiş piksel oranı COMPOSITE_CELL_TOLERANCE'ı
+aşarsa ölçüm başarısız sayılır.
+"""
+
+import os
+import time
+import tempfile
+
+from src.benchmark.synthetic import make_logo
+from src.pdf_processor.pdf_processor import PDFProcessor, ENGINES
+from src.pdf_processor.composite import (
+    LogoCell, CompositeSheet, CompositePyramid, compare_with_pdf, COMPOSITE_TOLERANCE,
+    COMPOSITE_CELL_TOLERANCE
+)
+from src.pdf_processor.tiles import TilePyramid, PREVIEW_DPI
+
+PATH_COUNTS = (100, 3000)
+LEVELS = (-3, 0, 2)
+TILES_PER_LEVEL = 16
+JOB = dict(logo_width_cm=5, logo_height_cm=3, spacing_cm=0.7, spacingy_cm=0.9,
+           page_width_cm=58, page_height_cm=60, total_logo=300)
+
+
+def _tile_seconds(pyramid, level):
+    """Sayfanın sol üst köşesindeki karoların ortalama üretim süresi"""
+    cols, rows = pyramid.grid(0, level)
+    side = int(TILES_PER_LEVEL ** 0.5)
+    keys = [(0, level, tx, ty) for ty in range(min(rows, side)) for tx in range(min(cols, side))]
+    start = time.perf_counter()
+    for key in keys:
+        pyramid.render(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def run(path_counts=PATH_COUNTS):
+    rows = []
+    failed = False
+    processor = PDFProcessor(in_memory=True)
+    background = processor.hex_to_rgb("#ffcc00")
+    with tempfile.TemporaryDirectory(prefix="composite_bench_") as work_dir:
+        print(f"{'logo':<12}{'motor':<8}{'fark ort.':>10}{'en büyük':>10}{'hücre %':>9}  "
+              + "  ".join(f"{'seviye ' + str(level):>18}" for level in LEVELS))
+        for count in path_counts:
+            logo = make_logo(os.path.join(work_dir, f"logo_{count}.pdf"), paths=count)
+            for engine in ENGINES:
+                processor.add_transparent_logos(logo, None, arkaplan=True, bg_color="#ffcc00",
+                                                engine=engine, **JOB)
+                doc = processor.take_document()
+                layout = processor.plan_layout(logo, engine=engine, **JOB)
+                logo_source, clip = processor.last_logo
+                cell = LogoCell(logo_source, layout.logo_size, clip, layout.transform)
+                sheet = CompositeSheet(layout, cell, background)
+
+                mean, worst, cell_changed = compare_with_pdf(sheet, doc, 0, PREVIEW_DPI / 72)
+                failed |= mean > COMPOSITE_TOLERANCE or cell_changed > COMPOSITE_CELL_TOLERANCE
+                timings = []
+                for level in LEVELS:
+                    composite = CompositePyramid(sheet)
+                    reference = TilePyramid(doc)
+                    timings.append((_tile_seconds(composite, level), _tile_seconds(reference, level)))
+                    composite.close()
+                    reference.close()
+                cell.close()
+                doc.close()
+
+                cells = "  ".join(f"{c * 1000:7.2f} / {r * 1000:7.2f}ms" for c, r in timings)
+                print(f"{str(count) + ' yol':<12}{engine:<8}{mean:10.2f}{worst:10d}"
+                      f"{cell_changed * 100:9.2f}  {cells}")
+                rows.append({"paths": count, "engine": engine, "mean_diff": mean, "max_diff": worst,
+                             "cell_changed": cell_changed, "tile_seconds": timings})
+
+    print(f"(karo süreleri: birleştirilmiş / PDF; fark sınırı {COMPOSITE_TOLERANCE}, "
+          f"hücre başına değişmiş piksel sınırı %{COMPOSITE_CELL_TOLERANCE * 100:g})")
+    if failed:
+        print("❌ Birleştirilmiş önizleme gerçek çıktıdan fazla farklı")
+    return rows, failed
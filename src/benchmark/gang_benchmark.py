@@ -0,0 +1,74 @@
+"""
+Karışık logolu rulo paketleyicisinin hız ve verim ölçümü
+
+    python -m src.benchmark gang
+
+Her adet için rastgele boyutlu kalemler üretilir; paketleme süresi, rulo boyu, alan alt sınırına
+(logo + aralık alanı / kullanılabilir genişlik) göre fazlalık ve doluluk raporlanır. Son olarak
+sentetik logolarla gerçek rulo PDF'i üretilip süresi ve dosya boyutu ölçülür.
+"""
+
+import os
+import time
+import random
+import tempfile
+
+from src.benchmark.synthetic import make_logo
+from src.pdf_processor.gang import GangItem, gang_layout, CM_TO_PT
+from src.pdf_processor.pdf_processor import PDFProcessor
+
+ITEM_COUNTS = (1000, 5000, 10000)
+KINDS = 50
+LOGO_KINDS = 8
+SHEET = dict(page_width_cm=58, spacing_cm=0.5, spacingy_cm=0.5, pagexcm=0.1, pagexrcm=0.1, pageycm=0.1)
+
+
+def _sizes(count, seed=0):
+    """KINDS farklı boyut (pt) ve toplamı yaklaşık count olan adetler"""
+    rng = random.Random(seed)
+    sizes = [(rng.uniform(2, 15) * CM_TO_PT, rng.uniform(2, 15) * CM_TO_PT) for _ in range(KINDS)]
+    weights = [rng.random() for _ in range(KINDS)]
+    quantities = [max(1, round(count * w / sum(weights))) for w in weights]
+    return sizes, quantities
+
+
+def run(item_counts=ITEM_COUNTS):
+    rows = []
+    spacing = SHEET["spacing_cm"] * CM_TO_PT
+    spacingy = SHEET["spacingy_cm"] * CM_TO_PT
+    margins = [SHEET[key] * CM_TO_PT for key in ("pagexcm", "pagexrcm", "pageycm")]
+    usable = SHEET["page_width_cm"] * CM_TO_PT - margins[0] - margins[1] + spacing
+
+    print(f"{'parça':>8}{'süre (sn)':>12}{'rulo (cm)':>12}{'alt sınır':>12}{'fazla':>8}{'doluluk':>9}")
+    for count in item_counts:
+        sizes, quantities = _sizes(count)
+        start = time.perf_counter()
+        layout = gang_layout(sizes, quantities, [True] * len(sizes),
+                             SHEET["page_width_cm"] * CM_TO_PT, spacing, spacingy, *margins)
+        elapsed = time.perf_counter() - start
+
+        area = sum((w + spacing) * (h + spacingy) * q for (w, h), q in zip(sizes, quantities))
+        bound = area / usable / CM_TO_PT
+        length = layout.page_height_pt / CM_TO_PT
+        print(f"{layout.placed:8d}{elapsed:12.2f}{length:12.1f}{bound:12.1f}"
+              f"{(length / bound - 1) * 100:7.1f}%{layout.utilization * 100:8.1f}%")
+        rows.append({"items": layout.placed, "seconds": elapsed, "length_cm": length,
+                     "bound_cm": bound, "utilization": layout.utilization})
+
+    # Gerçek PDF: her farklı logo bir kez gömülür
+    processor = PDFProcessor(in_memory=True)
+    with tempfile.TemporaryDirectory(prefix="gang_bench_") as work_dir:
+        logos = [make_logo(os.path.join(work_dir, f"logo_{i}.pdf"), paths=300, seed=i)
+                 for i in range(LOGO_KINDS)]
+        sizes, quantities = _sizes(item_counts[0])
+        items = [GangItem(logos[i % LOGO_KINDS], w / CM_TO_PT, h / CM_TO_PT, q)
+                 for i, ((w, h), q) in enumerate(zip(sizes, quantities))]
+        output = os.path.join(work_dir, "gang.pdf")
+        start = time.perf_counter()
+        processor.gang_sheet(items, output, save_profile="compact", **SHEET)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(output)
+    print(f"PDF: {processor.last_layout.placed} yerleşim, {LOGO_KINDS} logo, {elapsed:.2f} sn, "
+          f"{size / 1024:.1f} KB")
+    rows.append({"pdf_items": processor.last_layout.placed, "seconds": elapsed, "bytes": size})
+    return rows
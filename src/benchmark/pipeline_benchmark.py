@@ -0,0 +1,224 @@
+"""
+PDF üretim hattının hız ölçümü ve görsel doğruluk kapısı
+
+    python -m src.benchmark pipeline                        # ölç ve altın çıktılarla karşılaştır
+    python -m src.benchmark pipeline --update-golden        # altın çıktıları (yeniden) kaydet
+    python -m src.benchmark pipeline --save yeni.json --compare eski.json
+
+Artan karmaşıklıkta sentetik logolar (yol sayısı, gömülü görsel, sayfa sayısı) ve iki sayfa boyutu
+(küçük sayfa, uzun rulo) için get_logo_bbox, add_transparent_logos (iki motor ve 90° döndürülmüş),
+calculate_transparent_logos ve create_preview_image süreleri ölçülür. Her adımın ilk (soğuk önbellek)
+ve en iyi sıcak süresi raporlanır.
+
+Her çıktının tüm sayfaları GOLDEN_DPI'da rasterlaştırılıp altın çıktıyla (GOLDEN_DIR'deki PDF, aynı
+MuPDF ile aynı çözünürlükte rasterlaştırılır) NumPy ile karşılaştırılır. Bir kanalı GOLDEN_CHANGED'dan
+fazla farklı piksel "değişmiş" sayılır; bir çıktıda GOLDEN_MAX_CHANGED'dan fazla değişmiş piksel varsa,
+sayfa sayısı veya boyutu farklıysa ya da altın çıktı yoksa ölçüm başarısız olur. Böylece bir hızlandırma
+basılan sonucu sessizce değiştiremez (tek bir eksik logo bile yüzlerce pikseldir).
+
+Altın çıktılar depoda (golden/) tutulur; her adımınki, o adımın çıktısını bilerek değiştiren son
+sürümle üretilmiştir (bkz. README). Yalnızca çıktıyı bilerek değiştiren bir değişiklikte --update-golden
+ile yenilenir (sentetik logolar sabit tohumla üretildiği için her seferinde aynıdır).
+"""
+
+import os
+import json
+import time
+import tempfile
+import contextlib
+
+from src.benchmark.synthetic import make_logo
+from src.pdf_processor import bbox as bbox_module
+from src.pdf_processor.pdf_processor import PDFProcessor, ENGINE_SVG, ENGINE_NATIVE
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+GOLDEN_DPI = 50
+GOLDEN_CHANGED = 32         # bir kanalı bundan fazla farklı piksel değişmiş sayılır (0-255)
+GOLDEN_MAX_CHANGED = 20     # çıktı başına izin verilen değişmiş piksel sayısı
+REPEAT = 3                  # sıcak ölçüm tekrarı (en iyisi alınır)
+
+# Logo karmaşıklıkları (make_logo parametreleri)
+LOGO_CASES = {
+    "basit": dict(paths=100),
+    "karmasik": dict(paths=2000),
+    "gorselli": dict(paths=300, images=20),
+    "cok_sayfa": dict(paths=300, pages=4),
+}
+# Sayfa boyutları ve logo adetleri
+SHEETS = {
+    "sayfa": dict(page_width_cm=30, page_height_cm=30, total_logo=12),
+    "rulo": dict(page_width_cm=58, page_height_cm=300, total_logo=400),
+}
+LOGO = dict(logo_width_cm=5, logo_height_cm=3, spacing_cm=0.5, spacingy_cm=0.5,
+            pagexcm=0.5, pagexrcm=0.5, pageycm=0.5)
+
+
+def _measure(step, repeat=REPEAT):
+    """step() çağrısının (ilk süre, en iyi sıcak süre, son sonucu); adımların ekran çıktısı bastırılır"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return _timed(step, repeat)
+
+
+def _timed(step, repeat):
+    start = time.perf_counter()
+    result = step()
+    first = time.perf_counter() - start
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = step()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return first, best, result
+
+
+def raster(doc, dpi=GOLDEN_DPI):
+    """Belgenin her sayfası için (yükseklik, genişlik, 3) uint8 dizisi"""
+    import numpy as np
+
+    pages = []
+    for page in doc:
+        pix = page.get_pixmap(dpi=dpi, alpha=False)
+        data = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)
+        pages.append(data[:, :pix.width * 3].reshape(pix.height, pix.width, 3).copy())
+    return pages
+
+
+def golden_path(name, golden_dir=GOLDEN_DIR):
+    return os.path.join(golden_dir, f"{name}.pdf")
+
+
+def save_golden(name, doc, golden_dir=GOLDEN_DIR):
+    """Çıktıyı altın PDF olarak kaydet"""
+    os.makedirs(golden_dir, exist_ok=True)
+    doc.save(golden_path(name, golden_dir), garbage=4, deflate=True)
+
+
+def golden_diff(name, doc, golden_dir=GOLDEN_DIR):
+    """Altın çıktıya göre (değişmiş piksel sayısı, en büyük kanal farkı); altın yoksa None
+
+    Sayfa sayısı veya sayfa boyutu farklıysa değişmiş piksel sayısı sonsuz kabul edilir.
+    """
+    import fitz
+    import numpy as np
+
+    path = golden_path(name, golden_dir)
+    if not os.path.exists(path):
+        return None
+    with fitz.open(path) as golden_doc:
+        golden = raster(golden_doc)
+    pages = raster(doc)
+    if len(golden) != len(pages) or any(g.shape != p.shape for g, p in zip(golden, pages)):
+        return float("inf"), 255
+    changed = 0
+    worst = 0
+    for g, p in zip(golden, pages):
+        diff = np.abs(g.astype(np.int16) - p.astype(np.int16)).max(axis=2)
+        changed += int((diff > GOLDEN_CHANGED).sum())
+        worst = max(worst, int(diff.max()))
+    return changed, worst
+
+
+def _preview_available():
+    """create_preview_image QPixmap döndürür; PyQt5 varsa ekransız bir QGuiApplication kurulur"""
+    try:
+        from PyQt5.QtGui import QGuiApplication
+    except ImportError:
+        return False
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if QGuiApplication.instance() is None:
+        _preview_available.app = QGuiApplication([])
+    return True
+
+
+def run(save=None, compare=None, update_golden=False, golden_dir=GOLDEN_DIR):
+    from src.file_manager.file_manager import FileManager
+
+    rows = []
+    missing = []
+    different = []
+    previous = {}
+    if compare:
+        with open(compare, "r", encoding="utf-8") as f:
+            previous = {(r["logo"], r["sheet"], r["step"]): r for r in json.load(f)["rows"]}
+    preview = _preview_available()
+
+    print(f"{'logo':<11}{'sayfa':<7}{'adım':<14}{'ilk (sn)':>10}{'sıcak (sn)':>12}{'değişen':>8}"
+          + (f"{'önceki oran':>13}" if previous else ""))
+    with tempfile.TemporaryDirectory(prefix="pipeline_bench_") as work_dir:
+        for logo_name, params in LOGO_CASES.items():
+            logo = make_logo(os.path.join(work_dir, f"{logo_name}.pdf"), seed=1, **params)
+            for sheet_name, sheet in SHEETS.items():
+                # Her durum boş önbellekle başlar: ilk süre soğuk yolu ölçer
+                processor = PDFProcessor(in_memory=True)
+                file_manager = FileManager(context=processor.context)
+                job = dict(LOGO, **sheet)
+                auto_job = {k: v for k, v in job.items() if k != "page_height_cm"}
+
+                def bbox():
+                    bbox_module._bbox_memo.clear()
+                    return processor.get_logo_bbox(logo)
+
+                def build(method, **kwargs):
+                    def step():
+                        method(logo, None, **kwargs)
+                        return processor.take_document()
+                    return step
+
+                steps = [
+                    ("bbox", bbox),
+                    ("add_svg", build(processor.add_transparent_logos, engine=ENGINE_SVG, **job)),
+                    ("add_native", build(processor.add_transparent_logos, engine=ENGINE_NATIVE, **job)),
+                    ("add_rotated", build(processor.add_transparent_logos, engine=ENGINE_NATIVE,
+                                          rotation=90, **job)),
+                    ("calculate", build(processor.calculate_transparent_logos, **auto_job)),
+                ]
+                if preview:
+                    steps.append(("preview", lambda: file_manager.create_preview_image(logo, dpi=96)))
+
+                for step_name, step in steps:
+                    first, warm, result = _measure(step)
+                    changed = worst = None
+                    mark = "-"
+                    if step_name.startswith(("add", "calculate")):
+                        name = f"{logo_name}-{sheet_name}-{step_name}"
+                        if update_golden:
+                            save_golden(name, result, golden_dir)
+                        else:
+                            diff = golden_diff(name, result, golden_dir)
+                            if diff is None:
+                                missing.append(name)
+                                mark = "yok"
+                            else:
+                                changed, worst = diff
+                                mark = f"{changed:g}"
+                                if changed > GOLDEN_MAX_CHANGED:
+                                    different.append(name)
+                        result.close()
+
+                    row = {"logo": logo_name, "sheet": sheet_name, "step": step_name,
+                           "first_seconds": first, "warm_seconds": warm,
+                           "golden_changed": changed, "golden_max_diff": worst}
+                    rows.append(row)
+                    line = (f"{logo_name:<11}{sheet_name:<7}{step_name:<14}{first:10.4f}{warm:12.4f}"
+                            f"{mark:>8}")
+                    old = previous.get((logo_name, sheet_name, step_name))
+                    if old:
+                        line += f"{warm / old['warm_seconds']:12.2f}x"
+                    print(line)
+                processor.context.cleanup()
+
+    if update_golden:
+        print(f"💾 Altın PDF'ler kaydedildi: {golden_dir}")
+    if save:
+        os.makedirs(os.path.dirname(os.path.abspath(save)), exist_ok=True)
+        with open(save, "w", encoding="utf-8") as f:
+            json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "rows": rows}, f, indent=1)
+        print(f"💾 Sonuçlar kaydedildi: {save}")
+    if missing:
+        print(f"❌ {len(missing)} çıktının altın PDF'i yok ({golden_dir}); "
+              f"bilerek üretmek için --update-golden kullanın")
+    if different:
+        print(f"❌ {len(different)} çıktı altın PDF'ten farklı ({GOLDEN_MAX_CHANGED} pikselden fazlası "
+              f"{GOLDEN_CHANGED}'den fazla değişmiş): {', '.join(different)}")
+    return rows, bool(missing or different)
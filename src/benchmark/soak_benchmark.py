@@ -0,0 +1,135 @@
+"""
+Uzun oturum bellek (soak) testi
+
+    python -m src.benchmark soak                    # SOAK_CYCLES önizleme döngüsü
+    python -m src.benchmark soak --cycles 500
+
+Arayüzün bir önizleme döngüsü aynı PDFProcessor ile binlerce kez tekrarlanır: değişen logo, boyut
+ve motorla bellekte üretim, take_document + tobytes, karo piramidiyle görünür karoların üretimi,
+anında önizleme hücresi ve her SAVE_EVERY döngüde bir "Farklı Kaydet". Isınmadan (SOAK_WARMUP)
+sonra süreç RSS'i SOAK_MAX_GROWTH_MB'tan fazla artarsa veya sonda açık fitz.Document kalırsa
+ölçüm başarısız olur.
+"""
+
+import gc
+import os
+import time
+import tempfile
+import contextlib
+
+from src.benchmark.synthetic import make_logo
+from src.pdf_processor.memory import rss_bytes, budget_mb
+from src.pdf_processor.pdf_processor import PDFProcessor, ENGINE_SVG, ENGINE_NATIVE
+from src.pdf_processor.save_profiles import SAVE_COMPACT
+from src.pdf_processor.composite import LogoCell, CompositeSheet, CompositePyramid
+from src.pdf_processor.tiles import TilePyramid, LEVEL_MIN
+
+SOAK_CYCLES = 2000
+SOAK_WARMUP = 200           # önbellekler ve kütüphaneler bu döngülerde dolar
+SOAK_MAX_GROWTH_MB = 32     # ısınmadan sonra izin verilen RSS artışı
+SAMPLE_EVERY = 100
+SAVE_EVERY = 20
+
+# Döngülerde sırayla kullanılan logolar (make_logo parametreleri)
+LOGOS = (dict(paths=100), dict(paths=300, images=5), dict(paths=50, background=True))
+ENGINES = (ENGINE_SVG, ENGINE_NATIVE)
+JOB = dict(logo_height_cm=3, spacing_cm=0.5, spacingy_cm=0.5, pagexcm=0.5, pagexrcm=0.5,
+           pageycm=0.5, page_width_cm=58)
+
+
+def open_documents():
+    """Çöp toplayıcının gördüğü kapatılmamış fitz.Document sayısı"""
+    import fitz
+
+    gc.collect()
+    return sum(1 for obj in gc.get_objects()
+               if isinstance(obj, fitz.Document) and not obj.is_closed)
+
+
+def _job(i):
+    """i. döngünün iş parametreleri (boyut ve adet değişir, önbellek ıskaları olur)"""
+    return dict(JOB, logo_width_cm=4 + (i % 41) * 0.05, page_height_cm=40 + (i % 7) * 10,
+                total_logo=20 + (i % 13) * 5, engine=ENGINES[i % len(ENGINES)],
+                rotation=90 * (i % 4 == 3))
+
+
+def _cycle(processor, logo, job, output_path):
+    """Bir önizleme döngüsü (output_path verilirse kaydetme döngüsü)"""
+    if output_path is not None:
+        processor.add_transparent_logos(logo, output_path, save_profile=SAVE_COMPACT, **job)
+        return
+
+    processor.add_transparent_logos(logo, None, layered=True, arkaplan=True, **job)
+    with processor.take_document() as doc:
+        data = doc.tobytes()
+
+    # Kesin önizleme: en kaba seviyenin tamamı ve zoom 1.0'ın sol üst köşesi
+    pyramid = TilePyramid(data)
+    try:
+        for level, limit in ((LEVEL_MIN, None), (0, 3)):
+            cols, rows = pyramid.grid(0, level)
+            for tx in range(cols if limit is None else min(cols, limit)):
+                for ty in range(rows if limit is None else min(rows, limit)):
+                    pyramid.render((0, level, tx, ty))
+    finally:
+        pyramid.close()
+
+    # Anında önizleme: son üretimin logosundan birleştirilmiş karolar
+    layout = processor.plan_layout(logo, **job)
+    logo_source, clip = processor.last_logo
+    if layout.cell_size is None:
+        return
+    cell = LogoCell(logo_source, layout.logo_size, clip, layout.transform)
+    composite = CompositePyramid(CompositeSheet(layout, cell, (1, 0.8, 0)))
+    try:
+        for tx in range(2):
+            for ty in range(2):
+                composite.render((0, 0, tx, ty))
+    finally:
+        composite.close()
+        cell.close()
+
+
+def run(cycles=SOAK_CYCLES, warmup=SOAK_WARMUP, max_growth_mb=SOAK_MAX_GROWTH_MB):
+    if rss_bytes() is None:
+        print("⚠️ RSS okunamıyor (/proc yok); soak testi atlandı")
+        return [], False
+
+    samples = []
+    processor = PDFProcessor(in_memory=True)
+    warmup = min(warmup, cycles // 2)
+    baseline = None
+    start = time.perf_counter()
+    print(f"🧪 {cycles} döngü, bellek bütçesi {budget_mb():.0f} MB")
+    with tempfile.TemporaryDirectory(prefix="soak_bench_") as work_dir:
+        logos = [make_logo(os.path.join(work_dir, f"logo_{n}.pdf"), seed=n, **params)
+                 for n, params in enumerate(LOGOS)]
+        output_path = os.path.join(work_dir, "kayit.pdf")
+        with open(os.devnull, "w") as devnull:
+            for i in range(cycles):
+                with contextlib.redirect_stdout(devnull):
+                    save = (i + 1) % SAVE_EVERY == 0
+                    _cycle(processor, logos[i % len(logos)], _job(i), output_path if save else None)
+                if i + 1 == warmup:
+                    gc.collect()
+                    baseline = rss_bytes()
+                if (i + 1) % SAMPLE_EVERY == 0 or i + 1 == cycles:
+                    rss = rss_bytes()
+                    samples.append((i + 1, rss))
+                    growth = "" if baseline is None else f" ({(rss - baseline) / 2 ** 20:+.1f} MB)"
+                    print(f"{i + 1:>7} döngü  RSS {rss / 2 ** 20:7.1f} MB{growth}")
+        processor.context.cleanup()
+
+    gc.collect()
+    growth_mb = (rss_bytes() - baseline) / 2 ** 20
+    leaked = open_documents()
+    print(f"⏱ {time.perf_counter() - start:.1f} sn, ısınmadan sonra artış {growth_mb:+.1f} MB, "
+          f"açık belge {leaked}")
+    failed = False
+    if growth_mb > max_growth_mb:
+        print(f"❌ Bellek ısınmadan sonra {growth_mb:.1f} MB arttı (sınır {max_growth_mb} MB)")
+        failed = True
+    if leaked:
+        print(f"❌ Kapatılmamış {leaked} fitz.Document kaldı")
+        failed = True
+    return samples, failed
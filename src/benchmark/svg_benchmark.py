@@ -0,0 +1,70 @@
+"""
+SVG içe aktarma okuyucularının hız ve bellek karşılaştırması
+
+    python -m src.benchmark svg
+
+Her boyuttaki sentetik SVG; eski yol (tüm dosya ElementTree ile okunup svglib'e verilir), akış
+hâlinde temizleme + svglib ve akış hâlinde temizleme + mupdf ile PDF'e çevrilir. Her ölçüm ayrı bir
+süreçte yapılır; tepe bellek o sürecin en yüksek RSS'idir (yorumlayıcı ve kütüphaneler dahil).
+svglib, SVGLIB_MAX_PATHS'ten büyük dosyalarda dakikalar sürdüğü için atlanır.
+"""
+
+import os
+import time
+import resource
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.benchmark.synthetic import make_svg
+
+PATH_COUNTS = (10000, 100000, 500000)
+SVGLIB_MAX_PATHS = 100000
+METHODS = ("tree+svglib", "stream+svglib", "stream+mupdf")
+
+
+def _convert(method, svg_path, work_dir):
+    """Ayrı süreçte çalışır: (süre sn, tepe RSS MB, PDF boyutu bayt)"""
+    from src.pdf_processor import svg_ingest
+
+    start = time.perf_counter()
+    if method == "tree+svglib":
+        # Eski yol: dosyanın tamamı bellekte ağaç olarak işlenir
+        import xml.etree.ElementTree as ET
+
+        with open(svg_path, "rb") as f:
+            root = ET.fromstring(f.read())
+        for rect in root.findall("{http://www.w3.org/2000/svg}rect"):
+            if svg_ingest.is_background_rect("rect", rect.attrib):
+                root.remove(rect)
+        pdf = svg_ingest.svglib_to_pdf(ET.tostring(root))
+    else:
+        cleaned = os.path.join(work_dir, f"cleaned_{os.getpid()}.svg")
+        svg_ingest.strip_background(svg_path, cleaned)
+        backend = method.split("+")[1]
+        pdf, _ = svg_ingest.svg_to_pdf(cleaned, backend)
+        os.remove(cleaned)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return elapsed, peak, len(pdf)
+
+
+def run(path_counts=PATH_COUNTS):
+    rows = []
+    context = multiprocessing.get_context("spawn")
+    print(f"{'yol':>8}{'SVG (MB)':>10}  {'yöntem':<15}{'süre (sn)':>10}{'tepe RSS (MB)':>15}{'PDF (KB)':>10}")
+    with tempfile.TemporaryDirectory(prefix="svg_bench_") as work_dir:
+        for count in path_counts:
+            svg_path = make_svg(os.path.join(work_dir, f"logo_{count}.svg"), paths=count)
+            size = os.path.getsize(svg_path) / 1024 / 1024
+            for method in METHODS:
+                if "svglib" in method and count > SVGLIB_MAX_PATHS:
+                    print(f"{count:8d}{size:10.1f}  {method:<15}{'atlandı':>10}")
+                    continue
+                # Her ölçüm temiz bir süreçte: tepe RSS yalnızca bu dönüşümü yansıtır
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    elapsed, peak, pdf_size = pool.submit(_convert, method, svg_path, work_dir).result()
+                print(f"{count:8d}{size:10.1f}  {method:<15}{elapsed:10.2f}{peak:15.1f}{pdf_size / 1024:10.1f}")
+                rows.append({"paths": count, "svg_mb": size, "method": method, "seconds": elapsed,
+                             "peak_rss_mb": peak, "pdf_bytes": pdf_size})
+    return rows
@@ -0,0 +1,79 @@
+"""
+Ölçümler için yapay (sentetik) logo üretimi
+"""
+
+import random
+
+# Logo sayfasının varsayılan boyutu (pt)
+LOGO_PAGE_WIDTH = 300
+LOGO_PAGE_HEIGHT = 200
+
+
+def make_logo(path, paths=100, images=0, pages=1, text=True, background=False, seed=0):
+    """Belirtilen karmaşıklıkta bir logo PDF'i üret ve yolunu döndür
+
+    paths: sayfa başına vektör yol sayısı, images: sayfa başına gömülü görsel sayısı,
+    background: sayfayı kaplayan beyaz arkaplan dikdörtgeni eklensin mi
+    """
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=LOGO_PAGE_WIDTH, height=LOGO_PAGE_HEIGHT)
+        if background:
+            page.draw_rect(page.rect, color=None, fill=(1, 1, 1))
+
+        # Logo içeriği sayfanın ortasındaki alana sığar, kenarlarda boşluk kalır
+        area = fitz.Rect(30, 25, LOGO_PAGE_WIDTH - 30, LOGO_PAGE_HEIGHT - 25)
+        shape = page.new_shape()
+        for _ in range(paths):
+            x = rng.uniform(area.x0, area.x1 - 10)
+            y = rng.uniform(area.y0, area.y1 - 10)
+            points = [(x, y)] + [
+                (min(area.x1, x + rng.uniform(0, 10)), min(area.y1, y + rng.uniform(0, 10)))
+                for _ in range(3)
+            ]
+            shape.draw_polyline(points + [points[0]])
+            shape.finish(color=None, fill=(rng.random(), rng.random(), rng.random()), closePath=True)
+        shape.commit()
+
+        for _ in range(images):
+            size = 16
+            samples = bytes(rng.randrange(256) for _ in range(size * size * 3))
+            pixmap = fitz.Pixmap(fitz.csRGB, size, size, samples, False)
+            x = rng.uniform(area.x0, area.x1 - 20)
+            y = rng.uniform(area.y0, area.y1 - 20)
+            page.insert_image(fitz.Rect(x, y, x + 20, y + 20), pixmap=pixmap)
+
+        if text:
+            page.insert_text((area.x0, area.y1), "LOGO", fontsize=18, color=(0, 0, 0))
+
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def make_svg(path, paths=100, background=True, seed=0):
+    """Belirtilen sayıda yol içeren bir logo SVG'si üret (akış hâlinde yazılır) ve yolunu döndür
+
+    Yol başına ~90 bayt: 500000 yol yaklaşık 45 MB'tır. background: kökün altında beyaz arka plan
+    dikdörtgeni (içe aktarmada çıkarılır).
+    """
+    rng = random.Random(seed)
+    width, height = LOGO_PAGE_WIDTH, LOGO_PAGE_HEIGHT
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}pt" height="{height}pt" '
+                f'viewBox="0 0 {width} {height}">\n')
+        if background:
+            f.write(f'<rect x="0" y="0" width="{width}" height="{height}" fill="#ffffff"/>\n')
+        f.write('<g>\n')
+        for _ in range(paths):
+            x = rng.uniform(30, width - 40)
+            y = rng.uniform(25, height - 35)
+            f.write(f'<path d="M{x:.2f} {y:.2f}l{rng.uniform(0, 10):.2f} {rng.uniform(0, 10):.2f}'
+                    f'l{rng.uniform(-10, 0):.2f} {rng.uniform(0, 10):.2f}z" '
+                    f'fill="#{rng.randrange(0x1000000):06x}"/>\n')
+        f.write('</g>\n</svg>\n')
+    return path
@@ -3,19 +3,22 @@ Dosya yönetimi işlevleri modülü
 """
 
 import os
-import fitz
-from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import Qt
+import shutil
+
+from src.pdf_processor.job_context import JobContext
+from src.pdf_processor.metrics import stage, STAGE_RASTERIZE
+
+# fitz ve PyQt5 yalnızca kullanan fonksiyonlarda içe aktarılır (hızlı açılış için)
+
+# Ara dosya adları (JobContext dizininde)
+SELECTED_LOGO_FILE = "selected_logo.pdf"
 
 
 class FileManager:
-    def __init__(self):
-        """Dosya yöneticisi sınıfını başlat"""
+    def __init__(self, context=None):
+        """Dosya yöneticisi sınıfını başlat; ara dosyalar context'in (JobContext) dizinine yazılır"""
         self.settings_file = "kayitliayar.txt"
-        
-        # Temp klasörünü kontrol et
-        if not os.path.exists("temp"):
-            os.makedirs("temp")
+        self.context = context if context is not None else JobContext()
     
     def useprevset(self):
         """Kayıtlı ayarları yükle"""
@@ -48,15 +51,16 @@ class FileManager:
             print(f"Ayar kaydetme hatası: {str(e)}")
     
     def process_pdf_file(self, pdf_path, pdf_processor):
-        """PDF dosyasını işle ve gerekirse kırp"""
-        temp_pdf = os.path.join("temp", "temp_logo.pdf")
-        
+        """PDF (veya SVG) dosyasını işle ve gerekirse kırp; SVG'ler önce PDF'e çevrilir"""
+        temp_pdf = self.context.path(SELECTED_LOGO_FILE)
+        source = pdf_processor.logo_source(pdf_path)
+
         # Dosyayı kopyala
-        with open(pdf_path, "rb") as src_file:
-            pdf_content = src_file.read()
-            
-        with open(temp_pdf, "wb") as dst_file:
-            dst_file.write(pdf_content)
+        if isinstance(source, (bytes, bytearray)):
+            with open(temp_pdf, "wb") as dst_file:
+                dst_file.write(source)
+        else:
+            shutil.copyfile(source, temp_pdf)
         
         # Logo boyutlarını hesapla
         width_cm, height_cm = pdf_processor.get_logo_bbox(temp_pdf)
@@ -65,48 +69,23 @@ class FileManager:
     
     def create_preview_image(self, pdf_path, dpi=300):
         """PDF'ten önizleme görseli oluştur"""
+        import fitz
+        from PyQt5.QtGui import QImage, QPixmap
+
         try:
-            doc = fitz.open(pdf_path)
-            if doc.page_count > 0:
-                page = doc[0]
-                pix = page.get_pixmap(dpi=dpi)
-                
-                # PyMuPDF pixmap'i Qt QImage'e dönüştür
-                img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(img)
-                
-                doc.close()
-                return pixmap
+            with fitz.open(pdf_path) as doc:
+                if doc.page_count > 0:
+                    page = doc[0]
+                    with stage(None, STAGE_RASTERIZE, dpi=dpi) as fields:
+                        pix = page.get_pixmap(dpi=dpi)
+                        fields["pixels"] = pix.width * pix.height
+
+                    # PyMuPDF pixmap'i Qt QImage'e dönüştür (QPixmap kendi kopyasını tutar)
+                    img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+                    pixmap = QPixmap.fromImage(img)
+                    del img, pix
+                    return pixmap
         except Exception as e:
             print(f"Önizleme oluşturma hatası: {str(e)}")
         
         return None
-    
-    def rotate_pdf(self, pdf_path, angle):
-        """PDF'i döndür ve temp dosyasını geri döndür"""
-        temp_rotated_path = os.path.join("temp", "temp_rotated_90.pdf")
-        
-        try:
-            # Orijinal dosyayı kopyala
-            doc = fitz.open(pdf_path)
-            page = doc[0]
-            
-            # Yeni döndürülmüş PDF oluştur
-            rotated_doc = fitz.open()
-            rotated_page = rotated_doc.new_page(width=page.rect.height, height=page.rect.width)
-            
-            # Döndürme matrisi oluştur
-            matrix = fitz.Matrix(0, -1, 1, 0, 0, page.rect.width)  # 90 derece saat yönünde döndürme
-            
-            # Orijinal sayfayı döndürülmüş sayfaya çiz
-            rotated_page.show_pdf_page(rotated_page.rect, doc, 0, matrix=matrix)
-            
-            # Yeni dosyayı kaydet
-            rotated_doc.save(temp_rotated_path)
-            rotated_doc.close()
-            doc.close()
-            
-            return temp_rotated_path
-        except Exception as e:
-            print(f"PDF döndürme hatası: {str(e)}")
-            return pdf_path
@@ -0,0 +1,10 @@
+"""
+python -m src.pdf_processor ile arayüzsüz çalıştırma
+"""
+
+import sys
+
+from src.pdf_processor.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
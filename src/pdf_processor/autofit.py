@@ -0,0 +1,145 @@
+"""
+Sabit genişlikli rulo için logo boyutu, döndürme ve satır başına adet eniyileyicisi
+
+Otomatik sayfa boyu modunda (calculate_transparent_logos) rulo uzunluğu yalnızca satır başına logo
+sayısına ve satır yüksekliğine bağlıdır; bu yüzden adaylar PDF oluşturmadan, layout modülündeki
+hesabın vektörel karşılığıyla puanlanır. Adaylar: iki döndürme (0/90) x izin verilen boyut aralığındaki
+genişlikler + her satır adedinin sığdığı en büyük genişlikler (formdaki gibi 0.01 cm'ye yuvarlı).
+Her (döndürme, satır adedi) grubunun amaca göre en iyi adayı (eşitlikte daha büyük logo) alternatif
+olarak tutulur; gruplar amaca göre sıralanır.
+NumPy ilk kullanımda yüklenir.
+"""
+
+from src.pdf_processor.layout import AUTO_HEIGHT_PADDING_PT, auto_page_height, logos_per_row
+
+CM_TO_PT = 72/2.54
+
+# Amaçlar
+OBJECTIVE_LENGTH = "length"     # istenen adet için en kısa rulo
+OBJECTIVE_DENSITY = "density"   # metre başına en çok logo
+OBJECTIVES = (OBJECTIVE_LENGTH, OBJECTIVE_DENSITY)
+OBJECTIVE_LABELS = {
+    OBJECTIVE_LENGTH: "En kısa rulo",
+    OBJECTIVE_DENSITY: "Metrede en çok logo",
+}
+
+ROTATIONS = (0, 90)
+DEFAULT_SIZE_TOLERANCE = 0.10   # logo genişliği istenen değerin ±%10'u içinde
+SIZE_STEPS = 1001               # aralıktaki eşit aralıklı aday genişlik sayısı
+
+
+class FitResult:
+    """Eniyileyicinin önerdiği yerleşim (ölçüler sayfadaki yönde, döndürme uygulandıktan sonra)"""
+
+    def __init__(self, rotation, logo_width_cm, logo_height_cm, per_row, total_logo,
+                 length_cm, logos_per_metre):
+        self.rotation = rotation
+        self.logo_width_cm = logo_width_cm
+        self.logo_height_cm = logo_height_cm
+        self.per_row = per_row
+        self.total_logo = total_logo
+        self.length_cm = length_cm
+        self.logos_per_metre = logos_per_metre
+
+    @property
+    def rows(self):
+        return -(-self.total_logo // self.per_row)
+
+    def __repr__(self):
+        return (f"FitResult({self.rotation}°, {self.logo_width_cm:.2f}x{self.logo_height_cm:.2f} cm, "
+                f"{self.per_row}/satır, {self.total_logo} logo, {self.length_cm:.1f} cm, "
+                f"{self.logos_per_metre:.1f}/m)")
+
+
+def _candidates(width_cm, usable_pt, spacing_pt, size_tolerance, steps):
+    """İzin verilen aralıktaki yerleşim genişlikleri (cm, formdaki 0.01 hassasiyete aşağı yuvarlı)"""
+    import numpy as np
+
+    low = width_cm * (1 - size_tolerance)
+    high = width_cm * (1 + size_tolerance)
+    widths = [np.linspace(low, high, steps)]
+    # Her satır adedinin sığdığı en büyük yerleşim genişliği (aralık içindeyse)
+    max_count = max(1, int((usable_pt + spacing_pt) / (low * CM_TO_PT + spacing_pt)))
+    counts = np.arange(1, max_count + 1)
+    breakpoints = ((usable_pt + spacing_pt) / counts - spacing_pt) / CM_TO_PT
+    widths.append(breakpoints[(breakpoints >= low) & (breakpoints <= high)])
+    # Yukarı yuvarlanan genişlik bir logoyu satırdan taşırabilir; bu yüzden aşağı yuvarlanır
+    widths = np.floor(np.concatenate(widths) * 100 + 1e-6) / 100
+    return np.unique(widths[widths >= np.ceil(low * 100 - 1e-6) / 100])
+
+
+def auto_fit(logo_width_cm, logo_height_cm, page_width_cm, spacing_cm, spacingy_cm,
+             pagexcm, pagexrcm, pageycm, total_logo, objective=OBJECTIVE_LENGTH,
+             size_tolerance=DEFAULT_SIZE_TOLERANCE, rotations=ROTATIONS, steps=SIZE_STEPS,
+             alternatives=1):
+    """En iyi yerleşimi (FitResult) döndür; alternatives > 1 ise en iyi N sonucun listesini
+
+    Logo en/boy oranı korunur. OBJECTIVE_DENSITY'de toplam adet, kullanılan satırları dolduracak
+    şekilde yukarı yuvarlanır. Hiçbir aday sığmıyorsa None (veya boş liste).
+    """
+    import numpy as np
+
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Bilinmeyen amaç: {objective}")
+
+    page_width_pt = page_width_cm * CM_TO_PT
+    spacing_pt = spacing_cm * CM_TO_PT
+    spacingy_pt = spacingy_cm * CM_TO_PT
+    margin_left_pt = pagexcm * CM_TO_PT
+    margin_right_pt = pagexrcm * CM_TO_PT
+    margin_top_pt = pageycm * CM_TO_PT
+    usable_pt = page_width_pt - margin_left_pt - margin_right_pt
+
+    # Adaylar sayfadaki yönde: 90° döndürülünce logonun boyu yerleşim genişliği olur
+    rotation_list, width_list, height_list = [], [], []
+    for rotation in rotations:
+        width_cm, height_cm = ((logo_width_cm, logo_height_cm) if rotation == 0
+                               else (logo_height_cm, logo_width_cm))
+        widths = _candidates(width_cm, usable_pt, spacing_pt, size_tolerance, steps)
+        rotation_list.append(np.full(len(widths), rotation))
+        width_list.append(widths)
+        height_list.append(np.round(widths * height_cm / width_cm, 2))
+    rotation = np.concatenate(rotation_list)
+    width_cm = np.concatenate(width_list)
+    height_cm = np.concatenate(height_list)
+    placed_w = width_cm * CM_TO_PT
+    placed_h = height_cm * CM_TO_PT
+
+    # logos_per_row / auto_page_height ile aynı hesap, tüm adaylar için birden
+    per_row = np.floor((usable_pt + spacing_pt) / (placed_w + spacing_pt)).astype(np.int64)
+    fits = (per_row >= 1) & (height_cm > 0)
+    rotation, width_cm, height_cm = rotation[fits], width_cm[fits], height_cm[fits]
+    placed_w, placed_h, per_row = placed_w[fits], placed_h[fits], per_row[fits]
+    if not len(per_row):
+        return [] if alternatives > 1 else None
+
+    totals = np.full(len(per_row), total_logo, dtype=np.int64)
+    if objective == OBJECTIVE_DENSITY:
+        totals = -(-totals // per_row) * per_row
+    rows = totals // per_row + 1
+    length_pt = margin_top_pt + rows * placed_h + (rows - 1) * spacingy_pt + AUTO_HEIGHT_PADDING_PT
+    per_metre = per_row * 100 / ((placed_h + spacingy_pt) / CM_TO_PT)
+
+    # Amaç, sonra daha büyük logo, sonra döndürmesiz tercih edilir
+    primary = np.round(length_pt if objective == OBJECTIVE_LENGTH else -per_metre, 6)
+    area = width_cm * height_cm
+
+    # Her (döndürme, satır adedi) grubunun en iyisi alternatif olarak kalır
+    order = np.lexsort((-area, primary, per_row, rotation))
+    group = np.stack((rotation[order], per_row[order]), axis=1)
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = np.any(group[1:] != group[:-1], axis=1)
+    best = order[first]
+    ranked = best[np.lexsort((rotation[best], -area[best], primary[best]))]
+
+    results = []
+    for i in ranked[:max(1, alternatives)].tolist():
+        # Seçilen aday asıl hesapla yeniden ölçülür (vektörel hesapla aynı olmalı)
+        count = logos_per_row(page_width_pt, margin_left_pt, margin_right_pt,
+                              float(placed_w[i]), spacing_pt)
+        length = auto_page_height(page_width_pt, float(placed_w[i]), float(placed_h[i]), spacing_pt,
+                                  spacingy_pt, margin_left_pt, margin_right_pt, margin_top_pt,
+                                  int(totals[i]))
+        results.append(FitResult(int(rotation[i]), float(width_cm[i]), float(height_cm[i]), count,
+                                 int(totals[i]), length / CM_TO_PT, float(per_metre[i])))
+    return results if alternatives > 1 else results[0]
@@ -0,0 +1,133 @@
+"""
+Logo sayfasındaki arkaplan dikdörtgenlerini içerik akışından temizleme modülü
+"""
+
+import re
+import fitz
+
+# Sayfanın bu oranından fazlasını kaplayan beyaz dolgu arkaplan sayılır
+DEFAULT_MIN_COVERAGE = 0.9
+
+_TOKEN_RE = re.compile(rb"""
+    (?P<ws>\s+|%[^\r\n]*)
+    |(?P<operand>
+        \((?:\\.|[^\\()])*\)
+        |<<|>>|\[|\]
+        |<[0-9A-Fa-f\s]*>
+        |/[^\s/\[\]()<>{}%]*
+        |[+-]?(?:\d+\.?\d*|\.\d+)
+        |true|false|null
+    )
+    |(?P<op>[A-Za-z'"*]+[0-9]?\*?)
+""", re.X)
+
+_PATH_OPS = {b"m", b"l", b"c", b"v", b"y", b"h", b"re"}
+_FILL_OPS = {b"f", b"F", b"f*"}
+_PAINT_OPS = _FILL_OPS | {b"S", b"s", b"B", b"B*", b"b", b"b*", b"n"}
+
+
+def _is_white(operands):
+    """Dolgu rengi operandları beyazı mı gösteriyor"""
+    try:
+        values = [float(v) for v in operands]
+    except ValueError:
+        return False
+    if len(values) in (1, 3):
+        return all(v == 1 for v in values)
+    if len(values) == 4:
+        return all(v == 0 for v in values)
+    return False
+
+
+def _strip_stream(stream, page_rect, min_coverage):
+    """İçerik akışından beyaz arkaplan dikdörtgenlerini çıkar; çözümlenemezse None döndür"""
+    page_area = abs(page_rect)
+    pos = 0
+    operands = []
+    op_start = None
+    path_spans = []
+    path_rects = []
+    remove_spans = []
+    fill_white = False
+    ctm = fitz.Matrix(1, 0, 0, 1, 0, 0)
+    stack = []
+
+    while pos < len(stream):
+        match = _TOKEN_RE.match(stream, pos)
+        if match is None:
+            # İç içe parantezli dizgi vb. - güvenli tarafta kal
+            return None
+        start, pos = match.span()
+        if match.lastgroup == "ws":
+            continue
+        if op_start is None:
+            op_start = start
+        if match.lastgroup == "operand":
+            operands.append(match.group())
+            continue
+
+        op = match.group()
+        span = (op_start, pos)
+        op_start = None
+        if op == b"BI":
+            # Satır içi görsellerin ikili verisi ayrıştırılamaz
+            return None
+
+        if op == b"q":
+            stack.append((fill_white, ctm))
+        elif op == b"Q" and stack:
+            fill_white, ctm = stack.pop()
+        elif op == b"cm" and len(operands) == 6:
+            ctm = fitz.Matrix(*[float(v) for v in operands]) * ctm
+        elif op in (b"g", b"rg", b"k", b"sc", b"scn"):
+            fill_white = _is_white(operands)
+        elif op in _PATH_OPS:
+            path_spans.append(span)
+            if op == b"re" and len(operands) == 4:
+                x, y, w, h = [float(v) for v in operands]
+                path_rects.append(fitz.Rect(x, y, x + w, y + h) * ctm)
+            elif op != b"h":
+                path_rects.append(None)
+        elif op in _PAINT_OPS:
+            if (op in _FILL_OPS and fill_white and len(path_rects) == 1
+                    and path_rects[0] is not None
+                    and abs(path_rects[0] & page_rect) >= min_coverage * page_area):
+                remove_spans.extend(path_spans)
+                remove_spans.append(span)
+            path_spans = []
+            path_rects = []
+
+        operands = []
+
+    if not remove_spans:
+        return stream
+
+    parts = []
+    last = 0
+    for start, end in remove_spans:
+        parts.append(stream[last:start])
+        last = end
+    parts.append(stream[last:])
+    return b"".join(parts)
+
+
+def remove_background(doc, pno=0, min_coverage=DEFAULT_MIN_COVERAGE):
+    """Sayfayı kaplayan beyaz dolgulu dikdörtgenleri sil; bir şey silindiyse True döndür"""
+    page = doc[pno]
+    page.clean_contents()
+    xrefs = page.get_contents()
+    if not xrefs:
+        return False
+
+    # Birden çok içerik akışı tek akış gibi ardışık yorumlanır
+    stream = page.read_contents()
+    # İçerik akışı PDF koordinatlarındadır, sayfa kutusu da öyle alınmalı
+    page_rect = page.rect * ~page.transformation_matrix
+    stripped = _strip_stream(stream, page_rect, min_coverage)
+    if stripped is None or stripped == stream:
+        return False
+
+    doc.update_stream(xrefs[0], stripped)
+    if len(xrefs) > 1:
+        page.set_contents(xrefs[0])
+    return True
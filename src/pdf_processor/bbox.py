@@ -0,0 +1,154 @@
+"""
+Logo sınır kutusu (bounding box) hesaplama stratejileri modülü
+
+- drawings: page.get_drawings() ile tüm vektör yolları (mevcut yöntem, metin ve görselleri görmez)
+- bboxlog:  page.get_bboxlog() ile MuPDF'in çizim kaydı (yol, metin, görsel; Python döngüsü yok)
+- raster:   düşük DPI alfa kanallı render ve NumPy ile boş olmayan piksellerin sınırı
+"""
+
+from collections import OrderedDict
+
+from src.pdf_processor.logo_cache import source_digest, open_pdf
+from src.pdf_processor.parallel import available_cores, split_range, in_worker_process
+
+# Strateji adları
+BBOX_DRAWINGS = "drawings"
+BBOX_BBOXLOG = "bboxlog"
+BBOX_RASTER = "raster"
+
+RASTER_BBOX_DPI = 36            # raster stratejisinin çözünürlüğü (1 piksel ~0.7 mm)
+PARALLEL_MIN_PAGES = 4          # bu sayıdan az sayfalı dosyalar tek süreçte taranır
+BBOX_MEMO_SIZE = 512            # (dosya özeti, strateji) -> sonuç hafızası
+
+_bbox_memo = OrderedDict()
+_pool = None                    # çok sayfalı taramaların ortak süreç havuzu (bkz. _scan_pool)
+
+
+def drawings_bbox(page):
+    """Sayfadaki vektör çizimlerinin birleşik sınırı; yoksa None"""
+    x_min, y_min = float('inf'), float('inf')
+    x_max, y_max = float('-inf'), float('-inf')
+    for item in page.get_drawings():
+        if isinstance(item, dict) and "rect" in item:
+            bbox = item["rect"]
+            if not bbox.is_empty:
+                x_min = min(x_min, bbox.x0)
+                y_min = min(y_min, bbox.y0)
+                x_max = max(x_max, bbox.x1)
+                y_max = max(y_max, bbox.y1)
+    if x_min > x_max:
+        return None
+    return (x_min, y_min, x_max, y_max)
+
+
+def bboxlog_bbox(page):
+    """MuPDF'in görünür içerik kaydından (yol, metin, görsel) birleşik sınır; yoksa None"""
+    import fitz
+
+    result = fitz.Rect()
+    for kind, rect in page.get_bboxlog():
+        # "ignore-text" görünmez metindir, kırpma kayıtları da içerik değildir
+        if kind.startswith(("fill-", "stroke-")):
+            result |= rect
+    if result.is_empty:
+        return None
+    return tuple(result & page.rect)
+
+
+def raster_bbox(page, dpi=RASTER_BBOX_DPI):
+    """Düşük çözünürlüklü alfa render'da boş olmayan piksellerin sınırı (piksel kadar geniş); yoksa None"""
+    import numpy as np
+
+    pix = page.get_pixmap(dpi=dpi, alpha=True, annots=False)
+    alpha = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
+        pix.height, pix.stride)[:, pix.n - 1:pix.width * pix.n:pix.n]
+    rows = np.flatnonzero(alpha.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(alpha.any(axis=0))
+
+    scale_x = page.rect.width / pix.width
+    scale_y = page.rect.height / pix.height
+    return (
+        page.rect.x0 + cols[0] * scale_x,
+        page.rect.y0 + rows[0] * scale_y,
+        page.rect.x0 + (cols[-1] + 1) * scale_x,
+        page.rect.y0 + (rows[-1] + 1) * scale_y,
+    )
+
+
+BBOX_STRATEGIES = {
+    BBOX_DRAWINGS: drawings_bbox,
+    BBOX_BBOXLOG: bboxlog_bbox,
+    BBOX_RASTER: raster_bbox,
+}
+
+
+def union_bbox(boxes):
+    """None olmayan kutuların birleşimi; hiç yoksa None"""
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def _scan_pages(pdf_source, strategy, page_numbers):
+    """Verilen sayfaların sınırlarının birleşimi (süreç havuzunda da çalışır)"""
+    function = BBOX_STRATEGIES[strategy]
+    with open_pdf(pdf_source) as doc:
+        return union_bbox([function(doc[pno]) for pno in page_numbers])
+
+
+def _scan_pool():
+    """Süreç boyunca paylaşılan tarama havuzu
+
+    Qt'nin iş parçacıkları varken fork güvenli değil; işçiler spawn ile ayrı yorumlayıcıda başlar
+    (bkz. preview_worker). Havuz ilk çok sayfalı taramada kurulur ve sonrakilerde yeniden kullanılır.
+    """
+    global _pool
+    if _pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        _pool = ProcessPoolExecutor(max_workers=available_cores(),
+                                    mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def document_bbox(pdf_path, strategy=BBOX_DRAWINGS, workers=None):
+    """Tüm sayfalardaki içeriğin birleşik sınırı (x0, y0, x1, y1); içerik yoksa None
+
+    pdf_path dosya yolu veya PDF baytları olabilir. Sonuç içeriğin özetine göre hafızada tutulur.
+    Çok sayfalı dosyalar ortak süreç havuzunda taranır; havuz işçilerinde (workers verilmezse)
+    ve workers=1 ile tek süreçte.
+    """
+    if strategy not in BBOX_STRATEGIES:
+        raise ValueError(f"Bilinmeyen sınır kutusu stratejisi: {strategy}")
+
+    memo_key = (source_digest(pdf_path), strategy)
+    if memo_key in _bbox_memo:
+        _bbox_memo.move_to_end(memo_key)
+        return _bbox_memo[memo_key]
+
+    with open_pdf(pdf_path) as doc:
+        page_count = doc.page_count
+
+    if workers is None:
+        workers = 1 if in_worker_process() else available_cores()
+    workers = min(workers, page_count)
+    if page_count < PARALLEL_MIN_PAGES or workers < 2:
+        bbox = _scan_pages(pdf_path, strategy, range(page_count))
+    else:
+        chunks = split_range(page_count, workers)
+        parts = _scan_pool().map(_scan_pages, [pdf_path] * len(chunks), [strategy] * len(chunks), chunks)
+        bbox = union_bbox(list(parts))
+
+    _bbox_memo[memo_key] = bbox
+    if len(_bbox_memo) > BBOX_MEMO_SIZE:
+        _bbox_memo.popitem(last=False)
+    return bbox
@@ -0,0 +1,465 @@
+"""
+Arayüzsüz (headless) komut satırı ve toplu iş giriş noktası
+
+Örnekler:
+    python -m src.pdf_processor logo.pdf -o sayfa.pdf --logo-width 5 --count 40
+    python -m src.pdf_processor --jobs isler.json --workers 8
+    python -m src.pdf_processor --gang kalemler.json -o rulo.pdf
+    python -m src.pdf_processor --manifest siparisler.csv --settings kayitliayar.txt --workers 8
+    python -m src.pdf_processor --serve 127.0.0.1:8765 --workers 4
+    python -m src.pdf_processor --raster rulo.pdf -o rulo.tif --dpi 600 --colorspace cmyk
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.pdf_processor.job_context import JobContext
+from src.pdf_processor.logo_cache import DEFAULT_CACHE_DIR
+from src.pdf_processor.parallel import available_cores
+from src.pdf_processor.metrics import configure_from_env, METRICS_ENV
+
+# İş tanımındaki alanlar ve varsayılanları (PDFEditorApp formu ile aynı)
+JOB_DEFAULTS = {
+    "logo_width_cm": None,
+    "logo_height_cm": None,
+    "spacing_cm": 1,
+    "spacingy_cm": 1,
+    "page_width_cm": 58,
+    "page_height_cm": None,
+    "pagexcm": 0.1,
+    "pagexrcm": 0.1,
+    "pageycm": 0.1,
+    "total_logo": 10,
+    "bg_color": None,
+    "engine": "svg",
+    "remove_bg": True,
+    "bbox_strategy": "drawings",
+    "paginate": False,
+    "save_profile": "compact",
+    "rotation": 0,
+    "mirror_x": False,
+    "mirror_y": False,
+    "svg_backend": "auto",
+    "max_length_cm": None,
+    "segment_files": False,
+}
+
+# page_height_cm yerine verilebilen "otomatik sayfa boyu" değerleri (liste hücreleri, JSON)
+AUTO_VALUES = ("auto", "otomatik")
+
+# Her süreçte bir kez oluşturulan işlemci (önbellekler süreç boyunca sıcak kalır)
+_processor = None
+
+
+def _get_processor(cache_dir=DEFAULT_CACHE_DIR):
+    global _processor
+    if _processor is None:
+        from src.pdf_processor.pdf_processor import PDFProcessor
+        # İşlemci havuz işçisinde de kullanılır: sınır taraması iç içe havuz kurmaz
+        _processor = PDFProcessor(cache_dir=cache_dir, bbox_workers=1)
+    return _processor
+
+
+def _init_worker(cache_dir):
+    """Havuz sürecini başlat (her iş kendi JobContext dizininde çalışır, bkz. run_job)"""
+    configure_from_env()
+    _get_processor(cache_dir)
+
+
+def resolve_job(job, base_dir=None):
+    """İş tanımını varsayılanlarla birleştir ve dosya yollarını mutlaklaştır
+
+    "items" içeren iş karışık logolu ruludur (gang sheet); o zaman "logo" gerekmez.
+    """
+    resolved = dict(JOB_DEFAULTS)
+    resolved.update(job)
+    gang = resolved.get("items") is not None
+    if "output" not in resolved or not (gang or "logo" in resolved):
+        raise ValueError(f"İş tanımında 'logo' (veya 'items') ve 'output' zorunludur: {job}")
+
+    if isinstance(resolved["page_height_cm"], str) and resolved["page_height_cm"].lower() in AUTO_VALUES:
+        resolved["page_height_cm"] = None
+
+    base_dir = base_dir or os.getcwd()
+    for key in ("output",) if gang else ("logo", "output"):
+        resolved[key] = os.path.abspath(os.path.join(base_dir, resolved[key]))
+    if gang:
+        resolved["items"] = [dict(item, logo=os.path.abspath(os.path.join(base_dir, item["logo"])))
+                             for item in resolved["items"]]
+    return resolved
+
+
+def load_gang_items(items_path):
+    """Rulo kalemlerini oku: [ {"logo", "logo_width_cm", "logo_height_cm", "quantity"}, ... ] veya {"items": [...]}
+
+    Logo yolları dosyanın dizinine göre çözülür.
+    """
+    with open(items_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("items", [])
+
+    base_dir = os.path.dirname(os.path.abspath(items_path))
+    return [dict(item, logo=os.path.abspath(os.path.join(base_dir, item["logo"]))) for item in data]
+
+
+def run_gang_job(job):
+    """Karışık logolu ruloyu üret; sonucu run_sheet_job ile aynı biçimde döndür"""
+    from src.pdf_processor.gang import GangItem
+
+    processor = _get_processor()
+    processor.bbox_strategy = job["bbox_strategy"]
+    start = time.perf_counter()
+
+    output_dir = os.path.dirname(job["output"])
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+    page_height_pt = processor.gang_sheet(
+        [GangItem(**item) for item in job["items"]],
+        job["output"],
+        page_width_cm=float(job["page_width_cm"]),
+        spacing_cm=float(job["spacing_cm"]),
+        spacingy_cm=float(job["spacingy_cm"]),
+        pagexcm=float(job["pagexcm"]),
+        pagexrcm=float(job["pagexrcm"]),
+        pageycm=float(job["pageycm"]),
+        arkaplan=job["bg_color"] is not None,
+        bg_color=job["bg_color"] or "#ffffff",
+        remove_bg=bool(job["remove_bg"]),
+        save_profile=job["save_profile"],
+        svg_backend=job["svg_backend"],
+    )
+
+    return {
+        "output": job["output"],
+        "page_height_cm": page_height_pt * 2.54 / 72,
+        "pages": processor.last_layout.page_count,
+        "bytes": processor.last_save[0],
+        "seconds": time.perf_counter() - start,
+        "stages": processor.last_metrics.totals(),
+    }
+
+
+def run_job(job):
+    """İşi kendi geçici dizininde üret (iş bitince silinir); sonucu sözlük olarak döndür"""
+    processor = _get_processor()
+    with JobContext() as context:
+        processor.context = context
+        if job.get("items") is not None:
+            return run_gang_job(job)
+        return run_sheet_job(job)
+
+
+def run_sheet_job(job, allow_overflow=False):
+    """Tek bir sayfa üret; sonucu sözlük olarak döndür
+
+    Sabit sayfa boyuna sığmayan logo kalacaksa (paginate yoksa) iş sayfa üretilmeden başarısız
+    sayılır; allow_overflow yalnızca önizlemeler içindir (sonuçta "overflow" raporlanır).
+    """
+    if job["page_height_cm"] is not None and (job["max_length_cm"] or job["segment_files"]):
+        raise ValueError("max_length_cm / segment_files yalnızca otomatik sayfa boyunda geçerlidir "
+                         f"(page_height_cm={job['page_height_cm']:g}; otomatik için boş veya 'auto')")
+
+    processor = _get_processor()
+    processor.bbox_strategy = job["bbox_strategy"]
+    start = time.perf_counter()
+
+    # SVG logolar bir kez PDF'e çevrilir (önbellekte)
+    logo = processor.logo_source(job["logo"], job["svg_backend"])
+    logo_width_cm = job["logo_width_cm"]
+    logo_height_cm = job["logo_height_cm"]
+    if logo_width_cm is None or logo_height_cm is None:
+        # Eksik boyutu logonun kendi en/boy oranından tamamla
+        bbox_width, bbox_height = processor.get_logo_bbox(logo)
+        if logo_width_cm is None and logo_height_cm is None:
+            logo_width_cm, logo_height_cm = bbox_width, bbox_height
+        elif logo_width_cm is None:
+            logo_width_cm = logo_height_cm * bbox_width / bbox_height
+        else:
+            logo_height_cm = logo_width_cm * bbox_height / bbox_width
+
+    common = dict(
+        pdf_path=logo,
+        output_path=job["output"],
+        logo_width_cm=float(logo_width_cm),
+        logo_height_cm=float(logo_height_cm),
+        spacing_cm=float(job["spacing_cm"]),
+        spacingy_cm=float(job["spacingy_cm"]),
+        page_width_cm=float(job["page_width_cm"]),
+        pagexcm=float(job["pagexcm"]),
+        pagexrcm=float(job["pagexrcm"]),
+        pageycm=float(job["pageycm"]),
+        total_logo=int(job["total_logo"]),
+        engine=job["engine"],
+        remove_bg=bool(job["remove_bg"]),
+        save_profile=job["save_profile"],
+        rotation=float(job["rotation"]),
+        mirror_x=bool(job["mirror_x"]),
+        mirror_y=bool(job["mirror_y"]),
+    )
+
+    if job["page_height_cm"] is not None and not job["paginate"] and not allow_overflow:
+        # Yerleşim önceden hesaplanır: eksik dolu sayfa çıktı yoluna hiç yazılmaz
+        plan = {key: value for key, value in common.items()
+                if key not in ("output_path", "remove_bg", "save_profile")}
+        overflow = processor.plan_layout(page_height_cm=float(job["page_height_cm"]), **plan).overflow
+        if overflow:
+            raise ValueError(f"{job['total_logo']} logonun {overflow} tanesi sayfaya sığmadı "
+                             "(paginate, daha uzun sayfa veya otomatik sayfa boyu kullanın)")
+
+    output_dir = os.path.dirname(job["output"])
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+    outputs = [job["output"]]
+    if job["page_height_cm"] is None:
+        # Sayfa boyu otomatik (GUI'deki "Otomatik Hesaplayarak Oluştur"); uzun rulolar bölünebilir
+        page_height_pt = processor.calculate_transparent_logos(
+            max_length_cm=job["max_length_cm"] and float(job["max_length_cm"]),
+            segment_files=bool(job["segment_files"]),
+            **common
+        )
+        outputs = processor.last_outputs
+    else:
+        page_height_pt = processor.add_transparent_logos(
+            page_height_cm=float(job["page_height_cm"]),
+            arkaplan=job["bg_color"] is not None,
+            bg_color=job["bg_color"] or "#ffffff",
+            paginate=bool(job["paginate"]),
+            **common
+        )
+
+    return {
+        "output": job["output"],
+        "outputs": outputs,
+        "overflow": processor.last_layout.overflow,
+        "page_height_cm": page_height_pt * 2.54 / 72,
+        "pages": processor.last_layout.page_count,
+        "bytes": sum(os.path.getsize(path) for path in outputs),
+        "seconds": time.perf_counter() - start,
+        "stages": processor.last_metrics.totals(),
+    }
+
+
+def _run_job_safe(job):
+    """Havuzda çalışan sarmalayıcı: hatayı sonuç olarak döndür, süreci düşürme"""
+    try:
+        return run_job(job)
+    except Exception as e:
+        return {"output": job.get("output"), "error": f"{e}", "traceback": traceback.format_exc()}
+
+
+def run_jobs(jobs, workers=None, cache_dir=DEFAULT_CACHE_DIR, task=_run_job_safe):
+    """Bağımsız işleri süreç havuzunda çalıştır; sonuçları tamamlanma sırasıyla üret
+
+    task her işi havuz sürecinde çalıştıran, hatayı sonuç olarak döndüren işlevdir.
+    """
+    workers = workers or available_cores()
+    workers = max(1, min(workers, len(jobs)))
+    cache_dir = os.path.abspath(cache_dir)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_dir,)) as pool:
+        futures = [pool.submit(task, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def load_jobs(jobs_path, defaults=None):
+    """JSON iş listesini oku: [ {...}, ... ] veya {"defaults": {...}, "jobs": [...]}
+
+    defaults listedeki varsayılanlardan da önce gelen alanlardır (ör. arayüz sayfa ayarları).
+    """
+    with open(jobs_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    defaults = dict(defaults or {})
+    if isinstance(data, dict):
+        defaults.update(data.get("defaults", {}))
+        data = data.get("jobs", [])
+
+    base_dir = os.path.dirname(os.path.abspath(jobs_path))
+    return [resolve_job(merge_defaults(defaults, job), base_dir) for job in data]
+
+
+def merge_defaults(defaults, job):
+    """Varsayılanları işle birleştir; en büyük boy / segment isteyen iş varsayılan sayfa boyunu almaz
+
+    max_length_cm ve segment_files otomatik sayfa boyu ister; sayfa boyu işin kendisinde
+    verilmişse birleştirilir ve run_sheet_job bu çelişkiyi reddeder.
+    """
+    merged = {**defaults, **job}
+    if "page_height_cm" not in job and (merged.get("max_length_cm") or merged.get("segment_files")):
+        merged.pop("page_height_cm", None)
+    return merged
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pdf_processor",
+        description="Qt başlatmadan logo sayfası üret (tek iş veya JSON iş listesi)",
+    )
+    parser.add_argument("logo", nargs="?", help="Logo PDF veya SVG dosyası")
+    parser.add_argument("-o", "--output", help="Çıktı PDF yolu")
+    parser.add_argument("--jobs", help="JSON iş listesi (yollar dosyanın dizinine göre çözülür)")
+    parser.add_argument("--gang", help="Karışık logolu rulo: JSON kalem listesi (logo, boyut, adet)")
+    parser.add_argument("--manifest", help="CSV veya JSON sipariş listesi; günlükle kaldığı yerden devam eder")
+    parser.add_argument("--journal", help="--manifest günlüğü (varsayılan: <liste>.journal.jsonl)")
+    parser.add_argument("--settings", help="--manifest satırlarında olmayan sayfa ayarları (kayitliayar.txt)")
+    parser.add_argument("--force", action="store_true", help="--manifest: tamamlanmış satırları da yeniden üret")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Süreç sayısı (varsayılan: kullanılabilir çekirdek sayısı)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Logo önbellek dizini")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Arayüzsüz içe aktarma süresini ölç ve raporla")
+    parser.add_argument("--metrics", help="Aşama sürelerini bu dosyaya JSON satırları olarak ekle")
+    parser.add_argument("--serve", nargs="?", const="127.0.0.1:8765", metavar="ADRES",
+                        help="Yerel üretim servisini başlat (HOST:PORT veya unix:YOL, bkz. render_service)")
+
+    raster = parser.add_argument_group("raster (RIP)")
+    raster.add_argument("--raster", metavar="PDF",
+                        help="PDF sayfasını bantlar hâlinde -o ile verilen PNG/TIFF dosyasına dönüştür")
+    raster.add_argument("--dpi", type=float, default=300, help="Raster çözünürlüğü")
+    raster.add_argument("--colorspace", choices=("rgb", "cmyk"), default="rgb",
+                        help="Raster renk uzayı (cmyk yalnızca TIFF)")
+    raster.add_argument("--alpha", action="store_true", help="Şeffaf alanları alfa kanalıyla koru")
+    raster.add_argument("--raster-page", type=int, default=1, help="Dönüştürülecek sayfa (1'den başlar)")
+    raster.add_argument("--no-compress", dest="compress", action="store_false",
+                        help="TIFF şeritlerini sıkıştırmadan yaz (RIP deflate okuyamıyorsa)")
+
+    layout = parser.add_argument_group("yerleşim")
+    layout.add_argument("--logo-width", type=float, dest="logo_width_cm", help="Logo genişliği (cm)")
+    layout.add_argument("--logo-height", type=float, dest="logo_height_cm", help="Logo yüksekliği (cm)")
+    layout.add_argument("--spacing", type=float, dest="spacing_cm", default=JOB_DEFAULTS["spacing_cm"],
+                        help="Logolar arası yatay boşluk (cm)")
+    layout.add_argument("--spacing-y", type=float, dest="spacingy_cm", default=JOB_DEFAULTS["spacingy_cm"],
+                        help="Logolar arası dikey boşluk (cm)")
+    layout.add_argument("--page-width", type=float, dest="page_width_cm",
+                        default=JOB_DEFAULTS["page_width_cm"], help="Sayfa genişliği (cm)")
+    layout.add_argument("--page-height", type=float, dest="page_height_cm",
+                        help="Sayfa yüksekliği (cm); verilmezse otomatik hesaplanır")
+    layout.add_argument("--margin-left", type=float, dest="pagexcm", default=JOB_DEFAULTS["pagexcm"],
+                        help="Soldan yatay boşluk (cm)")
+    layout.add_argument("--margin-right", type=float, dest="pagexrcm", default=JOB_DEFAULTS["pagexrcm"],
+                        help="Sağdan yatay boşluk (cm)")
+    layout.add_argument("--margin-top", type=float, dest="pageycm", default=JOB_DEFAULTS["pageycm"],
+                        help="Üstten dikey boşluk (cm)")
+    layout.add_argument("--count", type=int, dest="total_logo", default=JOB_DEFAULTS["total_logo"],
+                        help="Toplam logo sayısı")
+    layout.add_argument("--bg-color", dest="bg_color", help="Arka plan rengi (ör. #ffffff)")
+    layout.add_argument("--engine", choices=("svg", "native"), default=JOB_DEFAULTS["engine"],
+                        help="Yerleştirme motoru")
+    layout.add_argument("--bbox-strategy", dest="bbox_strategy",
+                        choices=("drawings", "bboxlog", "raster"),
+                        default=JOB_DEFAULTS["bbox_strategy"], help="Logo sınır kutusu hesaplama yöntemi")
+    layout.add_argument("--keep-bg", dest="remove_bg", action="store_false",
+                        help="native motorda logo arkaplanını silme")
+    layout.add_argument("--save-profile", dest="save_profile", choices=("fast", "compact"),
+                        default=JOB_DEFAULTS["save_profile"],
+                        help="Kaydetme profili: fast (önizleme) veya compact (baskı, küçük dosya)")
+    layout.add_argument("--paginate", action="store_true",
+                        help="sığmayan logoları yeni sayfalara yerleştir (--page-height ile)")
+    layout.add_argument("--rotation", type=float, default=JOB_DEFAULTS["rotation"],
+                        help="Logoyu saat yönünde döndür (derece, herhangi bir açı)")
+    layout.add_argument("--mirror-x", dest="mirror_x", action="store_true",
+                        help="Logoyu yatay aynala (DTF transferleri için)")
+    layout.add_argument("--mirror-y", dest="mirror_y", action="store_true",
+                        help="Logoyu dikey aynala")
+    layout.add_argument("--svg-backend", dest="svg_backend", choices=("auto", "svglib", "mupdf"),
+                        default=JOB_DEFAULTS["svg_backend"],
+                        help="SVG logoları okuyan kütüphane (auto: büyük dosyalarda mupdf)")
+    layout.add_argument("--max-length", type=float, dest="max_length_cm",
+                        help="Otomatik sayfa boyunda en büyük sayfa boyu (cm); daha uzun rulo tam "
+                             "satırlardan ardışık sayfalara bölünür (PDF sınırı yaklaşık 508 cm)")
+    layout.add_argument("--split-files", dest="segment_files", action="store_true",
+                        help="--max-length segmentlerini ayrı dosyalara yaz (rulo-01.pdf, rulo-02.pdf, ...)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.startup_report:
+        from src.pdf_processor.startup import headless_import_report
+        print(headless_import_report())
+        if not (args.jobs or args.logo):
+            return 0
+
+    if args.metrics:
+        # Havuz süreçleri ortam değişkeninden aynı dosyaya yazar
+        os.environ[METRICS_ENV] = os.path.abspath(args.metrics)
+        configure_from_env()
+
+    if args.manifest:
+        from src.pdf_processor.manifest import run_manifest
+        start = time.perf_counter()
+        done, skipped, failed = run_manifest(args.manifest, args.journal, args.settings,
+                                             workers=args.workers, cache_dir=args.cache_dir,
+                                             force=args.force)
+        print(f"{done} üretildi, {skipped} atlandı, {failed} başarısız, "
+              f"{time.perf_counter() - start:.2f} sn")
+        return 1 if failed else 0
+
+    if args.serve:
+        from src.pdf_processor.render_service import serve
+        return serve(args.serve, workers=args.workers, cache_dir=args.cache_dir)
+
+    if args.raster:
+        if not args.output:
+            parser.error("--raster için -o/--output (PNG veya TIFF) verilmelidir")
+        from src.pdf_processor.raster_export import export_raster
+        try:
+            export_raster(args.raster, args.output, dpi=args.dpi, colorspace=args.colorspace,
+                          alpha=args.alpha, page=args.raster_page - 1, workers=args.workers,
+                          compress=args.compress)
+        except (OSError, ValueError) as e:
+            print(f"❌ {args.output}: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    if args.jobs:
+        jobs = load_jobs(args.jobs)
+    elif args.gang and args.output:
+        job = {key: getattr(args, key) for key in JOB_DEFAULTS}
+        job.update(items=load_gang_items(args.gang), output=args.output)
+        jobs = [resolve_job(job)]
+    elif args.logo and args.output:
+        job = {key: getattr(args, key) for key in JOB_DEFAULTS}
+        job.update(logo=args.logo, output=args.output)
+        jobs = [resolve_job(job)]
+    else:
+        parser.error("bir logo (veya --gang) ve -o/--output ya da --jobs verilmelidir")
+
+    if not jobs:
+        print("İş listesi boş.")
+        return 0
+
+    failed = 0
+    start = time.perf_counter()
+    if len(jobs) == 1:
+        # Tek iş için havuz kurmaya gerek yok
+        _get_processor(args.cache_dir)
+        results = [_run_job_safe(jobs[0])]
+    else:
+        results = run_jobs(jobs, workers=args.workers, cache_dir=args.cache_dir)
+
+    for result in results:
+        if "error" in result:
+            failed += 1
+            print(f"❌ {result['output']}: {result['error']}", file=sys.stderr)
+        else:
+            files = len(result.get("outputs", ()))
+            print(f"✅ {result['output']} ({result['pages']} sayfa"
+                  + (f", {files} dosya" if files > 1 else "")
+                  + f", {result['page_height_cm']:.2f} cm, "
+                  f"{result['bytes'] / 1024:.1f} KB, {result['seconds']:.2f} sn)")
+
+    print(f"{len(jobs) - failed}/{len(jobs)} iş tamamlandı, {time.perf_counter() - start:.2f} sn")
+    return 1 if failed else 0
@@ -0,0 +1,271 @@
+"""
+Tek logo rasterını ızgaradaki her hücreye kopyalayarak anında önizleme
+
+Tüm hücrelerde aynı logo olduğu için sayfa PDF olarak kurulup rasterlaştırılmaz: logo, gerçek
+çıktıdaki yerleştirmeyle aynı biçimde tek hücrelik bir sayfaya konur (LogoCell), her ölçek için bir
+kez alfa kanalıyla rasterlaştırılır ve NumPy ile arka plan rengi üzerine her yerleşim konumuna
+kopyalanır (CompositeSheet). Küçük ölçeklerde hücre birkaç piksel altı kaydırmayla ayrı ayrı
+rasterlaştırılır; gerçek çıktının get_pixmap görüntüsünden farkı yalnızca kalan yuvarlama
+kaymalarıdır (bkz. compare_with_pdf, COMPOSITE_TOLERANCE, COMPOSITE_CELL_TOLERANCE).
+
+Aralık, kenar boşluğu veya adet değiştiğinde hücre aynı kalır; LogoCell yeniden kullanılırsa yeni
+yerleşimin gösterilmesi yalnızca kopyalama kadar sürer. Hücre rasterlarının toplam boyutu bellek
+bütçesinin hücre payıyla sınırlıdır (bkz. memory). NumPy ve fitz ilk kullanımda yüklenir.
+"""
+
+import math
+from collections import OrderedDict
+
+from src.pdf_processor.logo_cache import open_pdf
+from src.pdf_processor.tiles import TilePyramid
+from src.pdf_processor.memory import cache_budget, BUDGET_CELLS
+
+COMPOSITE_TOLERANCE = 3.0           # zoom 1.0'da gerçek çıktıya göre ortalama kanal farkı (0-255) sınırı
+COMPOSITE_CHANGED = 64              # bir kanalı bundan fazla farklı piksel "değişmiş" sayılır
+COMPOSITE_CELL_TOLERANCE = 0.01     # hücre başına değişmiş piksel oranı sınırı (kayık/eksik hücre)
+CELL_MAX_PIXELS = 4 * 1024 * 1024   # bundan büyük hücre rasterı tutulmaz, hücre parça parça işlenir
+CELL_CACHE_SIZE = 4                 # bellekte tutulan ölçek sayısı
+SUBPIXEL_PHASES = 4                 # küçük hücrelerde konum 1/4 piksele kadar korunur
+SUBPIXEL_MAX_PIXELS = 256 * 256     # bundan büyük hücrelerde konum piksele yuvarlanır
+
+
+def _blend(dst, src):
+    """Önceden çarpılmış RGBA kaynağı RGB hedefin üzerine yerinde harmanla"""
+    import numpy as np
+
+    alpha = src[..., 3:4].astype(np.uint16)
+    dst[...] = src[..., :3] + (dst.astype(np.uint16) * (255 - alpha) + 127) // 255
+
+
+def _samples(pix):
+    """fitz.Pixmap -> (yükseklik, genişlik, n) uint8 dizisi"""
+    import numpy as np
+
+    data = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)
+    return data[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+
+
+class LogoCell:
+    """Tek hücrelik logo ve ölçek başına raster önbelleği
+
+    logo_source: hazırlanmış logo PDF'i (dosya yolu veya bayt), size: logonun (genişlik, yükseklik) pt,
+    clip: gerçek çıktıdaki kırpma alanı (PDFProcessor.last_logo ile aynı biçim), transform: yerleşimin
+    dönüşümü (LogoTransform veya None); hücre döndürülmüş logonun sınır kutusudur.
+    """
+
+    def __init__(self, logo_source, size, clip=None, transform=None):
+        import fitz
+        from src.pdf_processor.placement import LogoStamper
+        from src.pdf_processor.transform import centered_rect
+
+        self.size = tuple(size) if transform is None else transform.rotated_size(*size)
+        self._rasters = OrderedDict()   # (ölçek, kaydırma) -> önceden çarpılmış RGBA raster
+        self._flats = OrderedDict()     # (ölçek, kaydırma, renk) -> arka plan üzerinde RGB
+        self.max_bytes = cache_budget(BUDGET_CELLS)     # iki önbelleğin toplamı
+        self.bytes = 0
+
+        # Logo, PDFProcessor.stamp_layout ile aynı biçimde yerleştirilir
+        self._doc = fitz.open()
+        self._page = self._doc.new_page(width=self.size[0], height=self.size[1])
+        with open_pdf(logo_source) as logo_doc:
+            clip = None if clip is None else fitz.Rect(clip)
+            stamper = LogoStamper(self._doc, logo_doc, clip=clip, keep_proportion=clip is None)
+            stamper.stamp(self._page, [centered_rect(self._page.rect, *size)], transform)
+        self._list = self._page.get_displaylist()
+
+    def close(self):
+        self._rasters.clear()
+        self._flats.clear()
+        self.bytes = 0
+        self._list = None
+        self._doc.close()
+
+    def _remember(self, cache, key, array):
+        """Rasterı önbelleğe al; sayı sınırı bu önbellekte, bayt sınırı iki önbelleğin toplamında uygulanır"""
+        cache[key] = array
+        self.bytes += array.nbytes
+        if len(cache) > CELL_CACHE_SIZE * SUBPIXEL_PHASES ** 2:
+            self.bytes -= cache.popitem(last=False)[1].nbytes
+        # En eski kayıtlar atılır, önce arka planlı kopyalar; yeni kayıt her zaman kalır
+        for victim in (self._flats, self._rasters):
+            while self.bytes > self.max_bytes and len(victim) > (1 if victim is cache else 0):
+                self.bytes -= victim.popitem(last=False)[1].nbytes
+
+    def box(self, scale):
+        """Hücrenin scale ölçeğindeki piksel alanı (IRect)"""
+        import fitz
+
+        return (self._page.rect * fitz.Matrix(scale, scale)).irect
+
+    def phases(self, scale):
+        """Bu ölçekte piksel altı konum adımı sayısı (büyük hücrelerde 1: konum piksele yuvarlanır)"""
+        box = self.box(scale)
+        return SUBPIXEL_PHASES if box.width * box.height <= SUBPIXEL_MAX_PIXELS else 1
+
+    def raster(self, scale, phase=(0, 0)):
+        """phase=(px, py) piksel altı kaydırmayla RGBA raster; CELL_MAX_PIXELS'ten büyükse None"""
+        import fitz
+
+        key = (scale, phase)
+        raster = self._rasters.get(key)
+        if raster is not None:
+            self._rasters.move_to_end(key)
+            return raster
+        box = self.box(scale)
+        if box.width * box.height > CELL_MAX_PIXELS:
+            return None
+        steps = self.phases(scale)
+        matrix = fitz.Matrix(scale, 0, 0, scale, phase[0] / steps, phase[1] / steps)
+        raster = _samples(self._list.get_pixmap(matrix=matrix, alpha=True)).copy()
+        self._remember(self._rasters, key, raster)
+        return raster
+
+    def flat(self, scale, phase, color):
+        """Arka plan rengi (0-255 RGB) üzerine önceden harmanlanmış RGB raster"""
+        import numpy as np
+
+        key = (scale, phase, color)
+        flat = self._flats.get(key)
+        if flat is not None:
+            self._flats.move_to_end(key)
+            return flat
+        raster = self.raster(scale, phase)
+        flat = np.empty(raster.shape[:2] + (3,), dtype=np.uint8)
+        flat[...] = color
+        _blend(flat, raster)
+        self._remember(self._flats, key, flat)
+        return flat
+
+    def part(self, scale, x0, y0, x1, y1):
+        """Yalnızca (x0, y0, x1, y1) piksel alanının RGBA rasterı (tutulamayacak kadar büyük hücreler)"""
+        import fitz
+
+        clip = fitz.Rect(x0, y0, x1, y1) / scale
+        return _samples(self._list.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=True, clip=clip))
+
+
+class CompositeSheet:
+    """Bir yerleşimin PDF'siz görüntü kaynağı: hücre (LogoCell), arka plan rengi ve dikdörtgenler
+
+    Hücrenin sahibi değildir; aynı hücre art arda gelen yerleşimlerde kullanılabilir.
+    """
+
+    def __init__(self, layout, cell, background_color=None):
+        import fitz
+        import numpy as np
+
+        self.layout = layout
+        self.cell = cell
+        self.background_color = background_color
+        self.page_rects = [fitz.Rect(0, 0, layout.page_width_pt, layout.page_height(pno))
+                           for pno in range(layout.page_count)]
+        self._rects = [np.array(rects, dtype=np.float64).reshape(-1, 4)
+                       for _, rects in layout.pages()]
+
+    @property
+    def page_count(self):
+        return len(self.page_rects)
+
+    def render_array(self, pno, scale, box):
+        """Sayfanın box (piksel IRect) alanını (yükseklik, genişlik, 3) uint8 dizisi olarak üret"""
+        import numpy as np
+
+        color = tuple(int(round(c * 255)) for c in (self.background_color or (1, 1, 1)))
+        canvas = np.empty((box.height, box.width, 3), dtype=np.uint8)
+        canvas[...] = color
+        rects = self._rects[pno]
+        if not len(rects):
+            return canvas
+
+        # Sol üst piksel ve piksel altı kaydırma; tüm karolarda aynı hesap kullanılır
+        cell = self.cell
+        steps = cell.phases(scale)
+        position = rects[:, :2] * scale
+        origins = np.floor(position).astype(np.int64)
+        phases = np.rint((position - origins) * steps).astype(np.int64)
+        origins += phases // steps
+        phases %= steps
+
+        cell_box = cell.box(scale)
+        width = cell_box.width + (steps > 1)
+        height = cell_box.height + (steps > 1)
+        hits = ((origins[:, 0] < box.x1) & (origins[:, 0] + width > box.x0)
+                & (origins[:, 1] < box.y1) & (origins[:, 1] + height > box.y0))
+        if not hits.any():
+            return canvas
+
+        # Hücreler üst üste binmiyorsa altları düz arka plandır: harmanlamak yerine kopyalanır
+        columns = np.unique(origins[:, 0])
+        rows = np.unique(origins[:, 1])
+        disjoint = ((len(columns) < 2 or np.diff(columns).min() >= width)
+                    and (len(rows) < 2 or np.diff(rows).min() >= height))
+        whole = cell.raster(scale) is not None
+
+        for (ox, oy), phase in zip(origins[hits].tolist(), phases[hits].tolist()):
+            x0, y0 = max(ox, box.x0), max(oy, box.y0)
+            if whole:
+                phase = tuple(phase)
+                src = cell.flat(scale, phase, color) if disjoint else cell.raster(scale, phase)
+                x1 = min(ox + src.shape[1], box.x1)
+                y1 = min(oy + src.shape[0], box.y1)
+                src = src[y0 - oy:y1 - oy, x0 - ox:x1 - ox]
+            else:
+                x1, y1 = min(ox + width, box.x1), min(oy + height, box.y1)
+                src = cell.part(scale, x0 - ox, y0 - oy, x1 - ox, y1 - oy)
+            # Parça rasterı yuvarlama yüzünden bir piksel küçük olabilir
+            h, w = src.shape[:2]
+            dst = canvas[y0 - box.y0:y0 - box.y0 + h, x0 - box.x0:x0 - box.x0 + w]
+            if src.shape[2] == 3:
+                dst[...] = src
+            else:
+                _blend(dst, src)
+        return canvas
+
+    def pixmap(self, pno, scale, clip):
+        """Sayfanın clip (pt) alanının scale ölçeğindeki RGB fitz.Pixmap'i (TilePyramid için)"""
+        import fitz
+
+        box = (clip * fitz.Matrix(scale, scale)).irect
+        canvas = self.render_array(pno, scale, box)
+        return fitz.Pixmap(fitz.csRGB, box.width, box.height, canvas.tobytes(), False)
+
+
+class CompositePyramid(TilePyramid):
+    """CompositeSheet'i TiledPreview'da göstermek için karo piramidi"""
+
+    def __init__(self, sheet, convert=None, max_bytes=None):
+        self.sheet = sheet
+        self.doc = None
+        self._owns_doc = False
+        self._setup(sheet.page_rects, convert, max_bytes)
+
+    def _pixmap(self, pno, scale, clip):
+        return self.sheet.pixmap(pno, scale, clip)
+
+
+def compare_with_pdf(sheet, doc, pno=0, scale=1.0):
+    """Birleştirilmiş görüntüyü gerçek çıktının get_pixmap görüntüsüyle karşılaştır
+
+    Dönüş: (ortalama mutlak fark, en büyük mutlak fark, en kötü hücrede değişmiş piksel oranı).
+    Farklar 0-255 kanal değeri cinsindendir. Kenar yumuşatma farkları tek tek piksellerde büyük
+    olabilir; kayık, eksik veya yanlış bir hücre ise kendi alanının önemli bir kısmını değiştirir.
+    """
+    import fitz
+    import numpy as np
+
+    page = doc[pno]
+    matrix = fitz.Matrix(scale, scale)
+    reference = _samples(page.get_pixmap(matrix=matrix, alpha=False))
+    box = (page.rect * matrix).irect
+    composite = sheet.render_array(pno, scale, box)
+    h = min(reference.shape[0], composite.shape[0])
+    w = min(reference.shape[1], composite.shape[1])
+    diff = np.abs(composite[:h, :w].astype(np.int16) - reference[:h, :w])
+
+    changed = diff.max(axis=2) > COMPOSITE_CHANGED
+    worst_cell = 0.0
+    for x0, y0, x1, y1 in (sheet._rects[pno] * scale).tolist():
+        area = changed[max(0, int(y0)):max(0, math.ceil(y1)), max(0, int(x0)):max(0, math.ceil(x1))]
+        if area.size:
+            worst_cell = max(worst_cell, float(area.mean()))
+    return float(diff.mean()), int(diff.max()), worst_cell
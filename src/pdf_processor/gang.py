@@ -0,0 +1,204 @@
+"""
+Karışık logolu rulo (gang sheet) yerleşimi
+
+Farklı logolar, farklı boyut ve adetlerle tek bir sabit genişlikli ruloya dikdörtgen paketleme ile
+yerleştirilir. Paketleyici gökyüzü çizgisi (skyline) yöntemidir: her parça, alt kenarı en düşük
+kalacak konuma (eşitlikte en sola) konur; izin verilirse 90° döndürülmüş hali de denenir. Birkaç
+sıralama denenir, en kısa rulo seçilir. Yalnızca geometri hesaplanır; PDF üretimi
+PDFProcessor.gang_sheet'tedir (her farklı logo belgeye bir kez gömülür).
+"""
+
+CM_TO_PT = 72/2.54
+
+# Denenen sıralamalar: parça sırası rulo uzunluğunu belirler
+SORT_KEYS = {
+    "height": lambda w, h: (h, w),
+    "area": lambda w, h: (w * h, h),
+    "side": lambda w, h: (max(w, h), min(w, h)),
+}
+
+
+class GangItem:
+    """Rulodaki bir logo kalemi: logo dosyası, boyut (cm) ve adet
+
+    Boyutlardan biri veya ikisi None ise logonun sınır kutusundan (en/boy oranı korunarak) tamamlanır.
+    rotate=False ise parça döndürülmez.
+    """
+
+    def __init__(self, logo, logo_width_cm=None, logo_height_cm=None, quantity=1, rotate=True):
+        self.logo = logo
+        self.logo_width_cm = logo_width_cm
+        self.logo_height_cm = logo_height_cm
+        self.quantity = int(quantity)
+        self.rotate = rotate
+
+    def resolved_size(self, bbox_width_cm, bbox_height_cm):
+        """Eksik boyutları sınır kutusu oranından tamamlanmış (genişlik, yükseklik) cm"""
+        width, height = self.logo_width_cm, self.logo_height_cm
+        if width is None and height is None:
+            return bbox_width_cm, bbox_height_cm
+        if width is None:
+            return height * bbox_width_cm / bbox_height_cm, height
+        if height is None:
+            return width, width * bbox_height_cm / bbox_width_cm
+        return width, height
+
+    def __repr__(self):
+        return (f"GangItem({self.logo!r}, {self.logo_width_cm}, {self.logo_height_cm}, "
+                f"quantity={self.quantity})")
+
+
+class GangLayout:
+    """Paketleme sonucu: her yerleşim için kalem numarası, dikdörtgen [x0, y0, x1, y1] pt ve döndürme"""
+
+    def __init__(self, items, rects, rotated, page_width_pt, page_height_pt):
+        self.items = items
+        self.rects = rects
+        self.rotated = rotated
+        self.page_width_pt = page_width_pt
+        self.page_height_pt = page_height_pt
+
+    @property
+    def placed(self):
+        return len(self.rects)
+
+    @property
+    def utilization(self):
+        """Logo alanının rulo alanına oranı"""
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in self.rects)
+        return area / (self.page_width_pt * self.page_height_pt) if self.rects else 0.0
+
+    @property
+    def page_count(self):
+        return 1
+
+    def __len__(self):
+        return self.placed
+
+
+class Skyline:
+    """Sabit genişlikli, yukarıdan aşağı büyüyen kutu için gökyüzü çizgisi
+
+    Çizgi, soldan sağa (x, genişlik, y) parçalarından oluşur; y o aralıktaki en alt dolu noktadır.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.xs = [0.0]
+        self.ws = [width]
+        self.ys = [0.0]
+
+    def find(self, w, h):
+        """(w, h) parçasının en iyi konumu: (üst y + h, x, başlangıç parçası, y) veya None"""
+        xs, ys = self.xs, self.ys
+        limit = self.width - w
+        best = None
+        count = len(xs)
+        for i in range(count):
+            x = xs[i]
+            if x > limit + 1e-9:
+                break
+            # Parçanın kapladığı aralıktaki en yüksek y (dolu kısmın altı)
+            y = ys[i]
+            right = x + w - 1e-9
+            j = i + 1
+            while j < count and xs[j] < right:
+                if ys[j] > y:
+                    y = ys[j]
+                j += 1
+            score = (y + h, x)
+            if best is None or score < best[:2]:
+                best = (y + h, x, i, y)
+        return best
+
+    def place(self, i, w, bottom):
+        """i. parçadan başlayarak w genişliğinde, alt kenarı bottom olan parçayı çizgiye ekle"""
+        xs, ws, ys = self.xs, self.ws, self.ys
+        x = xs[i]
+        right = x + w
+        # Kaplanan parçaları çıkar, sağda kalan artığı koru
+        j = i
+        while j < len(xs) and xs[j] + ws[j] <= right + 1e-9:
+            j += 1
+        tail = None
+        if j < len(xs) and xs[j] < right - 1e-9:
+            tail = (right, xs[j] + ws[j] - right, ys[j])
+            j += 1
+        new = [(x, w, bottom)]
+        if tail is not None:
+            new.append(tail)
+        xs[i:j] = [s[0] for s in new]
+        ws[i:j] = [s[1] for s in new]
+        ys[i:j] = [s[2] for s in new]
+        # Aynı yükseklikteki komşu parçaları birleştir
+        for k in (i + len(new) - 1, i, i - 1):
+            if 0 <= k < len(xs) - 1 and abs(ys[k] - ys[k + 1]) < 1e-9:
+                ws[k] += ws[k + 1]
+                del xs[k + 1], ws[k + 1], ys[k + 1]
+
+
+def pack_skyline(sizes, width, allow_rotation, order, spacing=(0.0, 0.0)):
+    """sizes: (w, h) listesi; verilen sırayla yerleştir (her parçanın sağına/altına spacing eklenir)
+
+    Dönüş: (yerleşimler [(x, y, w, h, döndürüldü)], kullanılan yükseklik); sığmayan parça varsa ValueError.
+    """
+    spacing_x, spacing_y = spacing
+    skyline = Skyline(width)
+    placements = [None] * len(sizes)
+    height = 0.0
+    for index in order:
+        w, h = sizes[index]
+        options = [(w, h, False)]
+        if allow_rotation[index] and abs(w - h) > 1e-9:
+            options.append((h, w, True))
+        best = None
+        for ow, oh, rotated in options:
+            found = skyline.find(ow + spacing_x, oh + spacing_y)
+            if found is not None and (best is None or found[:2] < best[0][:2]):
+                best = (found, ow, oh, rotated)
+        if best is None:
+            raise ValueError("Logo, kenar boşlukları çıkarılınca rulo genişliğine sığmıyor")
+        (top, x, i, y), ow, oh, rotated = best
+        skyline.place(i, ow + spacing_x, top)
+        placements[index] = (x, y, ow, oh, rotated)
+        height = max(height, top)
+    return placements, height
+
+
+def gang_layout(sizes, quantities, allow_rotation, page_width_pt, spacing_pt, spacingy_pt,
+                margin_left_pt, margin_right_pt, margin_top_pt, sort_keys=tuple(SORT_KEYS)):
+    """Kalem boyutları (pt) ve adetlerinden rulo yerleşimini hesapla
+
+    Aralıklar her parçaya eklenerek paketlenir; rulo boyu üst boşluk + içerik + alt boşluk
+    (üst boşlukla aynı). Denenen sıralamalardan en kısa ruloyu veren seçilir.
+    """
+    items, pieces, rotatable = [], [], []
+    for item, ((w, h), quantity, rotate) in enumerate(zip(sizes, quantities, allow_rotation)):
+        items.extend([item] * quantity)
+        pieces.extend([(w, h)] * quantity)
+        rotatable.extend([rotate] * quantity)
+
+    usable = page_width_pt - margin_left_pt - margin_right_pt + spacing_pt
+    best = None
+    for name in sort_keys:
+        key = SORT_KEYS[name]
+        # Döndürülebilir parçalar sıralamada yatık (kısa kenarı dikey) kabul edilir
+        order = sorted(
+            range(len(pieces)),
+            key=lambda i: key(*(sorted(pieces[i], reverse=True) if rotatable[i] else pieces[i])),
+            reverse=True,
+        )
+        placements, height = pack_skyline(pieces, usable, rotatable, order,
+                                          (spacing_pt, spacingy_pt))
+        if best is None or height < best[1] - 1e-9:
+            best = (placements, height)
+
+    placements, height = best
+    rects, rotated = [], []
+    for x, y, w, h, turned in placements:
+        x0 = margin_left_pt + x
+        y0 = margin_top_pt + y
+        rects.append((x0, y0, x0 + w, y0 + h))
+        rotated.append(turned)
+    page_height_pt = margin_top_pt + max(0.0, height - spacingy_pt) + margin_top_pt
+    return GangLayout(items, rects, rotated, page_width_pt, page_height_pt)
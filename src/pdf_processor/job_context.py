@@ -0,0 +1,70 @@
+"""
+Üretim işleri için yalıtılmış geçici çalışma dizini
+
+PDFProcessor ve FileManager ara dosyalarını (SVG, hazırlanmış logo, seçilen logo) sabit göreli
+adlar yerine işin kendi geçici dizinine yazar. Dizin ilk kullanımda oluşturulur (bellekte çalışan
+işler diske hiç dokunmaz), iş bitince veya nesne çöp toplanınca silinir; sürecin çalışma dizinine
+bağlı değildir. Aynı anda çalışan her iş (iş parçacığı veya süreç) kendi JobContext'ini kullanır.
+
+    with JobContext() as context:
+        processor = PDFProcessor(context=context)
+        ...
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+
+DEFAULT_PREFIX = "logo_job_"
+
+
+class JobContext:
+    """Bir işin geçici dosya dizini; cleanup() veya with bloğunun sonu ile silinir
+
+    root: dizinin oluşturulacağı üst dizin (None ise sistemin geçici dizini),
+    keep=True ise dizin silinmez (hata ayıklama için).
+    """
+
+    def __init__(self, root=None, prefix=DEFAULT_PREFIX, keep=False):
+        self.root = root
+        self.prefix = prefix
+        self.keep = keep
+        self._dir = None
+        self._finalizer = None
+        self._lock = threading.Lock()
+
+    @property
+    def scratch_dir(self):
+        """İşin geçici dizini (ilk erişimde oluşturulur)"""
+        with self._lock:
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix=self.prefix, dir=self.root)
+                if not self.keep:
+                    # Nesne kapatılmadan bırakılsa da dizin süreç bitmeden silinir
+                    self._finalizer = weakref.finalize(self, shutil.rmtree, self._dir,
+                                                       ignore_errors=True)
+            return self._dir
+
+    def path(self, name):
+        """Geçici dizindeki bir dosyanın mutlak yolu"""
+        return os.path.join(self.scratch_dir, name)
+
+    def cleanup(self):
+        """Geçici dizini ve içindekileri sil; bağlam sonra yeniden kullanılabilir (yeni dizinle)"""
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+                self._finalizer = None
+            self._dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+        return False
+
+    def __repr__(self):
+        return f"JobContext({self._dir or 'oluşturulmadı'})"
@@ -0,0 +1,54 @@
+"""
+Katmanlı yerleşim sayfaları: arka plan ayrı bir içerik akışında
+
+Katmanlı üretilen sayfalarda arka plan, logo yerleşimlerinden önce gelen ve işaretli içerik
+(/LogoBackground BMC ... EMC) ile etiketlenmiş ayrı bir içerik akışıdır. Renk değiştirmek ya da arka
+planı açıp kapatmak yalnızca bu akışı yeniden yazar; logo, yerleşim ve kaynaklar hiç değişmez.
+"""
+
+# Arka plan akışını tanımlayan işaretli içerik etiketi
+BACKGROUND_TAG = b"/LogoBackground BMC"
+
+
+def background_stream(page, color=None):
+    """Arka plan katmanının içeriği; color None ise boş (şeffaf) katman"""
+    if color is None:
+        return BACKGROUND_TAG + b"\nEMC\n"
+    x0, y0, x1, y1 = page.mediabox
+    r, g, b = color
+    return BACKGROUND_TAG + (
+        f"\nq\n{x0:g} {y0:g} {x1 - x0:g} {y1 - y0:g} re\n"
+        f"{r:.4g} {g:.4g} {b:.4g} rg f\nQ\nEMC\n"
+    ).encode("ascii")
+
+
+def add_background_layer(doc, page, color=None):
+    """Sayfanın en altına arka plan katmanı ekle ve xref'ini döndür"""
+    from src.pdf_processor.placement import append_content_stream
+
+    return append_content_stream(doc, page, background_stream(page, color), prepend=True)
+
+
+def find_background_layer(doc, page):
+    """Sayfanın arka plan katmanı akışının xref'i; katmanlı değilse None"""
+    for xref in page.get_contents():
+        if doc.xref_stream(xref).lstrip().startswith(BACKGROUND_TAG):
+            return xref
+    return None
+
+
+def is_layered(doc):
+    """Belgenin tüm sayfalarında arka plan katmanı var mı"""
+    return len(doc) > 0 and all(find_background_layer(doc, page) is not None for page in doc)
+
+
+def set_background(doc, color=None):
+    """Tüm sayfaların arka plan katmanını yeniden yaz (color None ise kaldır); güncellenen sayfa sayısı"""
+    count = 0
+    for page in doc:
+        xref = find_background_layer(doc, page)
+        if xref is None:
+            continue
+        doc.update_stream(xref, background_stream(page, color))
+        count += 1
+    return count
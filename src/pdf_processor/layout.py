@@ -0,0 +1,226 @@
+"""
+Adım-tekrar (step-and-repeat) ızgara yerleşim motoru
+
+Tüm yerleşim dikdörtgenleri tek seferde NumPy dizisi olarak hesaplanır; PDF oluşturmadan
+incelenebilir veya tekrar kullanılabilir. Hesap, eski while döngüsüyle birebir aynı sonucu verir
+(ofsetler aynı sırada toplanır, sayfa altına gelince aynı noktada durulur).
+Sayfalama modunda ilk sayfanın kapasitesi sonraki sayfalarda aynen tekrarlanır. Logo döndürülürse
+(transform.LogoTransform) hücre, döndürülmüş logonun sınır kutusudur. Otomatik sayfa boyu çok uzun
+rulolarda segmented_layout ile tam satırlardan bölünmüş ardışık sayfalara (segment) ayrılabilir.
+NumPy ilk kullanımda yüklenir.
+"""
+
+# Otomatik sayfa boyunda alta eklenen pay (pt)
+AUTO_HEIGHT_PADDING_PT = 50
+# PDF görüntüleyicilerinin ve RIP'lerin kabul ettiği en büyük sayfa kenarı (pt, yaklaşık 508 cm)
+MAX_PAGE_HEIGHT_PT = 14400
+
+
+class GridLayout:
+    """Izgara yerleşiminin sonucu: rects (N, 4) dizisi [x0, y0, x1, y1] pt cinsinden
+
+    rects yerleşim hücreleridir; logo_size logonun döndürülmemiş (genişlik, yükseklik) pt boyutu,
+    transform hücrenin ortasında uygulanan dönüşümdür (None ise logo hücreyi doldurur).
+    """
+
+    def __init__(self, rects, logos_per_row, requested, page_width_pt, page_height_pt,
+                 page_index=None, logo_size=None, transform=None, page_heights=None):
+        self.rects = rects
+        self.logos_per_row = logos_per_row
+        self.requested = requested
+        self.page_width_pt = page_width_pt
+        self.page_height_pt = page_height_pt
+        # Her dikdörtgenin sayfa numarası; None ise tümü tek sayfada
+        self.page_index = page_index
+        self.logo_size = logo_size
+        self.transform = transform
+        # Sayfa başına yükseklik (segmentlere bölünmüş rulo); None ise tüm sayfalar page_height_pt
+        self.page_heights = page_heights
+
+    def page_height(self, pno):
+        """pno. sayfanın yüksekliği (pt)"""
+        if self.page_heights is None:
+            return self.page_height_pt
+        return self.page_heights[pno]
+
+    @property
+    def placed(self):
+        return len(self.rects)
+
+    @property
+    def overflow(self):
+        """Sayfaya sığmayan logo sayısı"""
+        return max(0, self.requested - self.placed)
+
+    @property
+    def rows(self):
+        if not self.placed:
+            return 0
+        return (self.placed - 1) // self.logos_per_row + 1
+
+    @property
+    def cell_size(self):
+        """Bir yerleşim hücresinin (genişlik, yükseklik) pt; yerleşim yoksa None"""
+        if not self.placed:
+            return None
+        x0, y0, x1, y1 = self.rects[0].tolist()
+        return x1 - x0, y1 - y0
+
+    @property
+    def page_count(self):
+        if self.page_index is None or not self.placed:
+            return 1
+        return int(self.page_index[-1]) + 1
+
+    def pages(self):
+        """Sayfa sayfa (sayfa no, o sayfanın dikdörtgen listesi)"""
+        if self.page_index is None:
+            yield 0, self.rects.tolist()
+            return
+        import numpy as np
+
+        bounds = np.searchsorted(self.page_index, np.arange(self.page_count + 1))
+        for pno in range(self.page_count):
+            yield pno, self.rects[bounds[pno]:bounds[pno + 1]].tolist()
+
+    def split_pages(self):
+        """Her sayfa için yalnızca o sayfayı içeren tek sayfalık GridLayout (segmentleri ayrı dosyalara
+        yazmak için)"""
+        if self.page_index is None:
+            yield self
+            return
+        import numpy as np
+
+        bounds = np.searchsorted(self.page_index, np.arange(self.page_count + 1))
+        for pno in range(self.page_count):
+            rects = self.rects[bounds[pno]:bounds[pno + 1]]
+            yield GridLayout(rects, self.logos_per_row, len(rects), self.page_width_pt,
+                             self.page_height(pno), logo_size=self.logo_size, transform=self.transform)
+
+    def logo_rects(self, rects):
+        """Hücrelerdeki döndürülmemiş logo dikdörtgenleri (dönüşüm yoksa hücrelerin kendisi)"""
+        if self.transform is None:
+            return rects
+        from src.pdf_processor.transform import centered_rect
+
+        return [centered_rect(rect, *self.logo_size) for rect in rects]
+
+    def __len__(self):
+        return self.placed
+
+    def __iter__(self):
+        return iter(self.rects.tolist())
+
+
+def logos_per_row(page_width_pt, margin_left_pt, margin_right_pt, logo_width_pt, spacing_pt):
+    """Bir satıra sığan logo sayısı"""
+    count = int(
+        (page_width_pt - margin_left_pt - margin_right_pt + spacing_pt)
+        / (logo_width_pt + spacing_pt)
+    )
+    if count < 1:
+        raise ValueError("Logo, kenar boşlukları çıkarılınca sayfa genişliğine sığmıyor")
+    return count
+
+
+def _offsets(start, step, count):
+    """start, start+step, ... (döngüdeki `+=` ile aynı sırada toplanmış) count değer"""
+    import numpy as np
+
+    steps = np.full(count, step, dtype=np.float64)
+    steps[0] = start
+    return np.cumsum(steps)
+
+
+def grid_layout(page_width_pt, page_height_pt, logo_width_pt, logo_height_pt,
+                spacing_pt, spacingy_pt, margin_left_pt, margin_right_pt, margin_top_pt,
+                total_logo, paginate=False, transform=None):
+    """Sayfa ve logo ölçülerinden tüm yerleşim dikdörtgenlerini hesapla
+
+    Satır satır soldan sağa yerleşir; bir sonraki satır sayfanın alt boşluğuna taşacaksa durur
+    (ilk logo her zaman yerleşir). Sığmayanlar GridLayout.overflow ile raporlanır.
+    paginate=True ise sığmayanlar aynı ızgarayla yeni sayfalara devam eder (GridLayout.page_index).
+    transform verilirse hücre, logonun o dönüşümle kapladığı sınır kutusudur.
+    """
+    import numpy as np
+
+    logo_size = (logo_width_pt, logo_height_pt)
+    if transform is not None:
+        logo_width_pt, logo_height_pt = transform.rotated_size(logo_width_pt, logo_height_pt)
+    per_row = logos_per_row(page_width_pt, margin_left_pt, margin_right_pt, logo_width_pt, spacing_pt)
+    if total_logo <= 0:
+        return GridLayout(np.empty((0, 4)), per_row, 0, page_width_pt, page_height_pt,
+                          logo_size=logo_size, transform=transform)
+
+    # Her logodan sonra geçilen satırın y'si; taşan ilk satırdan önceki logoya kadar yerleşir
+    last_row = total_logo // per_row
+    y_rows = _offsets(margin_top_pt, logo_height_pt + spacingy_pt, last_row + 1)
+    overflowing = np.flatnonzero(y_rows + logo_height_pt > page_height_pt - margin_top_pt)
+    placed = total_logo
+    if overflowing.size:
+        placed = min(total_logo, max(1, int(overflowing[0]) * per_row))
+
+    page_index = None
+    index = np.arange(total_logo if paginate else placed)
+    if paginate:
+        # Bir sayfanın kapasitesi `placed`; sonraki sayfalar aynı konumları tekrarlar
+        page_index = index // placed
+        index = index % placed
+    x_cols = _offsets(margin_left_pt, logo_width_pt + spacing_pt, min(per_row, placed))
+    x0 = x_cols[index % per_row]
+    y0 = y_rows[index // per_row]
+    rects = np.column_stack((x0, y0, x0 + logo_width_pt, y0 + logo_height_pt))
+    return GridLayout(rects, per_row, total_logo, page_width_pt, page_height_pt, page_index,
+                      logo_size, transform)
+
+
+def auto_page_height(page_width_pt, logo_width_pt, logo_height_pt, spacing_pt, spacingy_pt,
+                     margin_left_pt, margin_right_pt, margin_top_pt, total_logo, transform=None):
+    """Tüm logoların sığacağı sayfa yüksekliği (otomatik sayfa boyu modu)"""
+    if transform is not None:
+        logo_width_pt, logo_height_pt = transform.rotated_size(logo_width_pt, logo_height_pt)
+    per_row = logos_per_row(page_width_pt, margin_left_pt, margin_right_pt, logo_width_pt, spacing_pt)
+    y = int(total_logo / per_row) + 1
+    return margin_top_pt + y * logo_height_pt + (y - 1) * spacingy_pt + AUTO_HEIGHT_PADDING_PT
+
+
+def segmented_layout(page_width_pt, logo_width_pt, logo_height_pt, spacing_pt, spacingy_pt,
+                     margin_left_pt, margin_right_pt, margin_top_pt, total_logo, max_height_pt,
+                     transform=None):
+    """Otomatik sayfa boyunu max_height_pt'yi aşmayan ardışık sayfalara böl (tam satırlardan)
+
+    Her segment üst boşluktan başlar ve sığan en çok satırı alır; son segmentin boyu kalan logolar
+    için auto_page_height'tır. Dönen yerleşimde sayfa yükseklikleri GridLayout.page_heights'tadır.
+    """
+    import numpy as np
+
+    logo_size = (logo_width_pt, logo_height_pt)
+    if transform is not None:
+        logo_width_pt, logo_height_pt = transform.rotated_size(logo_width_pt, logo_height_pt)
+    per_row = logos_per_row(page_width_pt, margin_left_pt, margin_right_pt, logo_width_pt, spacing_pt)
+
+    # Bir segmente sığan satır sayısı: üst boşluk + k satır + (k-1) aralık + alt pay <= en büyük boy
+    rows = int((max_height_pt - margin_top_pt - AUTO_HEIGHT_PADDING_PT + spacingy_pt)
+               / (logo_height_pt + spacingy_pt))
+    if rows < 1:
+        raise ValueError("Bir logo satırı en büyük segment boyuna sığmıyor")
+    capacity = rows * per_row
+    full_height = margin_top_pt + rows * logo_height_pt + (rows - 1) * spacingy_pt + AUTO_HEIGHT_PADDING_PT
+
+    total_logo = max(0, total_logo)
+    index = np.arange(total_logo)
+    page_index = index // capacity
+    index = index % capacity
+    x_cols = _offsets(margin_left_pt, logo_width_pt + spacing_pt, per_row)
+    y_rows = _offsets(margin_top_pt, logo_height_pt + spacingy_pt, rows)
+    x0 = x_cols[index % per_row]
+    y0 = y_rows[index // per_row]
+    rects = np.column_stack((x0, y0, x0 + logo_width_pt, y0 + logo_height_pt))
+
+    segments = max(1, -(-total_logo // capacity))
+    remaining = total_logo - (segments - 1) * capacity
+    last_height = auto_page_height(page_width_pt, logo_width_pt, logo_height_pt, spacing_pt, spacingy_pt,
+                                   margin_left_pt, margin_right_pt, margin_top_pt, remaining)
+    page_heights = [full_height] * (segments - 1) + [min(last_height, full_height)]
+    return GridLayout(rects, per_row, total_logo, page_width_pt, full_height, page_index,
+                      logo_size, transform, page_heights)
@@ -0,0 +1,244 @@
+"""
+Hazırlanmış logo dosyaları için içerik adresli önbellek modülü
+
+Disk önbelleği çalışma dizininden ve kaynak dizininden bağımsızdır: varsayılan olarak kullanıcının
+önbellek dizini (bkz. user_cache_dir), CACHE_DIR_ENV verilmişse o dizin. Aynı dizini paylaşan süreçlerin her biri kendi LRU dizinini tutar
+ve sınırı aşınca en eski kayıtları siler; bu yüzden get() ile alınan dosya açılmadan önce
+silinmiş olabilir. Kullananlar bu durumda kaydı yeniden hazırlar (bkz. PDFProcessor._open_prepared).
+"""
+
+import os
+import sys
+import json
+import errno
+import hashlib
+import threading
+from collections import OrderedDict
+
+from src.pdf_processor.memory import cache_budget, BUDGET_LOGO_CACHE
+
+# Sabitler
+CACHE_DIR_ENV = "LOGO_EDITOR_CACHE_DIR"
+CACHE_APP_NAME = "pdf-logo-editor"
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024     # disk önbelleği; bellek modunda sınır bellek bütçesinden gelir
+DIGEST_MEMO_SIZE = 1024                   # (yol, boyut, mtime) -> özet hafızası
+
+
+def user_cache_dir():
+    """Kullanıcı başına önbellek dizini (Windows: LOCALAPPDATA, macOS: ~/Library/Caches, diğer: XDG)"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, CACHE_APP_NAME, "logo_cache")
+
+
+DEFAULT_CACHE_DIR = os.environ.get(CACHE_DIR_ENV) or user_cache_dir()
+
+# Aynı dosyanın tekrar tekrar okunmaması için (yol, boyut, mtime) -> özet
+_digest_memo = OrderedDict()
+
+
+def file_digest(path):
+    """Dosya içeriğinin SHA-256 özetini döndür (değişmeyen dosyalar için hafızadan)"""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _digest_memo:
+        _digest_memo.move_to_end(memo_key)
+        return _digest_memo[memo_key]
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    _digest_memo[memo_key] = digest
+    if len(_digest_memo) > DIGEST_MEMO_SIZE:
+        _digest_memo.popitem(last=False)
+    return digest
+
+
+def source_digest(source):
+    """PDF kaynağının (dosya yolu veya bayt) SHA-256 özeti"""
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest()
+    return file_digest(source)
+
+
+def open_pdf(source):
+    """PDF kaynağını (dosya yolu veya bayt) fitz belgesi olarak aç
+
+    Dosya yoksa (ör. önbellekten silinmişse) fitz'in hatası yerine FileNotFoundError (OSError) verilir.
+    """
+    import fitz
+
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open("pdf", source)
+    try:
+        return fitz.open(source)
+    except RuntimeError:
+        if not os.path.exists(source):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), source)
+        raise
+
+
+class LogoCache:
+    """Logo içeriği + hedef boyut anahtarlı LRU önbellek
+
+    persist=True ise kayıtlar diskte kalıcıdır ve get() dosya yolu döndürür; persist=False ise
+    kayıtlar yalnızca bellekte tutulur ve get() PDF baytlarını döndürür (diske hiç yazılmaz).
+    max_bytes verilmezse diskte DEFAULT_MAX_BYTES, bellekte bellek bütçesinin logo önbelleği payıdır.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=None, persist=True):
+        if max_bytes is None:
+            max_bytes = DEFAULT_MAX_BYTES if persist else cache_budget(BUDGET_LOGO_CACHE)
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist = persist
+        self.hits = 0
+        self.misses = 0
+
+        # anahtar -> dosya boyutu (en eski kullanılan başta)
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        # persist=False iken anahtar -> (PDF baytları, meta)
+        self._memory = {}
+
+        if not persist:
+            return
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def make_key(self, content_digest, *params):
+        """İçerik özeti ve hazırlama parametrelerinden önbellek anahtarı üret"""
+        parts = [content_digest]
+        for param in params:
+            if isinstance(param, float):
+                param = f"{param:.6f}"
+            parts.append(str(param))
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _pdf_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _meta_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self):
+        """Diskteki kayıtları son kullanım sırasına göre dizine al"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pdf"):
+                continue
+            key = name[:-4]
+            if not os.path.exists(self._meta_path(key)):
+                continue
+            try:
+                stat = os.stat(self._pdf_path(key))
+            except OSError:
+                continue    # başka bir süreç bu arada silmiş
+            entries.append((stat.st_mtime, key, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, key):
+        """Kayıt varsa (pdf yolu veya baytları, meta) döndür, yoksa None"""
+        if key not in self._index:
+            self.misses += 1
+            return None
+
+        if not self.persist:
+            self._index.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        pdf_path = self._pdf_path(key)
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            # LRU sırası diskte de korunsun diye erişim zamanını güncelle
+            os.utime(pdf_path, None)
+        except (OSError, ValueError):
+            # Başka bir süreç silmiş ya da kayıt bozulmuş olabilir
+            self._drop(key)
+            self.misses += 1
+            return None
+
+        self._index.move_to_end(key)
+        self.hits += 1
+        return pdf_path, meta
+
+    def put(self, key, pdf_source, meta):
+        """Hazırlanmış PDF'i (dosya yolu veya bayt) önbelleğe al; önbellekteki yolunu veya baytlarını döndür"""
+        if isinstance(pdf_source, (bytes, bytearray)):
+            data = bytes(pdf_source)
+        else:
+            with open(pdf_source, "rb") as f:
+                data = f.read()
+
+        if not self.persist:
+            self._memory[key] = (data, meta)
+            self._account(key, len(data))
+            return data
+
+        # Yarım yazılmış dosya görülmesin diye önce geçici ada yaz, sonra taşı
+        # (ad süreç ve iş parçacığına özgü: aynı anda yazan işler çakışmaz)
+        pdf_path = self._pdf_path(key)
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_pdf = f"{pdf_path}.{suffix}"
+        tmp_meta = f"{self._meta_path(key)}.{suffix}"
+        with open(tmp_pdf, "wb") as f:
+            f.write(data)
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, self._meta_path(key))
+        os.replace(tmp_pdf, pdf_path)
+
+        self._account(key, len(data))
+        return pdf_path
+
+    def _account(self, key, size):
+        """Yeni kaydı dizine ekle ve sınırları uygula"""
+        if key in self._index:
+            self._total_bytes -= self._index.pop(key)
+        self._index[key] = size
+        self._total_bytes += size
+        self._evict(keep=key)
+
+    def _drop(self, key):
+        """Kaydı dizinden ve diskten sil"""
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+        if not self.persist:
+            self._memory.pop(key, None)
+            return
+        for path in (self._pdf_path(key), self._meta_path(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self, keep=None):
+        """Sınırlar aşıldıysa en eski kullanılan kayıtları sil"""
+        while self._index and (len(self._index) > self.max_entries
+                               or self._total_bytes > self.max_bytes):
+            oldest = next(iter(self._index))
+            if oldest == keep:
+                break
+            self._drop(oldest)
+
+    def clear(self):
+        """Tüm önbelleği temizle"""
+        for key in list(self._index):
+            self._drop(key)
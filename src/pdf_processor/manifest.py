@@ -0,0 +1,280 @@
+"""
+Kaldığı yerden devam edebilen, liste (manifest) güdümlü toplu üretim
+
+    python -m src.pdf_processor --manifest siparisler.csv --settings kayitliayar.txt --workers 8
+
+Liste CSV (başlık satırlı) veya JSON iş listesidir (bkz. cli.load_jobs); her satır bir çıktıdır.
+Sütunlar iş alanlarıdır (cli.JOB_DEFAULTS, "logo", "output") ya da COLUMN_ALIASES'taki kısa adlar;
+boş hücre varsayılanı kullanır. Sayfa ayarları (genişlik, yükseklik, kenar boşlukları) verilmeyen
+satırlar --settings ile verilen arayüz ayar dosyasından (kayitliayar.txt) tamamlanır. Sayfa boyu
+"auto" olan ya da max-length / split-files isteyen satırlar ayar dosyasının sayfa boyunu almaz
+(otomatik boy). Sabit boylu sayfaya sığmayan logo kalan satır başarısız sayılır (bkz. cli.run_sheet_job).
+
+Her satırın girdi özeti (logo içeriği + alanlar, bkz. input_hash) hesaplanır. Tamamlanan satırlar
+günlüğe (JOURNAL_SUFFIX, satır başına bir JSON) özet ve çıktının SHA-256'sı ile yazılır; çıktılar önce
+geçici adla üretilip yerine taşınır. Yeniden çalıştırmada günlükte aynı girdi özetiyle "done" olan ve
+çıktısı değişmemiş satırlar atlanır; böylece yarıda kalan bir toplu iş kaldığı yerden devam eder.
+"""
+
+import os
+import csv
+import json
+import time
+import hashlib
+
+from src.pdf_processor.cli import (JOB_DEFAULTS, AUTO_VALUES, resolve_job, merge_defaults, load_jobs,
+                                   run_job, run_jobs, _get_processor)
+from src.pdf_processor.logo_cache import DEFAULT_CACHE_DIR, file_digest
+from src.pdf_processor.pdf_processor import segment_path
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+HASH_VERSION = 1            # üretim hattı çıktıyı değiştirirse artırılır (tüm satırlar yeniden üretilir)
+PARTIAL_MARK = ".part"      # üretilmekte olan çıktının geçici ad eki
+
+# Arayüz ayar dosyasının (kayitliayar.txt) satır sırası
+SETTINGS_FIELDS = ("page_width_cm", "page_height_cm", "pagexcm", "pagexrcm", "pageycm")
+
+# CSV'de iş alanları yerine kullanılabilen kısa adlar (komut satırı seçenekleriyle aynı)
+COLUMN_ALIASES = {
+    "logo-width": "logo_width_cm",
+    "logo-height": "logo_height_cm",
+    "count": "total_logo",
+    "spacing": "spacing_cm",
+    "spacing-y": "spacingy_cm",
+    "page-width": "page_width_cm",
+    "page-height": "page_height_cm",
+    "margin-left": "pagexcm",
+    "margin-right": "pagexrcm",
+    "margin-top": "pageycm",
+    "bg-color": "bg_color",
+    "save-profile": "save_profile",
+    "mirror-x": "mirror_x",
+    "mirror-y": "mirror_y",
+    "svg-backend": "svg_backend",
+    "bbox-strategy": "bbox_strategy",
+    "max-length": "max_length_cm",
+    "split-files": "segment_files",
+}
+FLOAT_FIELDS = ("logo_width_cm", "logo_height_cm", "spacing_cm", "spacingy_cm", "page_width_cm",
+                "page_height_cm", "pagexcm", "pagexrcm", "pageycm", "rotation", "max_length_cm")
+INT_FIELDS = ("total_logo",)
+BOOL_FIELDS = ("remove_bg", "paginate", "mirror_x", "mirror_y", "segment_files")
+TRUE_VALUES = ("1", "true", "yes", "evet", "e", "x")
+FALSE_VALUES = ("0", "false", "no", "hayir", "hayır", "h")
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def load_settings(path):
+    """Arayüz ayar dosyasındaki sayfa ayarları (boş satır: otomatik / varsayılan)"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    settings = {}
+    for field, value in zip(SETTINGS_FIELDS, lines):
+        if value:
+            settings[field] = float(value)
+    return settings
+
+
+def parse_cell(field, value, row_number):
+    """CSV hücresini alanın türüne çevir"""
+    if field == "page_height_cm" and value.lower() in AUTO_VALUES:
+        return None     # otomatik sayfa boyu (ayar dosyasındaki boyu da geçersiz kılar)
+    try:
+        if field in FLOAT_FIELDS:
+            return float(value.replace(",", "."))
+        if field in INT_FIELDS:
+            return int(value)
+    except ValueError:
+        raise ValueError(f"{row_number}. satır: {field} sayı olmalı ({value!r})")
+    if field in BOOL_FIELDS:
+        lowered = value.lower()
+        if lowered in TRUE_VALUES or lowered in FALSE_VALUES:
+            return lowered in TRUE_VALUES
+        raise ValueError(f"{row_number}. satır: {field} evet/hayır olmalı ({value!r})")
+    return value
+
+
+def read_csv_rows(path):
+    """CSV satırlarını iş sözlüklerine çevir (boş hücreler atlanır)"""
+    known = set(JOB_DEFAULTS) | {"logo", "output"}
+    rows = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        for row_number, row in enumerate(reader, start=2):
+            job = {}
+            for column, value in row.items():
+                if column is None or value is None or not value.strip():
+                    continue
+                field = COLUMN_ALIASES.get(column.strip().lower(), column.strip().lower())
+                if field not in known:
+                    raise ValueError(f"Bilinmeyen sütun: {column}")
+                job[field] = parse_cell(field, value.strip(), row_number)
+            if job:
+                rows.append(job)
+    return rows
+
+
+def load_manifest(path, settings=None):
+    """Listeyi (CSV veya JSON) çözülmüş işler olarak oku; settings satırlarda olmayan sayfa ayarlarıdır"""
+    settings = settings or {}
+    if path.lower().endswith(".csv"):
+        base_dir = os.path.dirname(os.path.abspath(path))
+        jobs = [resolve_job(merge_defaults(settings, row), base_dir) for row in read_csv_rows(path)]
+    else:
+        jobs = load_jobs(path, defaults=settings)
+
+    seen = set()
+    for job in jobs:
+        if job["output"] in seen:
+            raise ValueError(f"Aynı çıktı birden fazla satırda: {job['output']}")
+        seen.add(job["output"])
+    return jobs
+
+
+def input_hash(job):
+    """Satırın girdi özeti: logo içerik(ler)i, iş alanları ve HASH_VERSION"""
+    fields = {key: value for key, value in job.items() if key not in ("output", "logo", "items")}
+    if job.get("items") is not None:
+        fields["items"] = [dict(item, logo=file_digest(item["logo"])) for item in job["items"]]
+    else:
+        fields["logo"] = file_digest(job["logo"])
+    fields["version"] = HASH_VERSION
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def partial_path(output):
+    root, ext = os.path.splitext(output)
+    return f"{root}{PARTIAL_MARK}{ext}"
+
+
+def outputs_digest(paths):
+    """Satırın çıktı dosyalarının (segmentlere bölünmüşse hepsinin) ortak özeti"""
+    if len(paths) == 1:
+        return file_digest(paths[0])
+    return hashlib.sha256(" ".join(file_digest(path) for path in paths).encode("ascii")).hexdigest()
+
+
+def run_manifest_job(job):
+    """Havuzda çalışır: çıktıyı geçici adla üretip yerine taşı; hatayı sonuç olarak döndür"""
+    output = job["output"]
+    partial = partial_path(output)
+    written = []
+    try:
+        result = run_job(dict(job, output=partial))
+        written = result.get("outputs") or [partial]
+        if len(written) == 1:
+            outputs = [output]
+        else:
+            outputs = [segment_path(output, n, len(written)) for n in range(len(written))]
+        for source, target in zip(written, outputs):
+            os.replace(source, target)
+        result.update(output=output, outputs=outputs, output_digest=outputs_digest(outputs))
+        return result
+    except Exception as e:
+        for path in written or [partial]:
+            if os.path.exists(path):
+                os.remove(path)
+        return {"output": output, "error": f"{e}"}
+
+
+class Journal:
+    """Satır başına bir JSON olay; her olay diske yazılıp fsync edilir (çökmede en fazla son satır kaybolur)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}       # çıktı yolu -> son olay
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue    # yarım yazılmış son satır
+                    self.entries[entry["output"]] = entry
+        self._file = None
+
+    def is_done(self, job, digest):
+        """Satır aynı girdilerle tamamlanmış ve çıktısı değişmemiş mi"""
+        entry = self.entries.get(job["output"])
+        if entry is None or entry["status"] != STATUS_DONE or entry["input_hash"] != digest:
+            return False
+        outputs = entry.get("outputs") or [job["output"]]
+        return (all(os.path.exists(path) for path in outputs)
+                and outputs_digest(outputs) == entry["output_digest"])
+
+    def record(self, entry):
+        if self._file is None:
+            self._file = open(self.path, "a+", encoding="utf-8")
+            if self._file.tell() > 0:
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")  # çökmede yarım kalan satır sonraki olayı bozmasın
+        entry = dict(entry, ts=round(time.time(), 3))
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.entries[entry["output"]] = entry
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def run_manifest(manifest_path, journal_path=None, settings_path=None, workers=None,
+                 cache_dir=DEFAULT_CACHE_DIR, force=False):
+    """Listeyi çalıştır; (tamamlanan, atlanan, başarısız) sayılarını döndür"""
+    settings = load_settings(settings_path) if settings_path else None
+    jobs = load_manifest(manifest_path, settings)
+    journal = Journal(journal_path or manifest_path + JOURNAL_SUFFIX)
+
+    pending = []
+    hashes = {}
+    failed = 0
+    for job in jobs:
+        try:
+            digest = input_hash(job)
+        except OSError as e:
+            # Logo dosyası yok: satır çalıştırılmadan başarısız sayılır
+            failed += 1
+            print(f"❌ {job['output']}: {e}")
+            journal.record({"output": job["output"], "status": STATUS_FAILED, "input_hash": None,
+                            "error": f"{e}"})
+            continue
+        hashes[job["output"]] = digest
+        if not force and journal.is_done(job, digest):
+            continue
+        pending.append(job)
+
+    skipped = len(jobs) - len(pending) - failed
+    print(f"📋 {len(jobs)} satır: {skipped} tamamlanmış (atlandı), {len(pending)} üretilecek")
+    done = 0
+    processed = 0
+    try:
+        if len(pending) == 1:
+            _get_processor(cache_dir)   # tek satır için havuz kurulmaz
+            results = [run_manifest_job(pending[0])]
+        elif pending:
+            results = run_jobs(pending, workers=workers, cache_dir=cache_dir, task=run_manifest_job)
+        else:
+            results = []
+        for result in results:
+            output = result["output"]
+            processed += 1
+            if "error" in result:
+                failed += 1
+                print(f"❌ [{processed}/{len(pending)}] {output}: {result['error']}")
+                journal.record({"output": output, "status": STATUS_FAILED,
+                                "input_hash": hashes[output], "error": result["error"]})
+                continue
+            done += 1
+            journal.record({"output": output, "status": STATUS_DONE, "input_hash": hashes[output],
+                            "outputs": result["outputs"], "output_digest": result["output_digest"],
+                            "bytes": result["bytes"],
+                            "pages": result["pages"], "seconds": round(result["seconds"], 3)})
+            print(f"✅ [{processed}/{len(pending)}] {output} ({result['seconds']:.2f} sn)")
+    finally:
+        journal.close()
+    return done, skipped, failed
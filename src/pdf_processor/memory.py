@@ -0,0 +1,71 @@
+"""
+Uzun süren oturumlar için bellek bütçesi
+
+Bellekteki önbelleklerin toplam sınırı MEMORY_BUDGET_ENV (MB) ile ayarlanır ve BUDGET_SHARES
+oranlarında paylaştırılır: bellek modundaki logo önbelleği, önizleme karoları, anında önizleme hücre
+rasterları ve MuPDF'in kendi nesne deposu (store: yazı tipleri, görseller, çözülmüş akışlar).
+Bütçe önbellek oluşturulurken okunur; MuPDF deposu her üretimden sonra trim_mupdf_store ile
+payına indirilir (kurulu PyMuPDF deposun üst sınırının sonradan değiştirilmesine izin vermez).
+"""
+
+import os
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+MEMORY_BUDGET_ENV = "LOGO_EDITOR_MEMORY_MB"
+DEFAULT_BUDGET_MB = 640
+
+BUDGET_LOGO_CACHE = "logo_cache"    # LogoCache(persist=False)
+BUDGET_TILES = "tiles"              # TilePyramid / CompositePyramid karoları
+BUDGET_CELLS = "cells"              # LogoCell ölçek rasterları
+BUDGET_MUPDF = "mupdf_store"        # fitz.TOOLS.store_size
+BUDGET_SHARES = {
+    BUDGET_LOGO_CACHE: 0.25,
+    BUDGET_TILES: 0.30,
+    BUDGET_CELLS: 0.10,
+    BUDGET_MUPDF: 0.35,
+}
+
+
+def budget_mb():
+    """Toplam bütçe (MB); ortam değişkeni geçersizse varsayılan"""
+    value = os.environ.get(MEMORY_BUDGET_ENV)
+    if not value:
+        return DEFAULT_BUDGET_MB
+    try:
+        mb = float(value)
+    except ValueError:
+        mb = 0
+    if mb <= 0:
+        logger.warning("%s=%s geçersiz; %d MB kullanılıyor", MEMORY_BUDGET_ENV, value, DEFAULT_BUDGET_MB)
+        return DEFAULT_BUDGET_MB
+    return mb
+
+
+def cache_budget(name):
+    """Önbelleğin bütçedeki payı (bayt)"""
+    return int(budget_mb() * BUDGET_SHARES[name] * 1024 * 1024)
+
+
+def trim_mupdf_store(limit=None):
+    """MuPDF deposu payını aşıyorsa fazlasını boşalt; boşaltılan bayt sayısını döndür"""
+    import fitz
+
+    limit = cache_budget(BUDGET_MUPDF) if limit is None else limit
+    size = fitz.TOOLS.store_size
+    if size <= limit:
+        return 0
+    fitz.TOOLS.store_shrink(min(100, math.ceil((size - limit) * 100 / size)))
+    return size - fitz.TOOLS.store_size
+
+
+def rss_bytes():
+    """Sürecin yerleşik bellek (RSS) kullanımı; /proc yoksa None"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident * os.sysconf("SC_PAGE_SIZE")
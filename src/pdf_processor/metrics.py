@@ -0,0 +1,272 @@
+"""
+Üretim aşamalarının süre ve boyut ölçümü
+
+Her üretim (add_transparent_logos, calculate_transparent_logos, gang_sheet veya bir önizleme isteği)
+bir RunMetrics açar; aşamalar (STAGES) `with processor.stage(STAGE_BBOX) as fields:` ile ölçülür ve
+boyut bilgileri fields sözlüğüne eklenir. Her aşama ve çalışma sonu bir olay sözlüğüdür; olaylar
+`logging` ile LOGGER_NAME kaydedicisine INFO düzeyinde yayımlanır (kaydın `event` özniteliğinde).
+
+Varsayılan yapılandırmada hiçbir şey yazılmaz. enable_json_sink(path) veya METRICS_ENV ortam
+değişkeni olayları JSON satırları olarak dosyaya ekler; önizleme işçisi ve komut satırı havuzundaki
+süreçler de aynı dosyaya yazar (satırlar run kimliğiyle birleştirilir).
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import inspect
+import functools
+import contextlib
+
+from src.pdf_processor.logo_cache import source_digest
+
+LOGGER_NAME = "logo_editor.metrics"
+METRICS_ENV = "LOGO_EDITOR_METRICS"
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# Ölçülen aşamalar (hat sırasıyla)
+STAGE_SVG_INGEST = "svg_ingest"     # SVG logonun PDF'e çevrilmesi
+STAGE_OPEN = "open"                 # logo PDF'inin açılması
+STAGE_BBOX = "bbox"                 # içerik sınır kutusu
+STAGE_SVG_EXPORT = "svg_export"     # sayfa -> SVG (get_svg_image)
+STAGE_XML_CLEAN = "xml_clean"       # arka plan temizleme ve boyutlandırma
+STAGE_SVG2RLG = "svg2rlg"           # SVG -> reportlab çizimi
+STAGE_RENDER_PDF = "render_pdf"     # reportlab çizimi -> PDF
+STAGE_PLACEMENT = "placement"       # sayfaların oluşturulup logoların yerleştirilmesi
+STAGE_SAVE = "save"                 # kaydetme / PDF baytlarına çevirme
+STAGE_RASTERIZE = "rasterize"       # önizleme görüntüsü
+STAGES = (
+    STAGE_SVG_INGEST, STAGE_OPEN, STAGE_BBOX, STAGE_SVG_EXPORT, STAGE_XML_CLEAN, STAGE_SVG2RLG,
+    STAGE_RENDER_PDF, STAGE_PLACEMENT, STAGE_SAVE, STAGE_RASTERIZE,
+)
+
+
+def source_label(source):
+    """Olaylarda logoyu tanıtan kısa ad"""
+    if isinstance(source, str):
+        return os.path.basename(source)
+    if isinstance(source, (bytes, bytearray)):
+        return f"<bellek {len(source) / 1024:.0f} KB>"
+    if isinstance(source, (list, tuple)):
+        return f"{len(source)} kalem"
+    return None if source is None else type(source).__name__
+
+
+def source_size(source):
+    """PDF kaynağının (dosya yolu veya bayt) boyutu (bayt)"""
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    return os.path.getsize(source)
+
+
+def emit(event):
+    """Olayı kaydediciye gönder (dinleyen yoksa hiçbir şey yapmaz)"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(format_event(event), extra={"event": event})
+
+
+def format_event(event):
+    """Olayın okunabilir tek satırlık hâli"""
+    name = event.get("stage") or event["event"]
+    extra = " ".join(f"{key}={value}" for key, value in event.items() if key not in _BASE_FIELDS)
+    return (f"⏱ {event.get('operation') or '-'} [{event.get('logo') or '-'}] {name}: "
+            f"{event['seconds'] * 1000:.1f} ms {extra}".rstrip())
+
+
+# format_event'in ek alan olarak yazmadığı ortak alanlar
+_BASE_FIELDS = ("ts", "pid", "event", "run", "operation", "logo", "logo_digest", "stage", "seconds")
+
+
+class RunMetrics:
+    """Bir üretimin aşama olayları; with bloğu çıkışında çalışma olayı yayımlanır"""
+
+    def __init__(self, operation, source=None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.operation = operation
+        self.logo = source_label(source)
+        self.logo_digest = None
+        if isinstance(source, (str, bytes, bytearray)):
+            with contextlib.suppress(OSError):
+                self.logo_digest = source_digest(source)[:12]
+        self.fields = {}        # çalışma olayına eklenecek alanlar (ör. logo_cache)
+        self.stages = []        # aşama olayları
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.error = None
+
+    def event(self, kind, seconds, **fields):
+        return {
+            "ts": round(time.time(), 3),
+            "pid": os.getpid(),
+            "event": kind,
+            "run": self.run_id,
+            "operation": self.operation,
+            "logo": self.logo,
+            "logo_digest": self.logo_digest,
+            "seconds": round(seconds, 6),
+            **fields,
+        }
+
+    def stage(self, name, **fields):
+        return stage(self, name, **fields)
+
+    def totals(self):
+        """Aşama adı -> toplam süre (sn), ilk görülme sırasıyla"""
+        totals = {}
+        for event in self.stages:
+            totals[event["stage"]] = totals.get(event["stage"], 0) + event["seconds"]
+        return totals
+
+    def finish(self, error=None):
+        self.seconds = time.perf_counter() - self.start
+        self.error = error
+        fields = dict(self.fields, stages={key: round(value, 6) for key, value in self.totals().items()})
+        if error is not None:
+            fields["error"] = error
+        emit(self.event("run", self.seconds, **fields))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(None if exc_type is None else exc_type.__name__)
+        return False
+
+    def as_dict(self):
+        """Süreçler arası taşınabilir hâli (bkz. from_dict)"""
+        return {
+            "run": self.run_id, "operation": self.operation, "logo": self.logo,
+            "logo_digest": self.logo_digest, "seconds": self.seconds, "error": self.error,
+            "fields": self.fields, "stages": self.stages,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """as_dict çıktısından çalışmayı yeniden kur; sonraki aşamalar aynı run kimliğiyle yayımlanır"""
+        run = cls(data["operation"])
+        run.run_id = data["run"]
+        run.logo = data["logo"]
+        run.logo_digest = data["logo_digest"]
+        run.seconds = data["seconds"]
+        run.error = data["error"]
+        run.fields = dict(data["fields"])
+        run.stages = list(data["stages"])
+        return run
+
+    def report(self):
+        """Aşama dökümü (arayüz katmanı ve komut satırı için)"""
+        total = self.seconds if self.seconds is not None else time.perf_counter() - self.start
+        lines = [f"⏱ {self.logo or '-'} · {self.operation}: {total * 1000:.0f} ms"
+                 + (f" ({self.error})" if self.error else "")]
+        totals = self.totals()
+        for name, seconds in totals.items():
+            lines.append(f"  {name:<11}{seconds * 1000:9.1f} ms")
+        # Aşamalara girmeyen süre: ilk kullanımdaki kütüphane yüklemesi, önbellek, yerleşim hesabı
+        other = total - sum(seconds for name, seconds in totals.items() if name != STAGE_RASTERIZE)
+        if totals and other > 0:
+            lines.append(f"  {'diğer':<11}{other * 1000:9.1f} ms")
+        lines.extend(f"  {key}: {value}" for key, value in self.fields.items())
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def stage(run, name, **fields):
+    """Aşamayı ölç; run None ise olay yalnızca yayımlanır. Blok fields sözlüğüne boyut ekleyebilir"""
+    start = time.perf_counter()
+    error = None
+    try:
+        yield fields
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        if error is not None:
+            fields["error"] = error
+        if run is None:
+            event = {"ts": round(time.time(), 3), "pid": os.getpid(), "event": "stage", "run": None,
+                     "seconds": round(seconds, 6), "stage": name, **fields}
+        else:
+            event = run.event("stage", seconds, stage=name, **fields)
+            run.stages.append(event)
+        emit(event)
+
+
+@contextlib.contextmanager
+def measured_run(owner, operation, source=None):
+    """owner.metrics'e yeni bir çalışma bağla; owner zaten ölçülüyorsa o çalışmaya katıl
+
+    Çalışma bitince owner.last_metrics olarak kalır.
+    """
+    if owner.metrics is not None:
+        yield owner.metrics
+        return
+    run = RunMetrics(operation, source)
+    owner.metrics = run
+    try:
+        with run:
+            yield run
+    finally:
+        owner.metrics = None
+        owner.last_metrics = run
+
+
+def timed_run(source_arg="pdf_path"):
+    """Metodu bir ölçüm çalışması olarak sarmala (işlem adı metodun adı, logo source_arg argümanı)"""
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            source = signature.bind_partial(self, *args, **kwargs).arguments.get(source_arg)
+            with measured_run(self, method.__name__, source):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class JsonLinesHandler(logging.Handler):
+    """Olay taşıyan kayıtları dosyaya JSON satırı olarak ekler
+
+    Her satır tek bir yazmayla eklenir; aynı dosyaya birden fazla süreç yazabilir.
+    """
+
+    def __init__(self, path):
+        super().__init__(logging.INFO)
+        self.path = os.path.abspath(path)
+
+    def emit(self, record):
+        event = getattr(record, "event", None)
+        if event is None:
+            return
+        try:
+            line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except Exception:
+            self.handleError(record)
+
+
+def enable_json_sink(path):
+    """Olayları path'e JSON satırları olarak yaz (aynı dosya için ikinci kez eklenmez)"""
+    path = os.path.abspath(path)
+    for handler in logger.handlers:
+        if isinstance(handler, JsonLinesHandler) and handler.path == path:
+            return handler
+    directory = os.path.dirname(path)
+    if not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    handler = JsonLinesHandler(path)
+    logger.addHandler(handler)
+    if not logger.isEnabledFor(logging.INFO):
+        logger.setLevel(logging.INFO)
+    return handler
+
+
+def configure_from_env():
+    """METRICS_ENV tanımlıysa JSON satırı çıktısını aç (her süreç başında çağrılır)"""
+    path = os.environ.get(METRICS_ENV)
+    return enable_json_sink(path) if path else None
@@ -0,0 +1,31 @@
+"""
+Süreç havuzu yardımcıları
+"""
+
+import os
+import multiprocessing
+
+
+def available_cores():
+    """Sürecin kullanabileceği çekirdek sayısı"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def in_worker_process():
+    """Süreç havuzunun (veya önizleme işçisinin) içinde miyiz; öyleyse iç içe havuz kurulmaz"""
+    return multiprocessing.parent_process() is not None
+
+
+def split_range(count, parts):
+    """0..count aralığını en fazla `parts` ardışık parçaya böl"""
+    parts = max(1, min(parts, count))
+    size, extra = divmod(count, parts)
+    chunks = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(range(start, end))
+        start = end
+    return chunks
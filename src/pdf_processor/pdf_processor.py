@@ -2,25 +2,71 @@
 PDF işleme fonksiyonları modülü
 """
 
+import io
 import os
-import fitz
-import xml.etree.ElementTree as ET
-from svglib.svglib import svg2rlg
-from reportlab.graphics import renderPDF
-from reportlab.pdfgen import canvas
-from PyQt5.QtGui import QImage, QPixmap
+import logging
+import contextlib
+
+# fitz, svglib ve reportlab ağır kütüphanelerdir; ilk kullanıldıkları fonksiyonda içe aktarılır.
+# Böylece bu modül Qt olmadan ve hızlıca içe aktarılabilir (arayüzsüz işçi süreçleri için).
+from src.pdf_processor.logo_cache import LogoCache, source_digest, open_pdf, DEFAULT_CACHE_DIR
+from src.pdf_processor.bbox import BBOX_DRAWINGS
+from src.pdf_processor.layout import grid_layout, auto_page_height, segmented_layout, MAX_PAGE_HEIGHT_PT
+from src.pdf_processor.placement import LogoStamper, STAMP_RESOURCE_PREFIX
+from src.pdf_processor.layers import add_background_layer
+from src.pdf_processor.save_profiles import SAVE_FAST, save_document
+from src.pdf_processor.job_context import JobContext
+from src.pdf_processor.transform import LogoTransform, make_transform, centered_rect
+from src.pdf_processor.svg_ingest import SVG_BACKEND_AUTO, is_svg, strip_background, svg_to_pdf
+from src.pdf_processor import metrics
+from src.pdf_processor.memory import trim_mupdf_store
+from src.pdf_processor.metrics import (
+    timed_run, source_size, STAGE_SVG_INGEST, STAGE_OPEN, STAGE_BBOX, STAGE_SVG_EXPORT,
+    STAGE_XML_CLEAN, STAGE_SVG2RLG, STAGE_RENDER_PDF, STAGE_PLACEMENT, STAGE_SAVE
+)
+
+logger = logging.getLogger(__name__)
 
 # Sabitler
 CM_TO_PT = 72/2.54
+# Ara dosya adları (işin JobContext dizininde)
 TEMP_SVG_FILE = "temp.svg"
 TEMP_PDF_FILE = "temp_logo.pdf"
+TEMP_LOGO_SVG_FILE = "temp_logo.svg"
+TEMP_NATIVE_PDF_FILE = "temp_logo_native.pdf"
+TEMP_INGEST_SVG_FILE = "temp_ingest.svg"
+
+# Yerleştirme motorları
+ENGINE_SVG = "svg"          # PDF -> SVG -> svglib/reportlab -> PDF
+ENGINE_NATIVE = "native"    # Orijinal logo sayfası doğrudan show_pdf_page ile
+ENGINES = (ENGINE_SVG, ENGINE_NATIVE)
+
+# Rulo paketleyicisinin yatırdığı parçalar (saat yönünde 90°)
+GANG_ROTATION = LogoTransform(90)
+
+
+def segment_path(output_path, index, count):
+    """Ayrı dosyalara bölünmüş rulonun index. segmentinin yolu: rulo.pdf -> rulo-01.pdf, rulo-02.pdf"""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}-{index + 1:0{max(2, len(str(count)))}d}{ext}"
+
+
+class BuildCancelled(Exception):
+    """Üretim, daha yeni bir istek geldiği için yarıda bırakıldı"""
+
 
 class PDFProcessor:
-    def __init__(self):
-        """PDFProcessor sınıfını başlat"""
-        # Temp dizini yoksa oluştur
-        if not os.path.exists("temp"):
-            os.makedirs("temp")
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, in_memory=False, context=None, bbox_workers=None):
+        """PDFProcessor sınıfını başlat
+
+        in_memory=True ise ara SVG/PDF dosyaları ve logo önbelleği bellekte tutulur; diske yalnızca
+        output_path verilen çıktılar yazılır. Ara dosyalar context'in (JobContext) geçici dizinine
+        yazılır; verilmezse işlemciye ait yeni bir bağlam oluşturulur. bbox_workers çok sayfalı
+        logoların sınır taramasındaki süreç sayısıdır (havuz işçilerinde 1, bkz. bbox.document_bbox).
+        """
+        self.in_memory = in_memory
+        self.bbox_workers = bbox_workers
+        self.context = context if context is not None else JobContext()
         
         self.witdhlog = 0
         self.heightlog = 0
@@ -28,97 +74,341 @@ class PDFProcessor:
         self.pghrat = 0
         self.heighta = 0
         self.pdf_path = None
+        self.logo_rect = None
         self.bg_color = "#ffffff"
+        self.bbox_strategy = BBOX_DRAWINGS
+        self.last_layout = None
+        self.last_save = None   # son kaydedilen çıktının (boyut bayt, süre sn)
+        self.last_outputs = []  # calculate_transparent_logos'un yazdığı dosyalar (segment dosyaları)
+        self.last_document = None   # output_path verilmeden üretilen son belge (fitz.Document)
+        self.cancel_check = None    # True döndürürse üretim BuildCancelled ile durur
+        self.last_logo = None   # son yerleşimin logosu: (PDF yolu veya baytları, clip demeti veya None)
+        self.metrics = None     # süren üretimin ölçümü (metrics.RunMetrics)
+        self.last_metrics = None    # son biten üretimin aşama süreleri
+
+        # Hazırlanmış logo PDF'leri için önbellek
+        self.logo_cache = LogoCache(cache_dir, persist=not in_memory)
+
+    def stage(self, name, **fields):
+        """Üretim aşamasını ölç (bkz. metrics); süren bir üretim yoksa olay yalnızca yayımlanır"""
+        return metrics.stage(self.metrics, name, **fields)
+
+    def note(self, **fields):
+        """Süren üretimin çalışma olayına alan ekle (ör. önbellek isabeti)"""
+        if self.metrics is not None:
+            self.metrics.fields.update(fields)
     
-    def get_logo_bbox(self, pdf_path):
-        # global v
-        # v=0
-        doc = fitz.open(pdf_path)
-        x_min, y_min = float('inf'), float('inf')
-        x_max, y_max = float('-inf'), float('-inf')
-        logo_found = False
-        
-        for page in doc:
-            drawings = page.get_drawings()
-            
-            for item in drawings:
-                # item bir sözlük ise "rect" anahtarı ile erişim sağlıyoruz
-                if isinstance(item, dict) and "rect" in item:
-                    bbox = item["rect"]
-                    if not bbox.is_empty:  # Boş olmayan bir bbox kontrolü
-                        # logo_found = True
-                        x_min = min(x_min, bbox.x0)
-                        y_min = min(y_min, bbox.y0)
-                        x_max = max(x_max, bbox.x1)
-                        y_max = max(y_max, bbox.y1)
-                # v += 1
-        self.witdhlog = (x_max - x_min)/72 * 2.54
-        self.heightlog = (y_max - y_min)/72 * 2.54
-        print(f"Logo Boyutu: {self.witdhlog:.2f}cm x {self.heightlog:.2f}cm")
-        
-        doc.close()
-        
+    def get_logo_bbox(self, pdf_path, strategy=None):
+        """Logonun tüm sayfalardaki içerik sınırını (cm) hesapla; strateji verilmezse self.bbox_strategy"""
+        import fitz
+        from src.pdf_processor.bbox import document_bbox
+
+        strategy = strategy or self.bbox_strategy
+        with self.stage(STAGE_BBOX, strategy=strategy) as fields:
+            bbox = document_bbox(pdf_path, strategy, workers=self.bbox_workers)
+            if bbox is None:
+                # İçerik bulunamadı (eski davranışla aynı sonsuz değerler)
+                bbox = (float('inf'), float('inf'), float('-inf'), float('-inf'))
+            x_min, y_min, x_max, y_max = bbox
+
+            self.logo_rect = fitz.Rect(x_min, y_min, x_max, y_max)
+            self.witdhlog = (x_max - x_min)/72 * 2.54
+            self.heightlog = (y_max - y_min)/72 * 2.54
+            fields.update(width_cm=round(self.witdhlog, 2), height_cm=round(self.heightlog, 2))
+
         return self.witdhlog, self.heightlog
 
     def process_svg(self, svg_content, logo_width_cm, logo_height_cm):
-        """SVG içeriğini işle"""
-        root = ET.fromstring(svg_content)
-        ns = {'svg': 'http://www.w3.org/2000/svg'}
-        
-        # Arkaplanı temizle
-        for rect in root.findall('.//svg:rect', ns):
-            if rect.get('width') == "100%" or rect.get('fill') == "#ffffff":
-                root.remove(rect)
-        
-        # SVG boyutlarını ayarla
-        root.set('width', f'{logo_width_cm}cm')
-        root.set('height', f'{logo_height_cm}cm')
-        
-        return ET.tostring(root, encoding='unicode')
+        """SVG içeriğini işle: arkaplanı temizle ve boyutları ayarla (ağaç kurmadan, akış hâlinde)"""
+        cleaned = io.BytesIO()
+        strip_background(io.BytesIO(svg_content.encode("utf-8")), cleaned,
+                         width=f'{logo_width_cm}cm', height=f'{logo_height_cm}cm')
+        return cleaned.getvalue().decode("utf-8")
+
+    def ingest_svg(self, svg_path, backend=SVG_BACKEND_AUTO, remove_bg=True):
+        """SVG logoyu PDF'e çevir (sonuç önbellekte); dönüş PDF baytları
+
+        Dosya akış hâlinde temizlenir, okuyucu boyuta göre seçilir (bkz. svg_ingest).
+        """
+        key = self.logo_cache.make_key(source_digest(svg_path), "svg-ingest", backend, int(remove_bg))
+        cached = self.logo_cache.get(key)
+        if cached is not None:
+            if not isinstance(cached[0], str):
+                return cached[0]
+            try:
+                # Baytlar döndürülür: iş sürerken başka bir süreç kaydı silse de logo kullanılabilir
+                with open(cached[0], "rb") as f:
+                    return f.read()
+            except OSError:
+                pass    # bu arada silinmiş: yeniden içe aktarılır
+
+        with self.stage(STAGE_SVG_INGEST, svg_bytes=os.path.getsize(svg_path)) as fields:
+            if self.in_memory:
+                cleaned = io.BytesIO()
+                removed = strip_background(svg_path, cleaned, remove_bg=remove_bg)
+                cleaned = cleaned.getvalue()
+            else:
+                cleaned = self.context.path(TEMP_INGEST_SVG_FILE)
+                removed = strip_background(svg_path, cleaned, remove_bg=remove_bg)
+            self.check_cancelled()
+            pdf_bytes, used = svg_to_pdf(cleaned, backend)
+            fields.update(backend=used, pdf_bytes=len(pdf_bytes), removed=removed)
+        self.logo_cache.put(key, pdf_bytes, {"backend": used, "removed": removed})
+        return pdf_bytes
+
+    def logo_source(self, path, svg_backend=SVG_BACKEND_AUTO):
+        """Yerleştirilecek logo PDF'i: SVG dosyaları önce içe aktarılır"""
+        return self.ingest_svg(path, svg_backend) if is_svg(path) else path
 
     def convert_svg_to_pdf(self, svg_content, logo_width_pt, logo_height_pt):
         """SVG'yi PDF'e dönüştür"""
+        from svglib.svglib import svg2rlg
+        from reportlab.graphics import renderPDF
         # SVG'yi kaydet
-        with open(TEMP_SVG_FILE, "w") as f:
+        temp_svg = self.context.path(TEMP_SVG_FILE)
+        with open(temp_svg, "w") as f:
             f.write(svg_content)
         
         # PDF'e dönüştür
-        drawing = svg2rlg(TEMP_SVG_FILE)
+        drawing = svg2rlg(temp_svg)
         drawing.width = logo_width_pt
         drawing.height = logo_height_pt
-        renderPDF.drawToFile(drawing, TEMP_PDF_FILE)
+        temp_pdf = self.context.path(TEMP_PDF_FILE)
+        renderPDF.drawToFile(drawing, temp_pdf)
         
-        return TEMP_PDF_FILE
+        return temp_pdf
 
-    def rotate_pdf(self, pdf_path, angle):
-        """PDF'i döndür ve temp dosyasını geri döndür"""
-        temp_rotated_path = "temp_rotated_90.pdf"
-        
-        try:
-            # Orijinal dosyayı kopyala
-            doc = fitz.open(pdf_path)
+    def prepare_logo(self, pdf_path, logo_width_cm, logo_height_cm, scale_to_bbox=True):
+        """Logoyu arkaplansız, hedef boyutta PDF'e dönüştür; aynı logo ve boyut için önbelleği kullan
+
+        scale_to_bbox=True ise sayfa, çizim alanı istenen boyuta gelecek şekilde büyütülür.
+        Dönüş: (hazır logo PDF yolu veya baytları, yerleşim genişliği pt, yerleşim yüksekliği pt)
+        """
+        key = self.logo_cache.make_key(
+            source_digest(pdf_path), "svg", int(scale_to_bbox),
+            float(logo_width_cm), float(logo_height_cm)
+        )
+        cached = self.logo_cache.get(key)
+        self.note(logo_cache="hit" if cached is not None else "miss")
+        if cached is not None:
+            cached_pdf, meta = cached
+            self.witdhlog = meta["witdhlog"]
+            self.heightlog = meta["heightlog"]
+            self.pgwrat = meta["pgwrat"]
+            self.pghrat = meta["pghrat"]
+            return cached_pdf, meta["logo_width_pt"], meta["logo_height_pt"]
+
+        from svglib.svglib import svg2rlg
+        from reportlab.graphics import renderPDF
+
+        logo_width_pt = logo_width_cm * CM_TO_PT
+        logo_height_pt = logo_height_cm * CM_TO_PT
+
+        # SVG'yi arkaplansız olarak çekme
+        with self.stage(STAGE_OPEN, bytes=source_size(pdf_path)) as fields:
+            doc = open_pdf(pdf_path)
+            fields["pages"] = doc.page_count
+        with doc:
             page = doc[0]
-            
-            # Yeni döndürülmüş PDF oluştur
-            rotated_doc = fitz.open()
-            rotated_page = rotated_doc.new_page(width=page.rect.height, height=page.rect.width)
-            
-            # Döndürme matrisi oluştur
-            matrix = fitz.Matrix(0, -1, 1, 0, 0, page.rect.width)  # 90 derece saat yönünde döndürme
-            
-            # Orijinal sayfayı döndürülmüş sayfaya çiz
-            rotated_page.show_pdf_page(rotated_page.rect, doc, 0, matrix=matrix)
-            
-            # Yeni dosyayı kaydet
-            rotated_doc.save(temp_rotated_path)
-            rotated_doc.close()
-            doc.close()
-            
-            return temp_rotated_path
-        except Exception as e:
-            print(f"PDF döndürme hatası: {str(e)}")
-            return pdf_path
+            pgwidth, pgheight = page.mediabox.width, page.mediabox.height
+            pgwidth = (pgwidth / 72) * 2.54
+            pgheight = (pgheight / 72) * 2.54
+            self.get_logo_bbox(pdf_path=pdf_path)
+            self.pgwrat = pgwidth / self.witdhlog
+            self.pghrat = pgheight / self.heightlog
+            with self.stage(STAGE_SVG_EXPORT) as fields:
+                svg_content = page.get_svg_image()
+                fields["chars"] = len(svg_content)
+        self.check_cancelled()
+
+        if scale_to_bbox:
+            logo_width_cm = self.pgwrat * logo_width_cm
+            logo_height_cm = self.pghrat * logo_height_cm
+            logo_width_pt = self.pgwrat * logo_width_pt
+            logo_height_pt = self.pghrat * logo_height_pt
+
+        # Arkaplanı temizle ve SVG'nin genişlik ve yüksekliğini KULLANICI GİRİŞİNE göre ayarla
+        with self.stage(STAGE_XML_CLEAN) as fields:
+            cleaned_svg = self.process_svg(svg_content, logo_width_cm, logo_height_cm)
+            fields["chars"] = len(cleaned_svg)
+
+        with self.stage(STAGE_SVG2RLG):
+            if self.in_memory:
+                drawing = svg2rlg(io.BytesIO(cleaned_svg.encode("utf-8")))
+            else:
+                # Geçici SVG dosyasını kaydetme
+                temp_svg = self.context.path(TEMP_LOGO_SVG_FILE)
+                with open(temp_svg, "w") as f:
+                    f.write(cleaned_svg)
+                drawing = svg2rlg(temp_svg)
+
+        self.check_cancelled()
+
+        # SVG'yi PDF'ye dönüştürürken BOYUTLARI ZORLA
+        drawing.width = logo_width_pt
+        drawing.height = logo_height_pt
+        with self.stage(STAGE_RENDER_PDF) as fields:
+            if self.in_memory:
+                temp_pdf = renderPDF.drawToString(drawing)
+            else:
+                temp_pdf = self.context.path(TEMP_PDF_FILE)
+                renderPDF.drawToFile(drawing, temp_pdf)
+            fields["bytes"] = source_size(temp_pdf)
+
+        meta = {
+            "witdhlog": self.witdhlog,
+            "heightlog": self.heightlog,
+            "pgwrat": self.pgwrat,
+            "pghrat": self.pghrat,
+            "logo_width_pt": logo_width_pt,
+            "logo_height_pt": logo_height_pt,
+        }
+        cached_pdf = self.logo_cache.put(key, temp_pdf, meta)
+        return cached_pdf, logo_width_pt, logo_height_pt
+
+    def clean_native_logo(self, pdf_path):
+        """Sayfayı kaplayan beyaz arkaplanı silinmiş logo (önbellekte); dönüş (PDF yolu/baytları, meta)"""
+        import fitz
+        from src.pdf_processor.background import remove_background
+
+        key = self.logo_cache.make_key(source_digest(pdf_path), ENGINE_NATIVE, "bg")
+        cached = self.logo_cache.get(key)
+        self.note(logo_cache="hit" if cached is not None else "miss")
+        if cached is None:
+            with self.stage(STAGE_OPEN, bytes=source_size(pdf_path)):
+                doc = open_pdf(pdf_path)
+            with doc, self.stage(STAGE_XML_CLEAN) as fields:
+                fields["removed"] = remove_background(doc)
+                if self.in_memory:
+                    cleaned_pdf = doc.tobytes()
+                else:
+                    cleaned_pdf = self.context.path(TEMP_NATIVE_PDF_FILE)
+                    doc.save(cleaned_pdf)
+            self.get_logo_bbox(cleaned_pdf)
+            meta = {
+                "witdhlog": self.witdhlog,
+                "heightlog": self.heightlog,
+                "logo_rect": list(self.logo_rect),
+            }
+            cached_pdf = self.logo_cache.put(key, cleaned_pdf, meta)
+        else:
+            cached_pdf, meta = cached
+            self.witdhlog = meta["witdhlog"]
+            self.heightlog = meta["heightlog"]
+            self.logo_rect = fitz.Rect(meta["logo_rect"])
+        return cached_pdf, meta
+
+    def _open_prepared(self, prepare):
+        """prepare() ile hazırlanan (kaynak, ...) sonucunu ve kaynağın fitz belgesini döndür
+
+        Önbellek dosyası açılmadan önce başka bir süreç tarafından silinmişse bir kez yeniden hazırlanır
+        (LogoCache.get silinmiş kaydı ıska sayar).
+        """
+        prepared = prepare()
+        try:
+            return prepared, open_pdf(prepared[0])
+        except FileNotFoundError:
+            prepared = prepare()
+            return prepared, open_pdf(prepared[0])
+
+    def prepare_native_logo(self, pdf_path, remove_bg=True):
+        """Logoyu SVG'ye çevirmeden yerleştirmek için (logo belgesi, kırpma alanı) hazırla
+
+        remove_bg=True ise sayfayı kaplayan beyaz arkaplan dikdörtgenleri içerikten silinir.
+        Kırpma alanı get_logo_bbox sonucudur; çizim bulunamazsa sayfanın tamamı kullanılır.
+        """
+        if remove_bg:
+            (source, _), logo_doc = self._open_prepared(lambda: self.clean_native_logo(pdf_path))
+        else:
+            self.get_logo_bbox(pdf_path)
+            source = pdf_path
+            logo_doc = open_pdf(source)
+
+        clip = self.logo_rect
+        if clip is None or clip.is_empty or clip.is_infinite:
+            clip = logo_doc[0].rect
+        self.last_logo = (source, tuple(clip))
+        return logo_doc, clip
+
+    def open_placement_logo(self, pdf_path, logo_width_cm, logo_height_cm, scale_to_bbox,
+                            engine=ENGINE_SVG, remove_bg=True):
+        """Seçilen motora göre (logo belgesi, kırpma alanı, genişlik pt, yükseklik pt) döndür"""
+        if engine == ENGINE_SVG:
+            (temp_pdf, logo_width_pt, logo_height_pt), logo_doc = self._open_prepared(
+                lambda: self.prepare_logo(pdf_path, logo_width_cm, logo_height_cm,
+                                          scale_to_bbox=scale_to_bbox)
+            )
+            self.last_logo = (temp_pdf, None)
+            return logo_doc, None, logo_width_pt, logo_height_pt
+        if engine == ENGINE_NATIVE:
+            # Kırpma alanı tam olarak istenen boyuta yerleştirilir
+            logo_doc, clip = self.prepare_native_logo(pdf_path, remove_bg=remove_bg)
+            return logo_doc, clip, logo_width_cm * CM_TO_PT, logo_height_cm * CM_TO_PT
+        raise ValueError(f"Bilinmeyen yerleştirme motoru: {engine}")
+
+    def placement_size(self, pdf_path, logo_width_cm, logo_height_cm, scale_to_bbox,
+                       engine=ENGINE_SVG):
+        """Logonun sayfadaki yerleşim boyutu (pt) - logoyu hazırlamadan, yalnızca sınır kutusundan"""
+        logo_width_pt = logo_width_cm * CM_TO_PT
+        logo_height_pt = logo_height_cm * CM_TO_PT
+        if engine == ENGINE_SVG and scale_to_bbox:
+            with open_pdf(pdf_path) as doc:
+                mediabox = doc[0].mediabox
+            self.get_logo_bbox(pdf_path)
+            logo_width_pt *= (mediabox.width / 72 * 2.54) / self.witdhlog
+            logo_height_pt *= (mediabox.height / 72 * 2.54) / self.heightlog
+        return logo_width_pt, logo_height_pt
+
+    def plan_layout(
+        self,
+        pdf_path,
+        logo_width_cm=10,
+        logo_height_cm=10,
+        spacing_cm=3,
+        spacingy_cm=3,
+        page_width_cm=58,
+        page_height_cm=None,
+        pagexcm=2,
+        pagexrcm=2,
+        pageycm=2,
+        total_logo=12,
+        engine=ENGINE_SVG,
+        paginate=False,
+        rotation=0,
+        mirror_x=False,
+        mirror_y=False,
+    ):
+        """PDF oluşturmadan yerleşimi hesapla (page_height_cm=None ise otomatik sayfa boyu)
+
+        add_transparent_logos / calculate_transparent_logos ile aynı dikdörtgenleri döndürür.
+        """
+        auto_height = page_height_cm is None
+        transform = make_transform(rotation, mirror_x, mirror_y)
+        logo_width_pt, logo_height_pt = self.placement_size(
+            pdf_path, logo_width_cm, logo_height_cm, scale_to_bbox=not auto_height, engine=engine
+        )
+        page_width_pt = page_width_cm * CM_TO_PT
+        spacing_pt = spacing_cm * CM_TO_PT
+        spacingy_pt = spacingy_cm * CM_TO_PT
+        page_margin_x_pt = pagexcm * CM_TO_PT
+        page_margin_xr_pt = pagexrcm * CM_TO_PT
+        page_margin_y_pt = pageycm * CM_TO_PT
+
+        if auto_height:
+            page_height_pt = auto_page_height(
+                page_width_pt, logo_width_pt, logo_height_pt, spacing_pt, spacingy_pt,
+                page_margin_x_pt, page_margin_xr_pt, page_margin_y_pt, total_logo, transform
+            )
+        else:
+            page_height_pt = page_height_cm * CM_TO_PT
 
+        return grid_layout(
+            page_width_pt, page_height_pt, logo_width_pt, logo_height_pt,
+            spacing_pt, spacingy_pt, page_margin_x_pt, page_margin_xr_pt, page_margin_y_pt,
+            total_logo, paginate=paginate and not auto_height, transform=transform
+        )
+
+    @timed_run()
     def add_transparent_logos(
         self,
         pdf_path,
@@ -134,8 +424,21 @@ class PDFProcessor:
         pageycm=2,
         total_logo=12,
         arkaplan=False,
-        bg_color="#ffffff"
+        bg_color="#ffffff",
+        engine=ENGINE_SVG,
+        remove_bg=True,
+        paginate=False,
+        save_profile=SAVE_FAST,
+        layered=False,
+        rotation=0,
+        mirror_x=False,
+        mirror_y=False,
     ):
+        """Logoları sabit boyutlu sayfaya yerleştir; paginate=True ise sığmayanlar yeni sayfalara geçer
+
+        layered=True ise arka plan ayrı bir katmanda tutulur (bkz. layers.set_background).
+        rotation (saat yönünde derece) ve mirror_x/mirror_y yerleşimde uygulanır (bkz. transform).
+        """
         # CM'yi Point'e çevirme (1 cm = CM_TO_PT pt)
         page_width_pt = page_width_cm * CM_TO_PT
         page_height_pt = page_height_cm * CM_TO_PT
@@ -147,108 +450,208 @@ class PDFProcessor:
         page_margin_xr_pt = pagexrcm * CM_TO_PT
         page_margin_y_pt = pageycm * CM_TO_PT
 
-        # SVG'yi arkaplansız olarak çekme ve BOYUTLANDIRMA
-        doc = fitz.open(pdf_path)
-        page = doc[0]
-        pgwidth, pgheight = page.mediabox.width, page.mediabox.height
-        pgwidth = (pgwidth / 72) * 2.54 
-        pgheight = (pgheight / 72) * 2.54 
-        self.get_logo_bbox(pdf_path=pdf_path)
-        self.pgwrat = pgwidth / self.witdhlog
-        self.pghrat = pgheight / self.heightlog
-        svg_content = page.get_svg_image()
-
-        # SVG'yi parse et ve boyutları değiştir
-        root = ET.fromstring(svg_content)
-        ns = {'svg': 'http://www.w3.org/2000/svg'}
-        
-        # 1. Orijinal SVG boyutunu al (varsayılan olarak 100% veya px)
-        original_width = root.get('width', '100%')
-        original_height = root.get('height', '100%')
-        
-        # 2. Arkaplanı temizle
-        for rect in root.findall('.//svg:rect', ns):
-            if rect.get('width') == "100%" or rect.get('fill') == "#ffffff":
-                root.remove(rect)
-        logo_width_cm = self.pgwrat * logo_width_cm
-        logo_height_cm = self.pghrat * logo_height_cm
-        logo_height_pt = self.pghrat * logo_height_pt
-        logo_width_pt = self.pgwrat * logo_width_pt
-        
-        # 3. SVG'nin genişlik ve yüksekliğini KULLANICI GİRİŞİNE göre ayarla
-        root.set('width', f'{logo_width_cm}cm')  # Önemli: SVG'yi cm cinsinden yeniden boyutlandır
-        root.set('height', f'{logo_height_cm}cm')
-        # root.set('viewBox', f'0 0 {original_width} {original_height}')  # Orijinal içeriği koru
-        
-        cleaned_svg = ET.tostring(root, encoding='unicode')        # Geçici SVG dosyasını kaydetme
-        temp_svg = "temp_logo.svg"
-        with open(temp_svg, "w") as f:
-            f.write(cleaned_svg)
+        # Logoyu arkaplansız ve BOYUTLANDIRILMIŞ olarak hazırla (önbellekten)
+        logo_pdf, clip, logo_width_pt, logo_height_pt = self.open_placement_logo(
+            pdf_path, logo_width_cm, logo_height_cm, scale_to_bbox=True,
+            engine=engine, remove_bg=remove_bg
+        )
 
-        # SVG'yi PDF'ye dönüştürürken BOYUTLARI ZORLA
-        temp_pdf = "temp_logo.pdf"
-        drawing = svg2rlg(temp_svg)
-        
-        # PDF sayfa boyutunu logo boyutlarına ayarla
-        drawing.width = logo_width_pt
-        drawing.height = logo_height_pt
-        renderPDF.drawToFile(drawing, temp_pdf)
+        with logo_pdf:
+            background_color = None
+            if arkaplan:
+                background_color = self.hex_to_rgb(bg_color)
+
+            # Hesaplamalar: tüm yerleşim dikdörtgenleri tek seferde
+            layout = grid_layout(
+                page_width_pt, page_height_pt, logo_width_pt, logo_height_pt,
+                spacing_pt, spacingy_pt, page_margin_x_pt, page_margin_xr_pt, page_margin_y_pt,
+                total_logo, paginate=paginate, transform=make_transform(rotation, mirror_x, mirror_y)
+            )
+            self.last_layout = layout
+            if layout.overflow:
+                logger.warning("%d logonun yalnızca %d tanesi sayfaya sığdı", layout.requested, layout.placed)
+            if layout.page_count > 1:
+                logger.info("%d logo %d sayfaya yerleştirildi", layout.placed, layout.page_count)
+
+            # Logo yerleştirme (PDF'yi ÖLÇEKLENDİRMEDEN, artık boyutlar eşleşiyor)
+            with self.new_output() as new_doc:
+                self.stamp_layout(new_doc, layout, logo_pdf, clip, background_color, layered)
+                self.finish_document(new_doc, output_path, save_profile)
 
-        # Yeni PDF oluşturma
-        new_doc = fitz.open()
-        
-        new_page = new_doc.new_page(width=page_width_pt, height=page_height_pt)
-        if arkaplan:
-            print(self.hex_to_rgb(bg_color))
-            background_color = self.hex_to_rgb(bg_color)
-            new_page.draw_rect(new_page.rect, color=None, fill=background_color, overlay=False)
-
-        # Hesaplamalar
-        logos_per_row = int(
-            (page_width_pt - page_margin_x_pt - page_margin_xr_pt + spacing_pt)
-            / (logo_width_pt + spacing_pt)
-        )
-        x_offset = page_margin_x_pt
-        y_offset = page_margin_y_pt
-        logo_count = 0
-
-        # Logo yerleştirme
-        with fitz.open(temp_pdf) as logo_pdf:
-            logo_page = logo_pdf[0]
-            
-            while logo_count < total_logo:
-                rect = fitz.Rect(
-                    x_offset,
-                    y_offset,
-                    x_offset + logo_width_pt,
-                    y_offset + logo_height_pt,
-                )
-                # PDF'yi ÖLÇEKLENDİRMEDEN yerleştir (artık boyutlar eşleşiyor)
-                new_page.show_pdf_page(rect, logo_pdf, 0)
-                
-                logo_count += 1
-                x_offset += logo_width_pt + spacing_pt
-                
-                if logo_count % logos_per_row == 0:
-                    x_offset = page_margin_x_pt
-                    y_offset += logo_height_pt + spacingy_pt
-                
-                if y_offset + logo_height_pt > page_height_pt - page_margin_y_pt:
-                    break
-
-        new_doc.save(output_path)
-        print(f"✅ Transparan logolu PDF kaydedildi: {output_path}")
-        
-        # Temizlik
-        # os.remove(temp_svg)
         return page_height_pt
     
+    def check_cancelled(self):
+        """cancel_check iptal istiyorsa BuildCancelled yükselt"""
+        if self.cancel_check is not None and self.cancel_check():
+            raise BuildCancelled()
+
+    @contextlib.contextmanager
+    def new_output(self):
+        """Boş çıktı belgesi; üretim yarıda kalırsa (hata, iptal) hemen kapatılır
+
+        Başarılı üretimde belge finish_document'a devredilir.
+        """
+        import fitz
+
+        doc = fitz.open()
+        try:
+            yield doc
+        except BaseException:
+            if not doc.is_closed:
+                doc.close()
+            raise
+
+    def finish_document(self, doc, output_path, save_profile=SAVE_FAST):
+        """Belgeyi kaydedip kapat; output_path None ise kaydetmeden self.last_document olarak bırak
+
+        Alınmamış (take_document) önceki belge kapatılır. Ardından MuPDF deposu bütçeye indirilir.
+        """
+        self.release_document()
+        if output_path is None:
+            self.last_save = None
+            self.last_document = doc
+        else:
+            try:
+                with self.stage(STAGE_SAVE, profile=save_profile) as fields:
+                    self.last_save = save_document(doc, output_path, save_profile)
+                    fields.update(bytes=self.last_save[0], output=os.path.basename(output_path))
+            finally:
+                doc.close()
+        trim_mupdf_store()
+
+    def take_document(self):
+        """Son üretilen belgeyi devral (kapatmak çağıranın işidir)"""
+        doc, self.last_document = self.last_document, None
+        return doc
+
+    def release_document(self):
+        """Devralınmamış son belgeyi kapat"""
+        doc = self.take_document()
+        if doc is not None:
+            doc.close()
+
+    def stamp_layout(self, doc, layout, logo_pdf, clip=None, background_color=None, layered=False):
+        """Yerleşimin sayfalarını oluştur ve logoyu paylaşılan tek bir Form XObject ile yerleştir
+
+        Sayfalar sırayla oluşturulur; logo belgeye bir kez gömülür, her sayfa yalnızca ona başvurur.
+        layered=True ise her sayfaya (renk yoksa boş) bir arka plan katmanı eklenir.
+        Yerleşimin dönüşümü (layout.transform) her hücrenin ortasında matrisle uygulanır.
+        """
+        with self.stage(STAGE_PLACEMENT, placed=layout.placed, pages=layout.page_count):
+            stamper = LogoStamper(doc, logo_pdf, clip=clip, keep_proportion=clip is None)
+            for pno, rects in layout.pages():
+                self.check_cancelled()
+                page = self.new_sheet_page(doc, layout.page_width_pt, layout.page_height(pno),
+                                           background_color, layered)
+                stamper.stamp(page, layout.logo_rects(rects), layout.transform)
+
+    def new_sheet_page(self, doc, width_pt, height_pt, background_color=None, layered=False):
+        """Arka planı (veya katmanlıysa arka plan katmanı) çizilmiş yeni bir sayfa ekle"""
+        page = doc.new_page(width=width_pt, height=height_pt)
+        if layered:
+            add_background_layer(doc, page, background_color)
+        elif background_color is not None:
+            page.draw_rect(page.rect, color=None, fill=background_color, overlay=False)
+        return page
+
+    @timed_run(source_arg="items")
+    def gang_sheet(
+        self,
+        items,
+        output_path,
+        page_width_cm=58,
+        spacing_cm=1,
+        spacingy_cm=1,
+        pagexcm=2,
+        pagexrcm=2,
+        pageycm=2,
+        arkaplan=False,
+        bg_color="#ffffff",
+        remove_bg=True,
+        save_profile=SAVE_FAST,
+        layered=False,
+        svg_backend=SVG_BACKEND_AUTO,
+    ):
+        """Farklı logoları (GangItem listesi) tek bir ruloya paketleyerek yerleştir
+
+        Logolar native motorla sınır kutularına kırpılarak yerleşir; her farklı logo belgeye bir kez
+        gömülür, boyutu ve döndürmesi ne olursa olsun tüm yerleşimler onu kullanır. SVG logolar
+        önce svg_backend ile içe aktarılır.
+        Rulo boyu paketlemeden hesaplanır; dönüş sayfa yüksekliği (pt).
+        """
+        from src.pdf_processor.gang import gang_layout
+
+        # Her farklı logo (içeriğe göre) bir kez hazırlanır
+        logos = {}  # içerik özeti -> (logo belgesi, kırpma alanı)
+        keys = []
+        try:
+            for item in items:
+                source = self.logo_source(item.logo, svg_backend)
+                key = source_digest(source)
+                if key not in logos:
+                    self.check_cancelled()
+                    logos[key] = self.prepare_native_logo(source, remove_bg=remove_bg)
+                keys.append(key)
+
+            sizes = []
+            for item, key in zip(items, keys):
+                clip = logos[key][1]
+                width_cm, height_cm = item.resolved_size(clip.width / CM_TO_PT, clip.height / CM_TO_PT)
+                sizes.append((width_cm * CM_TO_PT, height_cm * CM_TO_PT))
+
+            layout = gang_layout(
+                sizes, [item.quantity for item in items], [item.rotate for item in items],
+                page_width_cm * CM_TO_PT, spacing_cm * CM_TO_PT, spacingy_cm * CM_TO_PT,
+                pagexcm * CM_TO_PT, pagexrcm * CM_TO_PT, pageycm * CM_TO_PT
+            )
+            self.last_layout = layout
+            self.heighta = layout.page_height_pt
+            logger.info("%d logo (%d farklı) %.1f cm ruloya yerleştirildi, doluluk %%%.1f",
+                        layout.placed, len(logos), layout.page_height_pt / CM_TO_PT,
+                        layout.utilization * 100)
+
+            # Yerleşimler logo ve döndürmeye göre gruplanır; her grup tek içerik akışıyla basılır.
+            # Döndürülen parçanın logosu, yatık hücrenin ortasında döndürülmemiş boyutuyla verilir.
+            groups = {}
+            for item, rect, rotated in zip(layout.items, layout.rects, layout.rotated):
+                if rotated:
+                    x0, y0, x1, y1 = rect
+                    rect = centered_rect(rect, y1 - y0, x1 - x0)
+                groups.setdefault((keys[item], rotated), []).append(rect)
+
+            background_color = self.hex_to_rgb(bg_color) if arkaplan else None
+            with self.new_output() as new_doc, \
+                    self.stage(STAGE_PLACEMENT, placed=layout.placed, pages=1, logos=len(logos)):
+                page = self.new_sheet_page(new_doc, layout.page_width_pt, layout.page_height_pt,
+                                           background_color, layered)
+                for n, key in enumerate(logos):
+                    self.check_cancelled()
+                    logo_doc, clip = logos[key]
+                    stamper = LogoStamper(new_doc, logo_doc, clip=clip, keep_proportion=False,
+                                          name=f"{STAMP_RESOURCE_PREFIX}{n}")
+                    stamper.stamp(page, groups.get((key, False), []))
+                    stamper.stamp(page, groups.get((key, True), []), GANG_ROTATION)
+        finally:
+            for logo_doc, _ in logos.values():
+                logo_doc.close()
+
+        self.finish_document(new_doc, output_path, save_profile)
+        return layout.page_height_pt
+
+    def place_logo(self, page, rect, logo_pdf, clip=None):
+        """Logo sayfasını hedef dikdörtgene yerleştir (clip verilirse yalnızca o alan, tam dolduracak şekilde)"""
+        if clip is None:
+            page.show_pdf_page(rect, logo_pdf, 0)
+        else:
+            page.show_pdf_page(rect, logo_pdf, 0, clip=clip, keep_proportion=False)
+
     def hex_to_rgb(self, value):
         """Hex rengi RGB değerlerine dönüştür (0-1 aralığında)"""
         value = value.lstrip('#')
         lv = len(value)
         return tuple(int(value[i:i + lv // 3], 16)/255 for i in range(0, lv, lv // 3))
 
+    @timed_run()
     def calculate_transparent_logos(
         self,
         pdf_path,
@@ -262,7 +665,24 @@ class PDFProcessor:
         pagexrcm=2,
         pageycm=2,
         total_logo=12,
+        engine=ENGINE_SVG,
+        remove_bg=True,
+        save_profile=SAVE_FAST,
+        layered=False,
+        rotation=0,
+        mirror_x=False,
+        mirror_y=False,
+        max_length_cm=None,
+        segment_files=False,
     ):
+        """Logoları, hepsinin sığacağı yükseklikte tek sayfaya yerleştir (otomatik sayfa boyu)
+
+        max_length_cm verilir ve sayfa ondan uzun olursa rulo tam satırlardan bölünerek ardışık
+        sayfalara (segment_files=True ise segment_path adlı ayrı dosyalara, her biri üretilip
+        kaydedildikten sonra kapatılarak) yazılır. Dönüş ilk sayfanın yüksekliği (pt).
+        """
+        transform = make_transform(rotation, mirror_x, mirror_y)
+
         # CM'yi Point'e çevirme (1 cm = CM_TO_PT pt)
         page_width_pt = page_width_cm * CM_TO_PT
         logo_width_pt = logo_width_cm * CM_TO_PT  # Kullanıcıdan alınan logo genişliği
@@ -273,92 +693,61 @@ class PDFProcessor:
         page_margin_xr_pt = pagexrcm * CM_TO_PT
         page_margin_y_pt = pageycm * CM_TO_PT
 
-        # SVG'yi işleme ve BOYUTLANDIRMA
-        doc = fitz.open(pdf_path)
-        page = doc[0]
-        pgwidth, pgheight = page.mediabox.width, page.mediabox.height
-        pgwidth = (pgwidth / 72) * 2.54 
-        pgheight = (pgheight / 72) * 2.54 
-        self.get_logo_bbox(pdf_path=pdf_path)
-        self.pgwrat = pgwidth / self.witdhlog
-        self.pghrat = pgheight / self.heightlog
-        svg_content = page.get_svg_image()
-
-        # SVG'yi parse et ve boyutları ayarla
-        root = ET.fromstring(svg_content)
-        ns = {'svg': 'http://www.w3.org/2000/svg'}
-        
-        # 1. Arkaplanı temizle
-        for rect in root.findall('.//svg:rect', ns):
-            if rect.get('width') == "100%" or rect.get('fill') == "#ffffff":
-                root.remove(rect)
-        logo_width_cm2 = self.pgwrat * logo_width_cm
-        logo_height_cm2 = self.pghrat * logo_height_cm
-        logo_height_pt2 = self.pghrat * logo_height_pt
-        logo_width_pt2 = self.pgwrat * logo_width_pt
-        # 2. SVG boyutlarını KULLANICI GİRİŞİNE göre zorla (kritik düzeltme!)
-        root.set('width', f'{logo_width_cm}cm')
-        root.set('height', f'{logo_height_cm}cm')
-        cleaned_svg = ET.tostring(root, encoding='unicode')
-
-        # Geçici SVG dosyasını kaydetme
-        temp_svg = "temp_logo.svg"
-        with open(temp_svg, "w") as f:
-            f.write(cleaned_svg)
-
-        # SVG'yi PDF'ye dönüştürürken BOYUT ZORLAMA (kritik düzeltme!)
-        temp_pdf = "temp_logo.pdf"
-        drawing = svg2rlg(temp_svg)
-        drawing.width = logo_width_pt  # PDF boyutunu kullanıcı girdisine ayarla
-        drawing.height = logo_height_pt
-        renderPDF.drawToFile(drawing, temp_pdf)
-        print(page_width_pt)
-        
-        # Dinamik sayfa yüksekliği hesaplama
-        print(
-            (page_width_pt - page_margin_x_pt - page_margin_xr_pt + spacing_pt)
-            / (logo_width_pt + spacing_pt)
+        # Logoyu arkaplansız ve BOYUTLANDIRILMIŞ olarak hazırla (önbellekten)
+        logo_pdf, clip, logo_width_pt, logo_height_pt = self.open_placement_logo(
+            pdf_path, logo_width_cm, logo_height_cm, scale_to_bbox=False,
+            engine=engine, remove_bg=remove_bg
         )
-        logos_per_row = int(
-            (page_width_pt - page_margin_x_pt - page_margin_xr_pt + spacing_pt)
-            / (logo_width_pt + spacing_pt)
-        )
-        y = int(total_logo / logos_per_row) + 1
-        page_height_pt = page_margin_y_pt + y * logo_height_pt + (y - 1) * spacingy_pt + 50
-        print(page_height_pt/CM_TO_PT)
-        self.heighta = page_height_pt
-        
-        # Yeni PDF oluşturma
-        new_doc = fitz.open()
-        new_page = new_doc.new_page(width=page_width_pt, height=page_height_pt)
-
-        # Logo yerleştirme
-        x_offset = page_margin_x_pt
-        y_offset = page_margin_y_pt
-        logo_count = 0
-
-        with fitz.open(temp_pdf) as logo_pdf:
-            while logo_count < total_logo:
-                rect = fitz.Rect(
-                    x_offset,
-                    y_offset,
-                    x_offset + logo_width_pt,
-                    y_offset + logo_height_pt,
-                )
-                new_page.show_pdf_page(rect, logo_pdf, 0)
-
-                logo_count += 1
-                x_offset += logo_width_pt + spacing_pt
 
-                if logo_count % logos_per_row == 0:
-                    x_offset = page_margin_x_pt
-                    y_offset += logo_height_pt + spacingy_pt
+        with logo_pdf:
+            # Dinamik sayfa yüksekliği hesaplama
+            page_height_pt = auto_page_height(
+                page_width_pt, logo_width_pt, logo_height_pt, spacing_pt, spacingy_pt,
+                page_margin_x_pt, page_margin_xr_pt, page_margin_y_pt, total_logo, transform
+            )
+            self.heighta = page_height_pt
 
-                if y_offset + logo_height_pt > page_height_pt - page_margin_y_pt:
-                    break
+            # Logo yerleştirme
+            max_length_pt = max_length_cm * CM_TO_PT if max_length_cm else None
+            if max_length_pt is not None and page_height_pt > max_length_pt:
+                layout = segmented_layout(
+                    page_width_pt, logo_width_pt, logo_height_pt, spacing_pt, spacingy_pt,
+                    page_margin_x_pt, page_margin_xr_pt, page_margin_y_pt, total_logo,
+                    max_length_pt, transform
+                )
+                page_height_pt = layout.page_height(0)
+                self.heighta = page_height_pt
+                logger.info("%.0f cm'lik rulo en çok %g cm'lik %d segmente bölündü",
+                            sum(layout.page_heights) / CM_TO_PT, max_length_cm, layout.page_count)
+            else:
+                layout = grid_layout(
+                    page_width_pt, page_height_pt, logo_width_pt, logo_height_pt,
+                    spacing_pt, spacingy_pt, page_margin_x_pt, page_margin_xr_pt, page_margin_y_pt,
+                    total_logo, transform=transform
+                )
+                if page_height_pt > MAX_PAGE_HEIGHT_PT:
+                    logger.warning("Sayfa %.0f cm; birçok görüntüleyici ve RIP %.0f cm'den uzun sayfaları "
+                                   "açmaz (en büyük segment boyu verilebilir)",
+                                   page_height_pt / CM_TO_PT, MAX_PAGE_HEIGHT_PT / CM_TO_PT)
+            self.last_layout = layout
+            if layout.overflow:
+                logger.warning("%d logonun yalnızca %d tanesi sayfaya sığdı", layout.requested, layout.placed)
 
-        new_doc.save(output_path)
-        print(f"✅ Transparan logolu PDF kaydedildi: {output_path}")
+            if segment_files and output_path is not None and layout.page_count > 1:
+                # Her segment ayrı belgede üretilip kaydedilir; bellekte aynı anda tek segment bulunur
+                self.last_outputs = []
+                for n, segment in enumerate(layout.split_pages()):
+                    path = segment_path(output_path, n, layout.page_count)
+                    with self.new_output() as new_doc:
+                        self.stamp_layout(new_doc, segment, logo_pdf, clip, layered=layered)
+                        self.finish_document(new_doc, path, save_profile)
+                    self.last_outputs.append(path)
+            else:
+                # Yeni PDF oluşturma
+                with self.new_output() as new_doc:
+                    self.stamp_layout(new_doc, layout, logo_pdf, clip, layered=layered)
+                    self.finish_document(new_doc, output_path, save_profile)
+                self.last_outputs = [output_path] if output_path is not None else []
         
         # Temizlik (düzeltildi)
         # os.remove(temp_svg)
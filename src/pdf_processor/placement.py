@@ -0,0 +1,171 @@
+"""
+Logoyu hedef belgeye bir kez gömüp tüm yerleşimlerde paylaşan yerleştirici
+
+show_pdf_page her çağrıda ayrı bir sarmalayıcı Form XObject ve içerik akışı oluşturur; binlerce
+yerleşimde nesne sayısı ve dosya boyutu yerleşim sayısıyla büyür. LogoStamper logo sayfasını
+belgeye bir kez gömer, kırpma alanını taşıyan tek bir paylaşılan Form XObject oluşturur ve her
+sayfaya yerleşim başına yalnızca bir "q <matris> cm /Logo Do Q" satırı içeren tek bir içerik
+akışı ekler. Döndürme ve aynalama (transform.LogoTransform) bu satırdaki matrise eklenir; logo
+dosyası yeniden yazılmaz.
+"""
+
+import struct
+
+# Paylaşılan logo XObject'inin sayfa kaynaklarındaki adı (birden çok logoda önek + sıra)
+STAMP_RESOURCE_PREFIX = "fzLogo"
+STAMP_RESOURCE_NAME = STAMP_RESOURCE_PREFIX + "0"
+
+
+def _num(value):
+    """PDF içerik akışı için sayı biçimi (MuPDF gibi: float32 değer, en fazla 5 ondalık)"""
+    value = struct.unpack("f", struct.pack("f", value))[0]
+    text = f"{value:.5f}".rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def _ref_xref(value):
+    """'12 0 R' -> 12"""
+    return int(value.split()[0])
+
+
+def add_xobject_resource(doc, page, name, xref):
+    """Sayfanın /Resources /XObject sözlüğüne name -> xref ekle (dolaylı nesneleri çözerek)"""
+    target, prefix = page.xref, "Resources/"
+    kind, value = doc.xref_get_key(target, "Resources")
+    if kind == "xref":
+        target, prefix = _ref_xref(value), ""
+
+    kind, value = doc.xref_get_key(target, prefix + "XObject")
+    if kind == "xref":
+        doc.xref_set_key(_ref_xref(value), name, f"{xref} 0 R")
+    else:
+        doc.xref_set_key(target, f"{prefix}XObject/{name}", f"{xref} 0 R")
+
+
+def append_content_stream(doc, page, data, prepend=False):
+    """Sayfaya yeni bir içerik akışı ekle (prepend=True ise en alta) ve xref'ini döndür"""
+    xref = doc.get_new_xref()
+    doc.update_object(xref, "<<>>")
+    doc.update_stream(xref, data)
+    contents = [xref] + page.get_contents() if prepend else page.get_contents() + [xref]
+    doc.xref_set_key(page.xref, "Contents", "[" + " ".join(f"{x} 0 R" for x in contents) + "]")
+    return xref
+
+
+class LogoStamper:
+    """Bir logo sayfasını hedef belgeye bir kez gömüp istenen dikdörtgenlere yerleştirir"""
+
+    def __init__(self, doc, logo_doc, pno=0, clip=None, keep_proportion=True,
+                 name=STAMP_RESOURCE_NAME):
+        self.doc = doc
+        self.logo_doc = logo_doc
+        self.pno = pno
+        self.clip = clip
+        self.keep_proportion = keep_proportion
+        self.name = name    # aynı sayfada birden çok logo varsa her yerleştiricinin adı farklı olmalı
+        self.xref = 0
+
+        logo_page = logo_doc[pno]
+        source = logo_page.rect if clip is None else logo_page.rect & clip
+        # Kaynak dikdörtgen PDF koordinatlarında (show_pdf_page ile aynı hesap)
+        self.source_rect = source * ~logo_page.transformation_matrix
+        # Döndürülmüş kaynak sayfalarda show_pdf_page'in kendi hesabına bırak
+        self.direct = logo_page.rotation == 0
+
+    def _show(self, page, rect, rotate=0):
+        if self.clip is None:
+            return page.show_pdf_page(rect, self.logo_doc, self.pno,
+                                      keep_proportion=self.keep_proportion, rotate=rotate)
+        return page.show_pdf_page(rect, self.logo_doc, self.pno, clip=self.clip,
+                                  keep_proportion=self.keep_proportion, rotate=rotate)
+
+    def _embed(self, page):
+        """Logoyu sayfaya çizmeden belgeye göm; show_pdf_page'in gömdüğü sayfa XObject'inin xref'i
+
+        show_pdf_page dönüşüm matrisi almadığı için logo onunla gömülür, eklediği içerik akışı
+        sayfadan geri çıkarılır (kaydederken çöp toplanır).
+        """
+        contents = page.get_contents()
+        fullpage_xref = self._show(page, page.rect)
+        self.doc.xref_set_key(page.xref, "Contents", "[" + " ".join(f"{x} 0 R" for x in contents) + "]")
+        return fullpage_xref
+
+    def _matrix(self, target, transform=None):
+        """Kaynak dikdörtgeni hedefin (PDF koordinatları) ortasına ölçekleyen matris
+
+        show_pdf_page'in hesabıyla aynı sırada yapılır; böylece çıktı piksel piksel aynıdır.
+        transform verilirse ölçeklenen logo hedefin ortası etrafında döndürülüp aynalanır.
+        """
+        import fitz
+
+        source = self.source_rect
+        source_center = (source.tl + source.br) / 2.0
+        target_center = (target.tl + target.br) / 2.0
+        matrix = fitz.Matrix(1, 0, 0, 1, -source_center.x, -source_center.y)
+        scale_x = target.width / source.width
+        scale_y = target.height / source.height
+        if self.keep_proportion:
+            scale_x = scale_y = min(scale_x, scale_y)
+        matrix *= fitz.Matrix(scale_x, scale_y)
+        if transform is not None:
+            matrix *= transform.matrix()
+        matrix *= fitz.Matrix(1, 0, 0, 1, target_center.x, target_center.y)
+        return tuple(matrix)
+
+    def _wrapper_xref(self, fullpage_xref):
+        """Logo sayfasını kaynak dikdörtgenine kırpan paylaşılan Form XObject (show_pdf_page'inkiyle aynı)"""
+        source = self.source_rect
+        bbox = " ".join(_num(v) for v in (source.x0, source.y0, source.x1, source.y1))
+        xref = self.doc.get_new_xref()
+        self.doc.update_object(
+            xref,
+            f"<< /Type /XObject /Subtype /Form /BBox [ {bbox} ] /Matrix [ 1 0 0 1 0 0 ] "
+            f"/Resources << /XObject << /fullpage {fullpage_xref} 0 R >> >> >>"
+        )
+        self.doc.update_stream(xref, b"/fullpage Do")
+        return xref
+
+    def stamp(self, page, rects, transform=None):
+        """Logoyu sayfadaki tüm dikdörtgenlere yerleştir (rects: (x0, y0, x1, y1) dizisi)
+
+        transform (LogoTransform) verilirse rects logonun döndürülmemiş alanıdır; logo oraya
+        sığdırılıp dikdörtgenin ortası etrafında döndürülür ve aynalanır.
+        """
+        import fitz
+        from src.pdf_processor.transform import centered_rect
+
+        rects = [fitz.Rect(rect) for rect in rects]
+        if not rects:
+            return
+        if transform is not None and transform.is_identity:
+            transform = None
+        if not self.direct:
+            # show_pdf_page yalnızca (saat yönünün tersine) 90'ın katı döndürebilir, aynalayamaz
+            rotate = 0
+            if transform is not None:
+                if transform.quarter_turns is None or transform.mirror_x or transform.mirror_y:
+                    raise ValueError("Döndürülmüş sayfalı logolar yalnızca 90'ın katlarıyla döndürülebilir")
+                rotate = -transform.rotation % 360
+            for rect in rects:
+                if rotate:
+                    rect = fitz.Rect(centered_rect(rect, *transform.rotated_size(rect.width, rect.height)))
+                self._show(page, rect, rotate)
+            return
+
+        if not self.xref:
+            # Logo belgeye ilk yerleşimde gömülür; sonraki tüm yerleşimler bu XObject'i kullanır
+            if transform is None:
+                self.xref = self._wrapper_xref(self._show(page, rects[0]))
+                rects = rects[1:]
+                if not rects:
+                    return
+            else:
+                self.xref = self._wrapper_xref(self._embed(page))
+
+        add_xobject_resource(self.doc, page, self.name, self.xref)
+        to_pdf = ~page.transformation_matrix
+        lines = []
+        for rect in rects:
+            matrix = self._matrix(rect * to_pdf, transform)
+            lines.append(f"q {' '.join(_num(v) for v in matrix)} cm /{self.name} Do Q")
+        append_content_stream(self.doc, page, ("\n".join(lines) + "\n").encode())
@@ -0,0 +1,333 @@
+"""
+RIP'ler için bantlar hâlinde, çok çekirdekli raster (TIFF/PNG) dışa aktarma
+
+    python -m src.pdf_processor --raster rulo.pdf -o rulo.tif --dpi 600 --colorspace cmyk
+    python -m src.pdf_processor --raster rulo.pdf -o rulo.png --dpi 300 --alpha
+
+Sayfanın tamamı tek get_pixmap ile işlenmez (58 × 300 cm 1200 DPI'da 10 GB'ı aşar). Sayfa,
+her biri yaklaşık BAND_BYTES olan yatay bantlara bölünür; bantlar süreç havuzunda `clip` ile işlenir
+ve sırayla akış hâlindeki yazıcıya verilir (PNG: satır filtreli zlib IDAT parçaları; TIFF: bant başına
+bir şerit, deflate veya sıkıştırmasız, 4 GB'ı aşabilecek dosyalarda BigTIFF). Havuzda aynı anda en
+fazla işçi sayısı + 1 bant bekler; tepe bellek sayfa boyuna değil bant boyuna bağlıdır.
+
+Renk: "rgb" veya "cmyk" (yalnızca TIFF); alpha=True şeffaf alanları korur (PNG düz, TIFF ön çarpımlı
+alfa). MuPDF alfa kanallı pikselleri ön çarpımlı üretir; PNG için NumPy ile düz alfaya çevrilir.
+"""
+
+import os
+import math
+import time
+import zlib
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from src.pdf_processor.parallel import available_cores
+
+FORMAT_PNG = "png"
+FORMAT_TIFF = "tiff"
+FORMATS = {".png": FORMAT_PNG, ".tif": FORMAT_TIFF, ".tiff": FORMAT_TIFF}
+COLOR_RGB = "rgb"
+COLOR_CMYK = "cmyk"
+COLORSPACES = (COLOR_RGB, COLOR_CMYK)
+
+BAND_BYTES = 32 * 1024 * 1024   # bir bandın hedef piksel verisi
+PNG_LEVEL = 6                   # zlib sıkıştırma düzeyi
+CLASSIC_TIFF_LIMIT = 2 ** 32 - 16 * 1024 * 1024   # bunun üstünde olabilecek dosyalar BigTIFF yazılır
+BAND_OVERLAP_PT = 6             # bandın üstünde ve altında fazladan işlenip atılan şerit (pt)
+
+# İşçi sürecinde bir kez hazırlanan sayfa ve ayarlar (bkz. _init_band_worker)
+_band_source = None
+
+
+def raster_size(page_rect, dpi):
+    """Sayfanın dpi'daki piksel boyutu (MuPDF'in yuvarlamasıyla aynı)"""
+    import fitz
+
+    scale = dpi / 72
+    irect = (page_rect * fitz.Matrix(scale, scale)).irect
+    return irect.width, irect.height
+
+
+def band_rows(width, channels, band_bytes=BAND_BYTES):
+    """Bir banttaki satır sayısı (en az 1)"""
+    return max(1, band_bytes // (width * channels))
+
+
+def overlap_rows(dpi):
+    """BAND_OVERLAP_PT'nin dpi'daki satır sayısı"""
+    return math.ceil(BAND_OVERLAP_PT * dpi / 72)
+
+
+def band_clip(page_rect, dpi, y0, y1):
+    """y0..y1 piksel satırlarının sayfadaki alanı (pt)"""
+    import fitz
+
+    scale = dpi / 72
+    return fitz.Rect(page_rect.x0, page_rect.y0 + y0 / scale, page_rect.x1, page_rect.y0 + y1 / scale)
+
+
+def _colorspace(name):
+    import fitz
+
+    return fitz.csCMYK if name == COLOR_CMYK else fitz.csRGB
+
+
+def _init_band_worker(pdf_path, page_number, dpi, colorspace, alpha):
+    """İşçi sürecini hazırla: sayfa bir kez açılır, görüntü listesi tüm bantlarda kullanılır"""
+    global _band_source
+    import fitz
+
+    doc = fitz.open(pdf_path)
+    page = doc[page_number]
+    height = raster_size(page.rect, dpi)[1]
+    _band_source = (doc, page.rect, height, page.get_displaylist(), dpi, colorspace, alpha)
+
+
+def render_band(rows):
+    """İşçide çalışır: (y0, y1) satırlarının piksel verisi (satır başına genişlik × kanal bayt)
+
+    Bant üstten ve alttan BAND_OVERLAP_PT geniş işlenip kırpılır: MuPDF clip kenarına birkaç pt yakın
+    içeriği farklı işlediğinden aksi hâlde bant sınırlarında tüm sayfa işlemesinden farklı pikseller çıkar.
+    """
+    import fitz
+
+    doc, page_rect, height, display_list, dpi, colorspace, alpha = _band_source
+    y0, y1 = rows
+    scale = dpi / 72
+    overlap = overlap_rows(dpi)
+    clip = band_clip(page_rect, dpi, max(0, y0 - overlap), min(height, y1 + overlap))
+    pix = display_list.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=_colorspace(colorspace),
+                                  alpha=alpha, clip=clip)
+    row_bytes = pix.width * pix.n
+    first = max(0, y0 - pix.y)
+    last = min(pix.height, y1 - pix.y)
+    data = pix.samples[first * pix.stride:last * pix.stride]
+    if pix.stride != row_bytes:
+        data = b"".join(data[i * pix.stride:i * pix.stride + row_bytes] for i in range(last - first))
+    expected = (y1 - y0) * row_bytes
+    if len(data) != expected:
+        # Yuvarlama farkı: bant tam olarak beklenen satır sayısına getirilir (boş satırlar beyaz)
+        white = b"\x00" if alpha or colorspace == COLOR_CMYK else b"\xff"
+        data = data[:expected].ljust(expected, white)
+    return data
+
+
+def _render_in_process(writer, bands, init_args):
+    """Tek işçi: bantlar bu süreçte işlenir, sayfa sonunda kapatılır"""
+    global _band_source
+    _init_band_worker(*init_args)
+    try:
+        for band in bands:
+            writer.write(render_band(band))
+    finally:
+        _band_source[0].close()
+        _band_source = None
+
+
+def unpremultiply(data, channels):
+    """Ön çarpımlı alfalı pikselleri düz alfaya çevir (PNG için)"""
+    import numpy as np
+
+    pixels = np.frombuffer(data, dtype=np.uint8).reshape(-1, channels)
+    alpha = pixels[:, -1:].astype(np.uint16)
+    color = pixels[:, :-1].astype(np.uint16)
+    straight = np.where(alpha > 0, (color * 255 + alpha // 2) // np.maximum(alpha, 1), 0)
+    out = np.empty_like(pixels)
+    out[:, :-1] = np.minimum(straight, 255)
+    out[:, -1:] = pixels[:, -1:]
+    return out.tobytes()
+
+
+class PngWriter:
+    """Satırları gelişine göre sıkıştırıp IDAT parçaları olarak yazan PNG yazıcısı"""
+
+    def __init__(self, path, width, height, channels, alpha, dpi):
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.alpha = alpha
+        self.rows = 0
+        self.file = open(path, "wb")
+        self.compressor = zlib.compressobj(PNG_LEVEL)
+        color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+        self.file.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        per_metre = round(dpi / 0.0254)
+        self._chunk(b"pHYs", struct.pack(">IIB", per_metre, per_metre, 1))
+
+    def _chunk(self, kind, data):
+        self.file.write(struct.pack(">I", len(data)) + kind + data)
+        self.file.write(struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+    def write(self, data):
+        if self.alpha:
+            data = unpremultiply(data, self.channels)
+        row_bytes = self.width * self.channels
+        rows = len(data) // row_bytes
+        # Her satır filtre türü 0 (None) ile başlar
+        filtered = b"".join(b"\x00" + data[i * row_bytes:(i + 1) * row_bytes] for i in range(rows))
+        compressed = self.compressor.compress(filtered)
+        if compressed:
+            self._chunk(b"IDAT", compressed)
+        self.rows += rows
+
+    def close(self):
+        self._chunk(b"IDAT", self.compressor.flush())
+        self._chunk(b"IEND", b"")
+        self.file.close()
+
+
+# TIFF alan türleri: (kod, bayt)
+TIFF_SHORT = (3, 2)
+TIFF_LONG = (4, 4)
+TIFF_RATIONAL = (5, 8)
+TIFF_LONG8 = (16, 8)
+TIFF_COMPRESSION_NONE = 1
+TIFF_COMPRESSION_DEFLATE = 8
+
+
+class TiffWriter:
+    """Bantları sırayla birer şerit (strip) olarak yazan TIFF yazıcısı; IFD dosyanın sonundadır"""
+
+    def __init__(self, path, width, height, channels, colorspace, alpha, dpi, rows_per_strip,
+                 compress=True):
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.colorspace = colorspace
+        self.alpha = alpha
+        self.dpi = dpi
+        self.rows_per_strip = rows_per_strip
+        self.compress = compress
+        self.offsets = []
+        self.counts = []
+        self.big = width * height * channels * 1.01 + 64 * 1024 > CLASSIC_TIFF_LIMIT
+        self.file = open(path, "wb")
+        if self.big:
+            self.file.write(b"II+\x00" + struct.pack("<HHQ", 8, 0, 0))
+        else:
+            self.file.write(b"II*\x00" + struct.pack("<I", 0))
+
+    def write(self, data):
+        if self.compress:
+            data = zlib.compress(data, PNG_LEVEL)
+        self.offsets.append(self.file.tell())
+        self.counts.append(len(data))
+        self.file.write(data)
+
+    def close(self):
+        offset_type = TIFF_LONG8 if self.big else TIFF_LONG
+        photometric = 5 if self.colorspace == COLOR_CMYK else 2
+        entries = [
+            (256, TIFF_LONG, [self.width]),
+            (257, TIFF_LONG, [self.height]),
+            (258, TIFF_SHORT, [8] * self.channels),
+            (259, TIFF_SHORT, [TIFF_COMPRESSION_DEFLATE if self.compress else TIFF_COMPRESSION_NONE]),
+            (262, TIFF_SHORT, [photometric]),
+            (273, offset_type, self.offsets),
+            (277, TIFF_SHORT, [self.channels]),
+            (278, TIFF_LONG, [self.rows_per_strip]),
+            (279, offset_type, self.counts),
+            (282, TIFF_RATIONAL, [(round(self.dpi * 100), 100)]),
+            (283, TIFF_RATIONAL, [(round(self.dpi * 100), 100)]),
+            (284, TIFF_SHORT, [1]),
+            (296, TIFF_SHORT, [2]),     # inç
+        ]
+        if self.colorspace == COLOR_CMYK:
+            entries.append((332, TIFF_SHORT, [1]))      # InkSet: CMYK
+        if self.alpha:
+            entries.append((338, TIFF_SHORT, [1]))      # ön çarpımlı (associated) alfa
+        self._write_ifd(sorted(entries))
+        self.file.close()
+
+    def _write_ifd(self, entries):
+        if self.file.tell() % 2:
+            self.file.write(b"\x00")
+        ifd = self.file.tell()
+        count_format, entry_size, inline, next_format = (
+            ("<Q", 20, 8, "<Q") if self.big else ("<H", 12, 4, "<I"))
+        extra = ifd + struct.calcsize(count_format) + len(entries) * entry_size + struct.calcsize(next_format)
+
+        table = [struct.pack(count_format, len(entries))]
+        payloads = []
+        for tag, (kind, size), values in entries:
+            data = self._pack(kind, values)
+            if len(data) <= inline:
+                field = data.ljust(inline, b"\x00")
+            else:
+                field = struct.pack("<Q" if self.big else "<I", extra)
+                payloads.append(data)
+                extra += len(data)
+            table.append(struct.pack("<HHQ" if self.big else "<HHI", tag, kind, len(values)) + field)
+        table.append(struct.pack(next_format, 0))
+        self.file.write(b"".join(table) + b"".join(payloads))
+
+        self.file.seek(8 if self.big else 4)
+        self.file.write(struct.pack("<Q" if self.big else "<I", ifd))
+
+    @staticmethod
+    def _pack(kind, values):
+        if kind == TIFF_RATIONAL[0]:
+            return b"".join(struct.pack("<II", *value) for value in values)
+        code = {TIFF_SHORT[0]: "H", TIFF_LONG[0]: "I", TIFF_LONG8[0]: "Q"}[kind]
+        return struct.pack(f"<{len(values)}{code}", *values)
+
+
+def export_raster(pdf_path, output_path, dpi=300, colorspace=COLOR_RGB, alpha=False, page=0,
+                  workers=None, band_bytes=BAND_BYTES, compress=True):
+    """PDF sayfasını bantlar hâlinde işleyip output_path'e (uzantısına göre PNG veya TIFF) yaz
+
+    Dönüş: {"width", "height", "bands", "bytes", "seconds"}.
+    """
+    import fitz
+
+    fmt = FORMATS.get(os.path.splitext(output_path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Desteklenmeyen raster biçimi: {output_path} (.png, .tif, .tiff)")
+    if colorspace not in COLORSPACES:
+        raise ValueError(f"Bilinmeyen renk uzayı: {colorspace} ({', '.join(COLORSPACES)})")
+    if fmt == FORMAT_PNG and colorspace == COLOR_CMYK:
+        raise ValueError("PNG CMYK desteklemez; CMYK için .tif kullanın")
+
+    start = time.perf_counter()
+    with fitz.open(pdf_path) as doc:
+        if not 0 <= page < doc.page_count:
+            raise ValueError(f"Sayfa {page + 1} yok ({doc.page_count} sayfa)")
+        page_rect = doc[page].rect
+    width, height = raster_size(page_rect, dpi)
+    channels = (4 if colorspace == COLOR_CMYK else 3) + bool(alpha)
+    # Bant, üst üste binen şeritlerin (bkz. render_band) yanında kısa kalmasın
+    rows = max(band_rows(width, channels, band_bytes), 4 * overlap_rows(dpi))
+    bands = [(y0, min(height, y0 + rows)) for y0 in range(0, height, rows)]
+
+    if fmt == FORMAT_PNG:
+        writer = PngWriter(output_path, width, height, channels, alpha, dpi)
+    else:
+        writer = TiffWriter(output_path, width, height, channels, colorspace, alpha, dpi, rows, compress)
+    workers = max(1, min(workers or available_cores(), len(bands)))
+    init_args = (os.path.abspath(pdf_path), page, dpi, colorspace, alpha)
+    try:
+        if workers == 1:
+            _render_in_process(writer, bands, init_args)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_band_worker,
+                                     initargs=init_args) as pool:
+                # Sırayla yazılır; aynı anda en fazla workers + 1 bant bellekte bekler
+                pending = []
+                for band in bands:
+                    pending.append(pool.submit(render_band, band))
+                    if len(pending) > workers:
+                        writer.write(pending.pop(0).result())
+                for future in pending:
+                    writer.write(future.result())
+        writer.close()
+    except BaseException:
+        writer.file.close()
+        os.remove(output_path)     # yarım raster RIP'e gitmesin
+        raise
+
+    size = os.path.getsize(output_path)
+    seconds = time.perf_counter() - start
+    print(f"🖼️ {output_path}: {width}×{height} px, {len(bands)} bant, {workers} işçi, "
+          f"{size / 1024 / 1024:.1f} MB, {seconds:.2f} sn")
+    return {"width": width, "height": height, "bands": len(bands), "bytes": size, "seconds": seconds}
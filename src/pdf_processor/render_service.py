@@ -0,0 +1,444 @@
+"""
+Yerel üretim servisi: asyncio HTTP sunucusu ve önceden ısıtılmış işçi süreç havuzu
+
+    python -m src.pdf_processor --serve 127.0.0.1:8765 --workers 4
+    python -m src.pdf_processor --serve unix:/tmp/logo_editor.sock
+
+Sipariş sistemi ve operatör istasyonları tek bir her an hazır üreticiyi paylaşır. İşçiler açılışta
+ağır kütüphaneleri yükler (bkz. render_worker.warm_up) ve süreç boyunca aynı PDFProcessor'ı kullanır;
+hazırlanmış logolar içerik özetiyle ortak disk önbelleğinde (cache_dir) tutulduğu için bir işçinin
+hazırladığı logo diğerlerinde de hazırdır. Aynı anda gelen birebir aynı istekler tek üretimi bekler.
+
+Uç noktalar:
+    GET  /health    {"status", "workers", "warm", "served", "in_flight"}
+    POST /render    JSON iş tanımı; yanıt PDF (format "pdf") veya PNG önizleme (format "png")
+
+İş tanımı: {"logo": base64 PDF/SVG baytları, "format": "pdf"|"png", "dpi": önizleme DPI'ı,
+"page": önizleme sayfası} ve komut satırı işlerinin alanları (cli.JOB_DEFAULTS; page_height_cm
+verilmezse sayfa boyu otomatik). Alanların türü işçiye gitmeden denetlenir (parse_job_field, 400).
+Yanıt başlıkları: X-Page-Height-Cm, X-Pages, X-Overflow (sayfaya sığmayan logo sayısı; önizleme
+yine döner), X-Render-Seconds, X-Render-Stages (aşama süreleri, JSON). Hatalar {"error": ...}
+gövdesiyle döner.
+"""
+
+import os
+import json
+import math
+import time
+import base64
+import asyncio
+import hashlib
+import traceback
+from urllib.parse import urlsplit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.pdf_processor.cli import JOB_DEFAULTS, _get_processor, run_sheet_job
+from src.pdf_processor.manifest import FLOAT_FIELDS, INT_FIELDS, BOOL_FIELDS, parse_cell
+from src.pdf_processor.pdf_processor import ENGINES
+from src.pdf_processor.bbox import BBOX_STRATEGIES
+from src.pdf_processor.save_profiles import SAVE_PROFILES
+from src.pdf_processor.svg_ingest import SVG_BACKENDS
+from src.pdf_processor.job_context import JobContext
+from src.pdf_processor.logo_cache import DEFAULT_CACHE_DIR
+from src.pdf_processor.parallel import available_cores
+from src.pdf_processor.metrics import configure_from_env
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+UNIX_PREFIX = "unix:"
+MAX_BODY_BYTES = 64 * 1024 * 1024       # base64 logo dahil istek gövdesi sınırı
+FORMAT_PDF = "pdf"
+FORMAT_PNG = "png"
+CONTENT_TYPES = {FORMAT_PDF: "application/pdf", FORMAT_PNG: "image/png"}
+PREVIEW_DPI = 96
+PREVIEW_MAX_PIXELS = 40 * 1000 * 1000   # PNG önizleme bu piksel sayısını aşmayacak DPI'a indirilir
+WARM_HOLD_SECONDS = 0.2                 # ısıtma görevi bu kadar tutulur, her görev ayrı sürece düşer
+
+# İş tanımında servise özgü alanlar (geri kalanlar JOB_DEFAULTS alanlarıdır)
+SERVICE_FIELDS = ("logo", "format", "dpi", "page")
+# İş alanlarının doğrulaması (sayı/evet-hayır türleri manifest tablolarından)
+NULLABLE_FIELDS = tuple(field for field, value in JOB_DEFAULTS.items() if value is None)
+POSITIVE_FIELDS = ("logo_width_cm", "logo_height_cm", "page_width_cm", "page_height_cm", "total_logo",
+                   "max_length_cm")
+FIELD_CHOICES = {
+    "engine": ENGINES,
+    "bbox_strategy": tuple(BBOX_STRATEGIES),
+    "save_profile": tuple(SAVE_PROFILES),
+    "svg_backend": SVG_BACKENDS,
+}
+
+HTTP_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(Exception):
+    """İstemciye HTTP durum koduyla dönen hata"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_address(address):
+    """"HOST:PORT" -> ("tcp", host, port); "unix:YOL" -> ("unix", yol, None)"""
+    if address.startswith(UNIX_PREFIX):
+        return "unix", address[len(UNIX_PREFIX):], None
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Geçersiz adres: {address} (HOST:PORT veya unix:YOL)")
+    return "tcp", host.strip("[]"), int(port)
+
+
+def logo_suffix(data):
+    """Logo baytlarının türü: .pdf, .svg veya tanınmazsa None"""
+    head = data[:4096].lstrip()
+    if head.startswith(b"%PDF-"):
+        return ".pdf"
+    if head.startswith((b"<?xml", b"<svg", b"<!DOCTYPE svg")) or b"<svg" in head:
+        return ".svg"
+    return None
+
+
+def parse_job_field(field, value):
+    """İş alanını türüne çevir (sayılar metin olarak da verilebilir); hatalıysa RequestError(400)"""
+    if value is None:
+        if field in NULLABLE_FIELDS:
+            return None
+        raise RequestError(400, f"'{field}' boş (null) olamaz")
+
+    if field not in FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS:
+        choices = FIELD_CHOICES.get(field)
+        if not isinstance(value, str) or (choices and value not in choices):
+            expected = ", ".join(choices) if choices else "metin"
+            raise RequestError(400, f"'{field}' geçersiz: {value!r} ({expected})")
+        return value
+
+    kind = "true/false" if field in BOOL_FIELDS else "tam sayı" if field in INT_FIELDS else "sayı"
+    invalid = RequestError(400, f"'{field}' {kind} olmalıdır ({value!r})")
+    if isinstance(value, str):
+        try:
+            value = parse_cell(field, value.strip(), 0)     # manifest hücreleriyle aynı kurallar
+        except ValueError:
+            raise invalid
+        if value is None:
+            return None     # page_height_cm "auto"
+    if field in BOOL_FIELDS:
+        if not isinstance(value, bool):
+            raise invalid
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise invalid
+    if field in INT_FIELDS:
+        if value != int(value):
+            raise invalid
+        value = int(value)
+    else:
+        value = float(value)
+    if field in POSITIVE_FIELDS and value <= 0:
+        raise RequestError(400, f"'{field}' pozitif olmalıdır ({value!r})")
+    return value
+
+
+def parse_spec(body):
+    """İstek gövdesinden doğrulanmış iş tanımı; hatalıysa RequestError(400)"""
+    try:
+        spec = json.loads(body)
+    except ValueError as e:
+        raise RequestError(400, f"Geçersiz JSON: {e}")
+    if not isinstance(spec, dict):
+        raise RequestError(400, "İş tanımı bir JSON nesnesi olmalıdır")
+
+    unknown = sorted(set(spec) - set(JOB_DEFAULTS) - set(SERVICE_FIELDS))
+    if unknown:
+        raise RequestError(400, f"Bilinmeyen alanlar: {', '.join(unknown)}")
+    try:
+        logo = base64.b64decode(spec.get("logo") or "", validate=True)
+    except (TypeError, ValueError):
+        raise RequestError(400, "'logo' base64 kodlu PDF veya SVG olmalıdır")
+    suffix = logo_suffix(logo)
+    if suffix is None:
+        raise RequestError(400, "'logo' PDF veya SVG değil")
+    fmt = spec.get("format", FORMAT_PDF)
+    if fmt not in CONTENT_TYPES:
+        raise RequestError(400, f"Bilinmeyen biçim: {fmt} ({', '.join(CONTENT_TYPES)})")
+
+    try:
+        dpi = float(spec.get("dpi", PREVIEW_DPI))
+        page = int(spec.get("page", 0))
+    except (TypeError, ValueError):
+        raise RequestError(400, "'dpi' ve 'page' sayı olmalıdır")
+    if dpi <= 0:
+        raise RequestError(400, "'dpi' pozitif olmalıdır")
+
+    job = dict(JOB_DEFAULTS)
+    job.update((key, parse_job_field(key, value)) for key, value in spec.items() if key in JOB_DEFAULTS)
+    job["segment_files"] = False        # yanıt tek belgedir; uzun rulo segmentleri sayfa olur
+    if fmt == FORMAT_PNG:
+        job["save_profile"] = "fast"   # PDF istemciye gitmez
+    return {"logo": logo, "suffix": suffix, "format": fmt, "job": job, "dpi": dpi, "page": page}
+
+
+def spec_key(spec):
+    """Birebir aynı istekleri birleştirmek için anahtar (logo özeti + alanlar)"""
+    fields = {key: value for key, value in spec.items() if key != "logo"}
+    fields["logo"] = hashlib.sha256(spec["logo"]).hexdigest()
+    return json.dumps(fields, sort_keys=True, default=str)
+
+
+def init_service_worker(cache_dir):
+    """Havuz sürecini ısıt: kütüphaneler yüklenir, işlemci ortak disk önbelleğiyle kurulur"""
+    from src.pdf_processor.render_worker import warm_up
+
+    configure_from_env()
+    _get_processor(cache_dir)
+    warm_up()
+
+
+def worker_ready(hold=WARM_HOLD_SECONDS):
+    """Isınmış işçinin süreç kimliği (havuzdaki tüm süreçleri başlatmak için)"""
+    time.sleep(hold)
+    return os.getpid()
+
+
+def render_spec(spec):
+    """İşçi sürecinde çalışır: sonucu {"data", ...} veya {"error", "status"} sözlüğü olarak döndür"""
+    try:
+        with JobContext(prefix="logo_service_") as context:
+            processor = _get_processor()
+            processor.context = context
+            logo_path = context.path("logo" + spec["suffix"])
+            with open(logo_path, "wb") as f:
+                f.write(spec["logo"])
+            job = dict(spec["job"], logo=logo_path, output=context.path("sayfa.pdf"))
+            result = run_sheet_job(job, allow_overflow=True)
+            if spec["format"] == FORMAT_PNG:
+                data, result["dpi"] = render_png(job["output"], spec["page"], spec["dpi"])
+            else:
+                with open(job["output"], "rb") as f:
+                    data = f.read()
+        result.pop("output")
+        return dict(result, data=data, pid=os.getpid())
+    except ValueError as e:
+        return {"error": f"{e}", "status": 422}
+    except Exception as e:
+        return {"error": f"{e}", "status": 500, "traceback": traceback.format_exc()}
+
+
+def render_png(pdf_path, page_number, dpi):
+    """Sayfanın PNG önizlemesi; çok büyük sayfalarda DPI PREVIEW_MAX_PIXELS'e indirilir"""
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        if not 0 <= page_number < doc.page_count:
+            raise ValueError(f"Sayfa {page_number} yok ({doc.page_count} sayfa)")
+        page = doc[page_number]
+        pixels = page.rect.width * page.rect.height * (dpi / 72) ** 2
+        if pixels > PREVIEW_MAX_PIXELS:
+            dpi *= (PREVIEW_MAX_PIXELS / pixels) ** 0.5
+        pix = page.get_pixmap(dpi=max(1, int(dpi)), alpha=False)
+        return pix.tobytes("png"), int(dpi)
+
+
+class RenderService:
+    """HTTP isteklerini ısıtılmış süreç havuzuna dağıtan asyncio sunucusu"""
+
+    def __init__(self, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.workers = max(1, workers or available_cores())
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.pool = None
+        self.warm = 0
+        self.served = 0
+        self._in_flight = {}    # spec_key -> asyncio.Task
+
+    def start_pool(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_service_worker,
+                                        initargs=(self.cache_dir,))
+        self.warm = 0
+
+    async def warm_up(self):
+        """Tüm işçileri ilk istekten önce başlat ve ısıt"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        pids = await asyncio.gather(*(loop.run_in_executor(self.pool, worker_ready)
+                                      for _ in range(self.workers)))
+        self.warm = len(set(pids))
+        print(f"🔥 {self.warm} işçi hazır ({time.perf_counter() - start:.2f} sn)")
+
+    async def render(self, spec):
+        """İşi havuzda üret; aynı iş zaten üretiliyorsa onun sonucunu bekle"""
+        key = spec_key(spec)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._submit(spec))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _submit(self, spec):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.pool, render_spec, spec)
+        except BrokenProcessPool:
+            # Bir işçi çöktü (ör. bellek): havuz yeniden kurulur, istek tekrar denenebilir
+            print("⚠️ İşçi havuzu çöktü, yeniden başlatılıyor")
+            self.start_pool()
+            return {"error": "İşçi süreci çöktü; isteği yeniden gönderin", "status": 503}
+
+    async def handle(self, reader, writer):
+        """Bağlantıdaki istekleri sırayla yanıtla (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                status, headers, body = await self.respond(*request)
+                keep_alive = request[2].get("connection", "").lower() != "close"
+                write_response(writer, status, headers, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except RequestError as e:
+            write_response(writer, *error_response(e.status, f"{e}"), keep_alive=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"❌ İstek işlenemedi: {e}")
+            write_response(writer, *error_response(500, f"{e}"), keep_alive=False)
+        finally:
+            writer.close()
+
+    async def respond(self, method, path, headers, body):
+        """(durum, başlıklar, gövde)"""
+        path = urlsplit(path).path
+        if path == "/health":
+            if method != "GET":
+                return error_response(405, "GET bekleniyor")
+            return json_response(200, {"status": "ok", "workers": self.workers, "warm": self.warm,
+                                       "served": self.served, "in_flight": len(self._in_flight)})
+        if path != "/render":
+            return error_response(404, f"Bilinmeyen yol: {path}")
+        if method != "POST":
+            return error_response(405, "POST bekleniyor")
+
+        try:
+            spec = parse_spec(body)
+        except RequestError as e:
+            return error_response(e.status, f"{e}")
+        start = time.perf_counter()
+        result = await self.render(spec)
+        if "error" in result:
+            print(f"❌ /render: {result['error']}")
+            return error_response(result["status"], result["error"])
+
+        self.served += 1
+        print(f"✅ /render {spec['format']} {len(result['data']) / 1024:.1f} KB, "
+              f"{time.perf_counter() - start:.2f} sn (işçi {result['pid']})")
+        headers = {
+            "Content-Type": CONTENT_TYPES[spec["format"]],
+            "X-Page-Height-Cm": f"{result['page_height_cm']:.4f}",
+            "X-Pages": str(result["pages"]),
+            "X-Overflow": str(result["overflow"]),
+            "X-Render-Seconds": f"{result['seconds']:.4f}",
+            "X-Render-Stages": json.dumps({k: round(v, 6) for k, v in result["stages"].items()}),
+        }
+        if "dpi" in result:
+            headers["X-Dpi"] = str(result["dpi"])
+        return 200, headers, result["data"]
+
+    async def serve(self, address=DEFAULT_ADDRESS):
+        """Havuzu ısıt ve adresi dinle (iptal edilene kadar)"""
+        kind, host, port = parse_address(address)
+        self.start_pool()
+        try:
+            await self.warm_up()
+            if kind == "unix":
+                server = await asyncio.start_unix_server(self.handle, path=host)
+            else:
+                server = await asyncio.start_server(self.handle, host=host, port=port)
+            async with server:
+                print(f"🖨️ Üretim servisi dinliyor: {address}")
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            if kind == "unix" and os.path.exists(host):
+                os.remove(host)
+
+
+async def read_request(reader):
+    """(yöntem, yol, başlıklar, gövde) veya bağlantı kapandıysa None"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError(400, "Geçersiz istek satırı")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise RequestError(400, "Geçersiz Content-Length")
+    if length < 0:
+        raise RequestError(400, "Geçersiz Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"Gövde {MAX_BODY_BYTES // (1024 * 1024)} MB sınırını aşıyor")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+def write_response(writer, status, headers, body, keep_alive=True):
+    lines = [f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def json_response(status, data):
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return status, {"Content-Type": "application/json; charset=utf-8"}, body
+
+
+def error_response(status, message):
+    return json_response(status, {"error": message})
+
+
+def serve(address=DEFAULT_ADDRESS, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Servisi Ctrl+C'ye kadar çalıştır"""
+    try:
+        asyncio.run(RenderService(workers, cache_dir).serve(address))
+    except KeyboardInterrupt:
+        print("Üretim servisi durduruldu.")
+    return 0
+
+
+def request_render(logo_path, url="http://" + DEFAULT_ADDRESS, fmt=FORMAT_PDF, timeout=300, **fields):
+    """Servise iş gönder (istemci tarafı); (yanıt baytları, başlıklar) döndür, hatada RuntimeError"""
+    import http.client
+
+    with open(logo_path, "rb") as f:
+        spec = dict(fields, logo=base64.b64encode(f.read()).decode("ascii"), format=fmt)
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    try:
+        connection.request("POST", "/render", json.dumps(spec), {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        data = response.read()
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{response.status}: {json.loads(data).get('error')}")
+    return data, dict(response.getheaders())
@@ -0,0 +1,92 @@
+"""
+Önizleme üretimi için arka plan süreci işlevleri (Qt kullanmaz)
+
+Arayüz her istekte paylaşılan `latest` sayacını artırır. İşçi, üretim sırasında kendi isteğinin
+numarasının hâlâ en son numara olup olmadığına bakar; değilse işi yarıda bırakır (iş birlikçi iptal).
+Sonuç, diske yazılmadan PDF baytları olarak döner. Belgeler katmanlı üretilir: arka plan rengi
+ayrı bir katmandadır ve arayüz rengi yeniden üretim istemeden değiştirebilir (bkz. layers).
+Aşama süreleri (bkz. metrics) sonuçla birlikte döner; arayüz rasterlaştırmayı aynı çalışmaya ekler.
+"""
+
+import time
+
+# İşçi sürecinde bir kez oluşturulan nesneler
+_latest = None
+_processor = None
+
+# Önizleme modları ve kullandıkları PDFProcessor metodları
+MODE_MANUAL = "manual"      # manuel sayfa boyu
+MODE_AUTO = "auto"          # otomatik sayfa boyu
+
+
+def init_worker(latest):
+    """İşçi sürecini başlat: paylaşılan sayaç ve bellekte çalışan işlemci"""
+    global _latest, _processor
+    from src.pdf_processor.pdf_processor import PDFProcessor
+    from src.pdf_processor.metrics import configure_from_env
+
+    configure_from_env()
+    _latest = latest
+    _processor = PDFProcessor(in_memory=True, bbox_workers=1)
+
+
+def warm_up():
+    """Ağır kütüphaneleri ilk istekten önce yükle"""
+    import fitz
+    from svglib.svglib import svg2rlg
+    from reportlab.graphics import renderPDF
+    return fitz.VersionBind, svg2rlg.__name__, renderPDF.__name__
+
+
+def build_preview(job, generation):
+    """İstenen önizlemeyi üret; iptal edildiyse None, yoksa sonuç sözlüğü döndür
+
+    job: {"mode": MODE_*, "kwargs": PDFProcessor argümanları, "background": hex renk veya None}
+    """
+    from src.pdf_processor.pdf_processor import BuildCancelled
+    from src.pdf_processor.layers import set_background
+    from src.pdf_processor.metrics import measured_run, STAGE_SAVE
+
+    if _latest.value != generation:
+        return None
+
+    start = time.perf_counter()
+    _processor.cancel_check = lambda: _latest.value != generation
+    kwargs = dict(job["kwargs"])
+    try:
+        with measured_run(_processor, f"preview_{job['mode']}", kwargs.get("pdf_path")) as run:
+            if job["mode"] == MODE_AUTO:
+                page_height_pt = _processor.calculate_transparent_logos(
+                    output_path=None, layered=True, **kwargs
+                )
+            else:
+                page_height_pt = _processor.add_transparent_logos(
+                    output_path=None, layered=True, **kwargs
+                )
+            _processor.check_cancelled()
+
+            with _processor.take_document() as doc:
+                background = job.get("background")
+                if background is not None:
+                    set_background(doc, _processor.hex_to_rgb(background))
+                with run.stage(STAGE_SAVE, profile="bytes") as fields:
+                    data = doc.tobytes()
+                    fields["bytes"] = len(data)
+    except BuildCancelled:
+        # Belge üretildikten sonra iptal edildiyse bir sonraki isteği beklemeden bırakılır
+        _processor.release_document()
+        return None
+    finally:
+        _processor.cancel_check = None
+
+    return {
+        "generation": generation,
+        "mode": job["mode"],
+        "job": job,
+        "background": background,
+        "logo": _processor.last_logo,   # arayüzün anında önizlemesi için (bkz. composite)
+        "pdf": data,
+        "page_height_pt": page_height_pt,
+        "seconds": time.perf_counter() - start,
+        "metrics": run.as_dict(),
+    }
@@ -0,0 +1,54 @@
+"""
+PDF kaydetme profilleri
+
+- fast:    önizleme için; seçeneksiz doc.save (en hızlı, sıkıştırma yok)
+- compact: baskı/RIP için; kullanılmayan ve tekrarlanan nesneler atılır, akışlar sıkıştırılır,
+           içerik akışları temizlenir ve PyMuPDF destekliyorsa nesneler object stream'lere paketlenir
+"""
+
+import os
+import time
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+SAVE_FAST = "fast"
+SAVE_COMPACT = "compact"
+
+SAVE_PROFILES = {
+    SAVE_FAST: {},
+    SAVE_COMPACT: {
+        "garbage": 4,           # kullanılmayan nesneleri at, tekrarlanan nesne ve akışları birleştir
+        "deflate": True,
+        "deflate_images": True,
+        "deflate_fonts": True,
+        "clean": True,
+        "use_objstms": True,    # PyMuPDF 1.23+
+    },
+}
+
+# Profil adlarının arayüzde görünen karşılıkları
+SAVE_PROFILE_LABELS = {
+    SAVE_FAST: "Hızlı önizleme",
+    SAVE_COMPACT: "Sıkıştırılmış baskı",
+}
+
+
+def save_options(doc, profile):
+    """Profilin, kurulu PyMuPDF sürümünün desteklediği save() seçenekleri"""
+    if profile not in SAVE_PROFILES:
+        raise ValueError(f"Bilinmeyen kaydetme profili: {profile}")
+    supported = inspect.signature(doc.save).parameters
+    return {key: value for key, value in SAVE_PROFILES[profile].items() if key in supported}
+
+
+def save_document(doc, output_path, profile=SAVE_FAST):
+    """Belgeyi profile göre kaydet; (dosya boyutu bayt, süre sn) döndür ve raporla"""
+    options = save_options(doc, profile)
+    start = time.perf_counter()
+    doc.save(output_path, **options)
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(output_path)
+    logger.info("%s: %.1f KB, %.3f sn (%s)", os.path.basename(output_path), size / 1024, seconds, profile)
+    return size, seconds
@@ -0,0 +1,78 @@
+"""
+Açılış süresi ölçüm modülü (GUI ilk pencere süresi ve arayüzsüz içe aktarma süresi)
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+
+# Açılışta yüklenip yüklenmediği raporlanan ağır kütüphaneler
+HEAVY_MODULES = ("fitz", "PyQt5.QtWidgets", "PyQt5.QtGui", "svglib", "reportlab", "numpy")
+
+# Temiz bir yorumlayıcıda modül içe aktarma süresini ölçen betik
+_IMPORT_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# Raporun istenip istenmediği (komut satırı bayrağı veya ortam değişkeni)
+STARTUP_REPORT_FLAG = "--startup-report"
+STARTUP_REPORT_ENV = "LOGO_EDITOR_STARTUP_REPORT"
+
+
+def startup_report_requested(argv=None):
+    argv = sys.argv if argv is None else argv
+    return STARTUP_REPORT_FLAG in argv or os.environ.get(STARTUP_REPORT_ENV) == "1"
+
+
+class StartupTimer:
+    """Açılış aşamalarını işaretleyip süre raporu üretir"""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self, title="Açılış süresi"):
+        lines = [f"⏱ {title}:"]
+        previous = self.start
+        for name, stamp in self.marks:
+            lines.append(f"  {name:<28} +{(stamp - previous) * 1000:8.1f} ms  "
+                         f"(toplam {(stamp - self.start) * 1000:8.1f} ms)")
+            previous = stamp
+        loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+        lines.append(f"  Yüklü ağır modüller: {', '.join(loaded) or '-'}")
+        return "\n".join(lines)
+
+
+def measure_import(module, python=None, repeat=3):
+    """Modülü taze yorumlayıcılarda içe aktarıp en iyi süreyi ve yüklenen ağır modülleri döndür"""
+    python = python or sys.executable
+    code = _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [python, "-c", code], cwd=root_dir, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def headless_import_report(modules=("src.pdf_processor.pdf_processor", "src.pdf_processor.cli")):
+    """Arayüzsüz kullanımda içe aktarma maliyetinin raporu"""
+    lines = ["⏱ Arayüzsüz içe aktarma süresi (taze yorumlayıcı, 3 denemenin en iyisi):"]
+    for module in modules:
+        result = measure_import(module)
+        lines.append(f"  {module:<36} {result['seconds'] * 1000:8.1f} ms  "
+                     f"ağır modüller: {', '.join(result['loaded']) or '-'}")
+    return "\n".join(lines)
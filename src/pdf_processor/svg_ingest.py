@@ -0,0 +1,203 @@
+"""
+SVG logoları akış hâlinde okuyup PDF'e dönüştürme
+
+Büyük tedarikçi SVG'leri (50 MB+) ağaç olarak belleğe alınmaz: expat ile parça parça okunur, kökün
+doğrudan altındaki arka plan dikdörtgenleri atlanarak (process_svg ile aynı kural) yeniden yazılır.
+Temizlenen SVG iki okuyucudan biriyle PDF'e çevrilir:
+
+    svglib  - reportlab çizimi üzerinden; CSS ve gradyanlarda daha uyumlu, büyük dosyada yavaş
+    mupdf   - PyMuPDF'in yerel SVG desteği; hızlı ve az bellekli
+    auto    - SVGLIB_MAX_BYTES'a kadar svglib, üstünde (veya svglib başarısız olursa) mupdf
+
+PDFProcessor.ingest_svg sonucu logo önbelleğinde tutar; sonraki tüm adımlar bu PDF ile çalışır.
+fitz, svglib ve reportlab ilk kullanımda yüklenir.
+"""
+
+import io
+import os
+import logging
+import xml.parsers.expat
+from xml.sax.saxutils import escape, quoteattr
+
+logger = logging.getLogger(__name__)
+
+SVG_BACKEND_AUTO = "auto"
+SVG_BACKEND_SVGLIB = "svglib"
+SVG_BACKEND_MUPDF = "mupdf"
+SVG_BACKENDS = (SVG_BACKEND_AUTO, SVG_BACKEND_SVGLIB, SVG_BACKEND_MUPDF)
+
+SVGLIB_MAX_BYTES = 1024 * 1024      # auto: bundan büyük dosyalar mupdf ile açılır (svglib ~6 sn/MB)
+STREAM_CHUNK = 1024 * 1024          # okuma ve yazma tampon boyutu (bayt)
+
+
+def is_svg(path):
+    """Dosya adı SVG mi (büyük/küçük harf duyarsız)"""
+    return isinstance(path, str) and path.lower().endswith(".svg")
+
+
+def is_background_rect(name, attrs):
+    """Sayfayı kaplayan veya beyaz dolgulu dikdörtgen (process_svg'deki kural)"""
+    if name.rsplit(":", 1)[-1] != "rect":
+        return False
+    return attrs.get("width") == "100%" or attrs.get("fill", "").lower() == "#ffffff"
+
+
+class _Writer:
+    """Küçük metin parçalarını biriktirip UTF-8 olarak büyük bloklar hâlinde yazar"""
+
+    def __init__(self, target):
+        self.target = target
+        self.parts = []
+        self.size = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= STREAM_CHUNK:
+            self.flush()
+
+    def flush(self):
+        self.target.write("".join(self.parts).encode("utf-8"))
+        self.parts = []
+        self.size = 0
+
+
+def strip_background(source, target, width=None, height=None, remove_bg=True):
+    """SVG'yi akış hâlinde kopyala; arka plan dikdörtgenlerini çıkar, kök boyutunu (verilirse) ayarla
+
+    source/target: dosya yolu veya ikili dosya nesnesi. Çıktı UTF-8'dir; DOCTYPE, yorum ve varlık
+    başvuruları olduğu gibi korunur. Dönüş: çıkarılan dikdörtgen sayısı.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return strip_background(f, target, width, height, remove_bg)
+    if isinstance(target, str):
+        with open(target, "wb") as f:
+            return strip_background(source, f, width, height, remove_bg)
+
+    out = _Writer(target)
+    parser = xml.parsers.expat.ParserCreate()
+    parser.buffer_text = True
+    parser.buffer_size = STREAM_CHUNK
+    state = {"depth": 0, "skip": 0, "removed": 0, "cdata": False, "open": None}
+
+    def close_pending():
+        # Boş elemanlar <x/> olarak yazılsın diye başlangıç etiketi bir sonraki olaya kadar bekletilir
+        if state["open"] is not None:
+            out.write(state["open"] + ">")
+            state["open"] = None
+
+    def start(name, attrs):
+        if state["skip"]:
+            state["skip"] += 1
+            return
+        if remove_bg and state["depth"] == 1 and is_background_rect(name, attrs):
+            state["skip"] = 1
+            state["removed"] += 1
+            return
+        close_pending()
+        if state["depth"] == 0:
+            if width is not None:
+                attrs["width"] = width
+            if height is not None:
+                attrs["height"] = height
+        state["depth"] += 1
+        state["open"] = "<" + name + "".join(f" {key}={quoteattr(value)}" for key, value in attrs.items())
+
+    def end(name):
+        if state["skip"]:
+            state["skip"] -= 1
+            return
+        state["depth"] -= 1
+        if state["open"] is not None:
+            out.write(state["open"] + "/>")
+            state["open"] = None
+        else:
+            out.write(f"</{name}>")
+
+    def text(data):
+        if state["skip"]:
+            return
+        close_pending()
+        out.write(data if state["cdata"] else escape(data))
+
+    def start_cdata():
+        if not state["skip"]:
+            close_pending()
+            state["cdata"] = True
+            out.write("<![CDATA[")
+
+    def end_cdata():
+        if not state["skip"]:
+            state["cdata"] = False
+            out.write("]]>")
+
+    def xml_decl(version, encoding, standalone):
+        # Kaynak kodlaması ne olursa olsun çıktı UTF-8'dir
+        standalone = "" if standalone == -1 else f' standalone="{"yes" if standalone else "no"}"'
+        out.write(f'<?xml version="{version or "1.0"}" encoding="UTF-8"{standalone}?>')
+
+    def default(data):
+        # DOCTYPE, yorum, işlem talimatı ve içerikteki varlık başvuruları aynen aktarılır
+        if not state["skip"]:
+            close_pending()
+            out.write(data)
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = text
+    parser.StartCdataSectionHandler = start_cdata
+    parser.EndCdataSectionHandler = end_cdata
+    parser.XmlDeclHandler = xml_decl
+    parser.DefaultHandler = default
+    parser.ParseFile(source)
+    out.flush()
+    return state["removed"]
+
+
+def choose_backend(size, backend=SVG_BACKEND_AUTO):
+    """Dosya boyutuna göre kullanılacak okuyucu"""
+    if backend not in SVG_BACKENDS:
+        raise ValueError(f"Bilinmeyen SVG okuyucusu: {backend}")
+    if backend != SVG_BACKEND_AUTO:
+        return backend
+    return SVG_BACKEND_SVGLIB if size <= SVGLIB_MAX_BYTES else SVG_BACKEND_MUPDF
+
+
+def svglib_to_pdf(svg):
+    """svglib + reportlab ile PDF baytları (svg: dosya yolu veya bayt); okunamazsa ValueError"""
+    from svglib.svglib import svg2rlg
+    from reportlab.graphics import renderPDF
+
+    drawing = svg2rlg(io.BytesIO(svg) if isinstance(svg, bytes) else svg)
+    if drawing is None:
+        raise ValueError("svglib SVG'yi okuyamadı")
+    return renderPDF.drawToString(drawing)
+
+
+def mupdf_to_pdf(svg):
+    """PyMuPDF'in yerel SVG desteğiyle PDF baytları (svg: dosya yolu veya bayt)"""
+    import fitz
+
+    doc = fitz.open(stream=svg, filetype="svg") if isinstance(svg, bytes) else fitz.open(svg, filetype="svg")
+    try:
+        return doc.convert_to_pdf()
+    finally:
+        doc.close()
+
+
+def svg_to_pdf(svg, backend):
+    """Seçilen okuyucuyla PDF baytları; auto'da svglib başarısız olursa mupdf denenir
+
+    Dönüş: (PDF baytları, kullanılan okuyucu).
+    """
+    size = len(svg) if isinstance(svg, bytes) else os.path.getsize(svg)
+    chosen = choose_backend(size, backend)
+    if chosen == SVG_BACKEND_SVGLIB:
+        try:
+            return svglib_to_pdf(svg), chosen
+        except Exception as e:
+            if backend != SVG_BACKEND_AUTO:
+                raise
+            logger.warning("svglib başarısız (%s); mupdf deneniyor", e)
+    return mupdf_to_pdf(svg), SVG_BACKEND_MUPDF
@@ -0,0 +1,139 @@
+"""
+Yakınlaştırılabilir önizleme için çok çözünürlüklü karo (tile) piramidi
+
+Her seviye bir öncekinin iki katı çözünürlüktedir (seviye 0 = zoom 1.0 = 96 DPI). Karolar yalnızca
+istendiğinde, sayfanın görüntü listesinden (display list) `clip` ile sadece o bölge işlenerek
+üretilir ve bayt sınırlı bir LRU önbellekte tutulur (sınır bellek bütçesinin karo payı, bkz. memory).
+Qt'ye bağımlı değildir.
+"""
+
+import math
+from collections import OrderedDict
+
+from src.pdf_processor.memory import cache_budget, BUDGET_TILES
+
+TILE_SIZE = 256                         # karo kenarı (px)
+PREVIEW_DPI = 96                        # zoom 1.0'ın çözünürlüğü
+LEVEL_MIN = -6                          # 1/64 zoom (tüm sayfa tek bakışta)
+LEVEL_MAX = 4                           # 16x zoom
+
+
+def level_for_zoom(zoom):
+    """Zoom için en az o kadar keskin olan en küçük seviye"""
+    level = math.ceil(math.log2(zoom) - 1e-9)
+    return max(LEVEL_MIN, min(LEVEL_MAX, level))
+
+
+def level_scale(level):
+    """Seviyenin ölçeği (pt başına piksel)"""
+    return 2.0 ** level * PREVIEW_DPI / 72
+
+
+class TilePyramid:
+    """Bir PDF'in (dosya yolu, bayt veya açık fitz.Document) sayfaları için karo üretimi ve LRU önbelleği
+
+    convert verilirse üretilen fitz.Pixmap önbelleğe konmadan önce ona dönüştürülür (ör. QImage).
+    max_bytes: önbellekteki karoların toplam piksel verisi (verilmezse bellek bütçesinden).
+    """
+
+    def __init__(self, source, convert=None, max_bytes=None):
+        import fitz
+
+        if isinstance(source, fitz.Document):
+            # Bellekteki canlı belge doğrudan kullanılır (diske yazılmadan)
+            self.doc = source
+            self._owns_doc = False
+        elif isinstance(source, (bytes, bytearray)):
+            self.doc = fitz.open("pdf", source)
+            self._owns_doc = True
+        else:
+            # Dosya tutulmasın diye bellekten açılır; önizleme dosyası yeniden yazılabilir
+            with open(source, "rb") as f:
+                self.doc = fitz.open("pdf", f.read())
+            self._owns_doc = True
+        self._setup([page.rect for page in self.doc], convert, max_bytes)
+
+    def _setup(self, page_rects, convert, max_bytes):
+        """Kaynaktan bağımsız ortak durum (alt sınıflar da çağırır)"""
+        self.page_rects = page_rects
+        self.convert = convert
+        self.max_bytes = cache_budget(BUDGET_TILES) if max_bytes is None else max_bytes
+        self.bytes = 0
+        self.rendered = 0
+        self._display_lists = {}
+        self._tiles = OrderedDict()     # (pno, seviye, tx, ty) -> (karo, bayt)
+
+    def clear(self):
+        """Üretilmiş karoları at (kaynak belge yerinde değiştiyse)"""
+        self._tiles.clear()
+        self._display_lists.clear()
+        self.bytes = 0
+
+    def close(self):
+        self.clear()
+        if self._owns_doc:
+            self.doc.close()
+
+    @property
+    def page_count(self):
+        return len(self.page_rects)
+
+    def grid(self, pno, level):
+        """Seviyedeki karo sütun ve satır sayısı"""
+        rect = self.page_rects[pno]
+        scale = level_scale(level)
+        return (max(1, math.ceil(rect.width * scale / TILE_SIZE)),
+                max(1, math.ceil(rect.height * scale / TILE_SIZE)))
+
+    def tile_rect(self, pno, level, tx, ty):
+        """Karonun sayfadaki alanı (pt), sayfa sınırına kırpılmış"""
+        import fitz
+
+        page_rect = self.page_rects[pno]
+        size = TILE_SIZE / level_scale(level)
+        x0 = page_rect.x0 + tx * size
+        y0 = page_rect.y0 + ty * size
+        return fitz.Rect(x0, y0, x0 + size, y0 + size) & page_rect
+
+    def get(self, key):
+        """Önbellekteki karo veya None"""
+        entry = self._tiles.get(key)
+        if entry is None:
+            return None
+        self._tiles.move_to_end(key)
+        return entry[0]
+
+    def render(self, key):
+        """Karoyu üret (önbellekte varsa onu döndür)"""
+        tile = self.get(key)
+        if tile is not None:
+            return tile
+
+        pno, level, tx, ty = key
+        pix = self._pixmap(pno, level_scale(level), self.tile_rect(pno, level, tx, ty))
+        size = pix.stride * pix.height
+        tile = self.convert(pix) if self.convert else pix
+        self._tiles[key] = (tile, size)
+        self.bytes += size
+        self.rendered += 1
+        self._evict()
+        return tile
+
+    def _pixmap(self, pno, scale, clip):
+        """Sayfanın clip alanının scale ölçeğindeki RGB fitz.Pixmap'i"""
+        import fitz
+
+        display_list = self._display_lists.get(pno)
+        if display_list is None:
+            display_list = self.doc[pno].get_displaylist()
+            self._display_lists[pno] = display_list
+        return display_list.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False, clip=clip)
+
+    def _evict(self):
+        for key in list(self._tiles):
+            if self.bytes <= self.max_bytes:
+                break
+            if key[1] == LEVEL_MIN:
+                continue    # en kaba seviye her zaman yedek görüntü olarak kalır
+            _, size = self._tiles.pop(key)
+            self.bytes -= size
@@ -0,0 +1,76 @@
+"""
+Logo döndürme ve aynalama dönüşümü
+
+Döndürme ve aynalama logo dosyasına yazılmaz; yerleştirme anında logonun içerik akışındaki matrisine
+eklenir. Böylece döndürme dışa aktarmaya kadar maliyetsizdir ve her tıklamada yeni PDF oluşmaz.
+Yerleşim hücresi döndürülmüş logonun sınır kutusudur; 90'ın katlarında genişlik ve yükseklik tam
+olarak yer değiştirir (yuvarlama hatası satır başına adedi değiştirmez).
+"""
+
+import math
+
+
+class LogoTransform:
+    """Logoya yerleşimde uygulanan dönüşüm: saat yönünde döndürme (derece) ve yatay/dikey aynalama
+
+    Aynalama logonun kendi ekseninde, döndürmeden önce uygulanır (DTF baskıda mirror_x).
+    """
+
+    def __init__(self, rotation=0, mirror_x=False, mirror_y=False):
+        self.rotation = float(rotation) % 360
+        self.mirror_x = bool(mirror_x)
+        self.mirror_y = bool(mirror_y)
+
+    @property
+    def key(self):
+        return (self.rotation, self.mirror_x, self.mirror_y)
+
+    @property
+    def is_identity(self):
+        return self.key == (0.0, False, False)
+
+    @property
+    def quarter_turns(self):
+        """Döndürme 90'ın katıysa çeyrek tur sayısı, değilse None"""
+        turns = self.rotation / 90
+        return int(turns) if turns == int(turns) else None
+
+    def rotated_size(self, width, height):
+        """(width, height) boyutlu logonun döndürülünce kapladığı sınır kutusu"""
+        turns = self.quarter_turns
+        if turns is not None:
+            return (height, width) if turns % 2 else (width, height)
+        angle = math.radians(self.rotation)
+        cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+        return width * cos + height * sin, width * sin + height * cos
+
+    def matrix(self):
+        """Orijin etrafındaki dönüşüm matrisi (PDF koordinatları: y yukarı, saat yönü negatif açı)"""
+        import fitz
+
+        matrix = fitz.Matrix(-1 if self.mirror_x else 1, -1 if self.mirror_y else 1)
+        if self.rotation:
+            matrix *= fitz.Matrix(-self.rotation)
+        return matrix
+
+    def __eq__(self, other):
+        return isinstance(other, LogoTransform) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"LogoTransform({self.rotation:g}°, mirror_x={self.mirror_x}, mirror_y={self.mirror_y})"
+
+
+def make_transform(rotation=0, mirror_x=False, mirror_y=False):
+    """Parametrelerden LogoTransform; dönüşüm yoksa None (yerleşim eskisiyle birebir aynı kalır)"""
+    transform = LogoTransform(rotation, mirror_x, mirror_y)
+    return None if transform.is_identity else transform
+
+
+def centered_rect(cell, width, height):
+    """Hücrenin ortasına yerleşen (width, height) boyutlu dikdörtgen (x0, y0, x1, y1)"""
+    x0, y0, x1, y1 = cell
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    return cx - width / 2, cy - height / 2, cx + width / 2, cy + height / 2
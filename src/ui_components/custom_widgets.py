@@ -3,22 +3,36 @@ Kullanıcı arayüzü bileşenleri için özel widget sınıfları
 """
 
 from PyQt5.QtWidgets import QLineEdit
+from PyQt5.QtCore import pyqtSignal
 
 
 class CustomLineEdit(QLineEdit):
-    """Özel QLineEdit: Enter tuşuna basıldığında veya focus kaybedildiğinde işlem yapar."""
-    
+    """Özel QLineEdit: Enter tuşuna basıldığında veya focus kaybedildiğinde, metin değiştiyse işlem yapar."""
+
+    confirmed = pyqtSignal(str)  # kullanıcı değişikliği onaylandığında yeni metin
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._confirmed_text = ""
         self.returnPressed.connect(self.handle_confirm)  # Enter tuşuna basıldığında
 
+    def setText(self, text):
+        """Programla verilen metin onaylanmış sayılır (focusOut'ta tekrar tetiklenmez)"""
+        super().setText(text)
+        self._confirmed_text = self.text()
+
     def focusOutEvent(self, event):
         """Kullanıcı başka bir kutuya geçince çağrılır"""
         self.handle_confirm()
         super().focusOutEvent(event)  # Normal davranışı devam ettir
 
     def handle_confirm(self):
-        """Enter veya focusOut olduğunda ana fonksiyon çağrılacak"""
+        """Enter veya focusOut olduğunda, metin son onaydan beri değiştiyse ana fonksiyon çağrılacak"""
+        if self.text() == self._confirmed_text:
+            return
+        self._confirmed_text = self.text()
+
         main_window = self.window()  # `window()` kullanarak ana pencereyi al
         if hasattr(main_window, "update_logo_dimensions"):
             main_window.update_logo_dimensions(self)
+        self.confirmed.emit(self.text())
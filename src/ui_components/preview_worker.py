@@ -0,0 +1,105 @@
+"""
+Önizlemeyi arka plan sürecinde üreten, istekleri geciktirip birleştiren (debounce) bileşen
+
+Art arda gelen isteklerden yalnızca sonuncusu, gecikme süresi dolunca işçiye gönderilir. Yeni bir
+istek gönderildiğinde çalışmakta olan eski iş paylaşılan sayaç üzerinden iptal edilir ve yalnızca
+en son isteğin sonucu `finished` sinyaliyle teslim edilir.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from src.pdf_processor import render_worker
+
+DEBOUNCE_MS = 300   # form düzenlemelerinde son değişiklikten sonra beklenen süre
+
+
+class PreviewWorker(QObject):
+    """Önizleme isteklerini tek işçili süreç havuzunda çalıştırır"""
+
+    finished = pyqtSignal(dict)     # en son isteğin sonucu (render_worker.build_preview)
+    failed = pyqtSignal(str)
+    busy = pyqtSignal(bool)
+
+    # İşçi iş parçacığından ana iş parçacığına aktarım için
+    _done = pyqtSignal(int, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Qt'nin iş parçacıkları varken fork güvenli değil; işçi ayrı yorumlayıcıda başlar
+        self.context = multiprocessing.get_context("spawn")
+        self.latest = self.context.Value("q", 0, lock=False)
+        self.executor = self._new_executor()
+        self.generation = 0
+        self._job = None
+        self._running = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._submit)
+        self._done.connect(self._deliver)
+
+        # İlk önizleme beklemesin diye işçi hemen ısıtılır
+        self.executor.submit(render_worker.warm_up)
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=1, mp_context=self.context,
+            initializer=render_worker.init_worker, initargs=(self.latest,)
+        )
+
+    def request(self, job, delay_ms=DEBOUNCE_MS):
+        """İsteği kaydet; delay_ms içinde yeni istek gelmezse işçiye gönder"""
+        self._job = job
+        # Bekleyen iş artık geçersiz: çalışıyorsa ilk kontrol noktasında durur
+        self.generation += 1
+        self.latest.value = self.generation
+        self._timer.start(delay_ms)
+
+    def cancel(self):
+        """Bekleyen ve çalışan isteği iptal et"""
+        self._timer.stop()
+        self._job = None
+        self.generation += 1
+        self.latest.value = self.generation
+
+    def _submit(self):
+        if self._job is None:
+            return
+        generation = self.generation
+        try:
+            future = self.executor.submit(render_worker.build_preview, self._job, generation)
+        except BrokenProcessPool:
+            # İşçi beklenmedik biçimde kapandıysa yenisi başlatılır
+            self.executor = self._new_executor()
+            future = self.executor.submit(render_worker.build_preview, self._job, generation)
+        self._job = None
+        self._running += 1
+        self.busy.emit(True)
+        future.add_done_callback(lambda future: self._on_done(generation, future))
+
+    def _on_done(self, generation, future):
+        """Havuzun iş parçacığında çağrılır; sonucu sinyalle ana iş parçacığına aktarır"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        self._done.emit(generation, None if error else future.result(), error)
+
+    def _deliver(self, generation, result, error):
+        self._running -= 1
+        if not self._running:
+            self.busy.emit(False)
+        if generation != self.generation:
+            return  # daha yeni bir istek var
+        if error is not None:
+            self.failed.emit(f"{error}")
+        elif result is not None:
+            self.finished.emit(result)
+
+    def shutdown(self):
+        """Uygulama kapanırken işçiyi durdur"""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
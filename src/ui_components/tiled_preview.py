@@ -0,0 +1,296 @@
+"""
+Karo tabanlı, yakınlaştırılabilir PDF önizleme bileşeni
+
+Yalnızca görünen bölgenin karoları geçerli zoom seviyesinde üretilir. Henüz üretilmemiş karoların
+yerine önbellekteki daha kaba bir seviye büyütülerek çizilir, karolar boşta kalan zamanda sırayla
+keskinleştirilir. Ctrl + tekerlek veya +/-/0 tuşlarıyla yakınlaştırılır. Sağ üst köşedeki durum
+katmanı son üretimin aşama sürelerini gösterir (tıklayınca gizlenir).
+"""
+
+import time
+
+from PyQt5.QtWidgets import QAbstractScrollArea, QLabel
+from PyQt5.QtGui import QPainter, QImage, QColor
+from PyQt5.QtCore import Qt, QTimer, QRectF, pyqtSignal
+
+from src.pdf_processor.tiles import (
+    TilePyramid, TILE_SIZE, LEVEL_MIN, PREVIEW_DPI, level_for_zoom, level_scale
+)
+from src.pdf_processor.composite import CompositePyramid
+
+PAGE_GAP_PT = 20            # çok sayfalı çıktılarda sayfalar arası boşluk
+RENDER_BUDGET_SEC = 0.02    # bir olay döngüsü turunda karo üretimine ayrılan süre
+REFINE_STEP = 2             # hedef seviyeden önce üretilen ara seviyenin uzaklığı
+STATUS_MARGIN = 8           # durum katmanının görünüm kenarına uzaklığı (piksel)
+ZOOM_STEP = 1.25
+
+
+def pixmap_to_qimage(pix):
+    """fitz.Pixmap -> bağımsız QImage kopyası"""
+    image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+    return image.copy()
+
+
+class TiledPreview(QAbstractScrollArea):
+    """PDF sayfalarını alt alta, karo karo çizen önizleme alanı"""
+
+    zoomChanged = pyqtSignal(float)
+
+    def __init__(self, parent=None, zoom=1.0, zoom_min=0.5, zoom_max=16.0):
+        super().__init__(parent)
+        self.zoom_min = zoom_min
+        self.zoom_max = zoom_max
+        self.zoom = max(zoom_min, min(zoom_max, zoom))
+        self.pyramid = None
+        self.text = "PDF önizlemesi burada görünecek."
+        self.page_offsets = []      # her sayfanın üst kenarının belge içindeki y'si (pt)
+        self.content_width_pt = 0
+        self.content_height_pt = 0
+        self._pending = []
+
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.timeout.connect(self._render_pending)
+
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setStyleSheet("border: 1px solid black;")
+
+        # Son üretimin aşama süreleri (bkz. set_status)
+        self.status_overlay = QLabel(self.viewport())
+        self.status_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 170); color: white; border: none; padding: 6px;"
+            "font-family: monospace; font-size: 10px;"
+        )
+        self.status_overlay.setToolTip("Tıklayınca gizlenir")
+        self.status_overlay.mousePressEvent = lambda event: self.status_overlay.hide()
+        self.status_overlay.hide()
+
+    # --- İçerik ---
+
+    def setText(self, text):
+        """Önizlemeyi kapatıp yerine mesaj göster (QLabel ile aynı kullanım)"""
+        self._close_pyramid()
+        self.text = text
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def load_pdf(self, source):
+        """PDF'i (dosya yolu, bayt veya açık fitz.Document) göster; zoom ve kaydırma konumu korunur"""
+        self._show_pyramid(TilePyramid(source, convert=pixmap_to_qimage))
+
+    def load_composite(self, sheet):
+        """Birleştirilmiş önizlemeyi (composite.CompositeSheet) göster; sheet'in sahibi olur"""
+        self._show_pyramid(CompositePyramid(sheet, convert=pixmap_to_qimage))
+
+    def set_status(self, text):
+        """Durum katmanında metni göster; text boşsa katmanı gizle"""
+        if not text:
+            self.status_overlay.hide()
+            return
+        self.status_overlay.setText(text)
+        self.status_overlay.adjustSize()
+        self._place_status()
+        self.status_overlay.show()
+        self.status_overlay.raise_()
+
+    def _place_status(self):
+        x = self.viewport().width() - self.status_overlay.width() - STATUS_MARGIN
+        self.status_overlay.move(max(STATUS_MARGIN, x), STATUS_MARGIN)
+
+    def refresh(self):
+        """Kaynak yerinde değiştiyse (ör. arka plan katmanı) karoları yeniden üret"""
+        if self.pyramid is None:
+            return
+        self._pending = []
+        self.pyramid.clear()
+        self._render_coarse()
+        self.viewport().update()
+
+    def _show_pyramid(self, pyramid):
+        self._close_pyramid()
+        self.pyramid = pyramid
+        self.text = None
+
+        self.page_offsets = []
+        y = 0
+        for rect in self.pyramid.page_rects:
+            self.page_offsets.append(y)
+            y += rect.height + PAGE_GAP_PT
+        self.content_width_pt = max(rect.width for rect in self.pyramid.page_rects)
+        self.content_height_pt = y - PAGE_GAP_PT
+
+        self._render_coarse()
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def _render_coarse(self):
+        """Kaba seviye hemen üretilir; daha keskin karolar gelene kadar yedek görüntüdür"""
+        for pno in range(self.pyramid.page_count):
+            cols, rows = self.pyramid.grid(pno, LEVEL_MIN)
+            for ty in range(rows):
+                for tx in range(cols):
+                    self.pyramid.render((pno, LEVEL_MIN, tx, ty))
+
+    def _close_pyramid(self):
+        self._pending = []
+        if self.pyramid is not None:
+            self.pyramid.close()
+            self.pyramid = None
+
+    # --- Zoom ve kaydırma ---
+
+    def view_scale(self):
+        """Ekranda pt başına piksel"""
+        return self.zoom * PREVIEW_DPI / 72
+
+    def set_zoom(self, zoom, anchor=None):
+        """Zoom'u ayarla; anchor (görünüm pikseli) altındaki nokta yerinde kalır"""
+        zoom = max(self.zoom_min, min(self.zoom_max, zoom))
+        if zoom == self.zoom:
+            return
+        if anchor is None:
+            anchor = self.viewport().rect().center()
+        old_scale = self.view_scale()
+        doc_x = (self.horizontalScrollBar().value() + anchor.x()) / old_scale
+        doc_y = (self.verticalScrollBar().value() + anchor.y()) / old_scale
+
+        self.zoom = zoom
+        self._update_scrollbars()
+        scale = self.view_scale()
+        self.horizontalScrollBar().setValue(int(doc_x * scale - anchor.x()))
+        self.verticalScrollBar().setValue(int(doc_y * scale - anchor.y()))
+        self.viewport().update()
+        self.zoomChanged.emit(self.zoom)
+
+    def _update_scrollbars(self):
+        scale = self.view_scale()
+        viewport = self.viewport().size()
+        width = int(self.content_width_pt * scale) if self.pyramid else 0
+        height = int(self.content_height_pt * scale) if self.pyramid else 0
+        self.horizontalScrollBar().setRange(0, max(0, width - viewport.width()))
+        self.horizontalScrollBar().setPageStep(viewport.width())
+        self.verticalScrollBar().setRange(0, max(0, height - viewport.height()))
+        self.verticalScrollBar().setPageStep(viewport.height())
+        self.horizontalScrollBar().setSingleStep(TILE_SIZE // 4)
+        self.verticalScrollBar().setSingleStep(TILE_SIZE // 4)
+
+    def resizeEvent(self, event):
+        self._update_scrollbars()
+        self._place_status()
+        super().resizeEvent(event)
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            step = ZOOM_STEP if event.angleDelta().y() > 0 else 1 / ZOOM_STEP
+            self.set_zoom(self.zoom * step, event.pos())
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Plus, Qt.Key_Equal):
+            self.set_zoom(self.zoom * ZOOM_STEP)
+        elif event.key() == Qt.Key_Minus:
+            self.set_zoom(self.zoom / ZOOM_STEP)
+        elif event.key() == Qt.Key_0:
+            self.set_zoom(1.0)
+        else:
+            super().keyPressEvent(event)
+
+    # --- Çizim ---
+
+    def visible_tiles(self, level):
+        """Görünen alanı kaplayan karoların anahtarları (sayfa, seviye, tx, ty)"""
+        scale = self.view_scale()
+        left = self.horizontalScrollBar().value() / scale
+        top = self.verticalScrollBar().value() / scale
+        right = left + self.viewport().width() / scale
+        bottom = top + self.viewport().height() / scale
+        tile_pt = TILE_SIZE / level_scale(level)
+
+        tiles = []
+        for pno, rect in enumerate(self.pyramid.page_rects):
+            offset = self.page_offsets[pno]
+            if offset > bottom or offset + rect.height < top:
+                continue
+            cols, rows = self.pyramid.grid(pno, level)
+            tx0 = max(0, int(left / tile_pt))
+            tx1 = min(cols - 1, int(right / tile_pt))
+            ty0 = max(0, int((top - offset) / tile_pt))
+            ty1 = min(rows - 1, int((bottom - offset) / tile_pt))
+            for ty in range(ty0, ty1 + 1):
+                for tx in range(tx0, tx1 + 1):
+                    tiles.append((pno, level, tx, ty))
+        return tiles
+
+    def _view_rect(self, key):
+        """Karonun görünümdeki dikdörtgeni (px)"""
+        pno, level, tx, ty = key
+        tile = self.pyramid.tile_rect(pno, level, tx, ty)
+        page = self.pyramid.page_rects[pno]
+        scale = self.view_scale()
+        x = (tile.x0 - page.x0) * scale - self.horizontalScrollBar().value()
+        y = (tile.y0 - page.y0 + self.page_offsets[pno]) * scale - self.verticalScrollBar().value()
+        return QRectF(x, y, tile.width * scale, tile.height * scale)
+
+    def _fallback(self, key):
+        """Karo yoksa onu kaplayan en yakın kaba karo ve içindeki kaynak dikdörtgen"""
+        pno, level, tx, ty = key
+        for coarse in range(level - 1, LEVEL_MIN - 1, -1):
+            shift = level - coarse
+            coarse_key = (pno, coarse, tx >> shift, ty >> shift)
+            image = self.pyramid.get(coarse_key)
+            if image is None:
+                continue
+            tile = self.pyramid.tile_rect(*key)
+            parent = self.pyramid.tile_rect(*coarse_key)
+            sx = image.width() / parent.width
+            sy = image.height() / parent.height
+            source = QRectF((tile.x0 - parent.x0) * sx, (tile.y0 - parent.y0) * sy,
+                            tile.width * sx, tile.height * sy)
+            return image, source
+        return None, None
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(self.viewport().rect(), QColor(128, 128, 128))
+        if self.pyramid is None:
+            painter.fillRect(self.viewport().rect(), QColor(255, 255, 255))
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, self.text or "")
+            return
+
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        level = level_for_zoom(self.zoom)
+        # Önce ara seviyenin (az sayıda, ucuz) karoları, sonra hedef seviye
+        pending = []
+        if level - REFINE_STEP > LEVEL_MIN:
+            pending = [key for key in self.visible_tiles(level - REFINE_STEP)
+                       if self.pyramid.get(key) is None]
+        for key in self.visible_tiles(level):
+            target = self._view_rect(key)
+            image = self.pyramid.get(key)
+            if image is not None:
+                painter.drawImage(target, image, QRectF(image.rect()))
+                continue
+            image, source = self._fallback(key)
+            if image is not None:
+                painter.drawImage(target, image, source)
+            pending.append(key)
+        painter.end()
+
+        # Yalnızca hâlâ görünen karolar üretilir; eski istekler atılır
+        self._pending = pending
+        if pending and not self._render_timer.isActive():
+            self._render_timer.start(0)
+
+    def _render_pending(self):
+        """Bekleyen karoları süre bütçesi dolana kadar üret, sonra ekranı yenile"""
+        if self.pyramid is None:
+            return
+        deadline = time.perf_counter() + RENDER_BUDGET_SEC
+        while self._pending and time.perf_counter() < deadline:
+            self.pyramid.render(self._pending.pop(0))
+        self.viewport().update()